@@ -0,0 +1,316 @@
+"""
+Benchmark reprodutível dos motores de busca do teste.py (ps, ga, hybrid, memetic e tpe).
+
+Cada problema é uma função objetivo sintética com parâmetros mistos (categóricos e
+inteiros), ótimo conhecido, custo por avaliação (sleep) e ruído gaussiano ajustáveis.
+O mesmo problema pode ser avaliado em processo (backend 'function') ou por um
+executável substituto que imita o modelo real (backend 'executable': este arquivo
+chamado com --model, um processo por avaliação).
+
+Cada motor roda por tune() com um único worker, semente fixa e orçamento de
+avaliações (max_evaluations). As execuções do modelo chegam pelo on_evaluation,
+então repetições servidas pelo cache não contam. O resultado (JSON) traz, por
+execução: avaliações até o alvo, curva do melhor valor ao longo das avaliações
+(anytime), tempo total, tempo no modelo e overhead do otimizador entre a primeira
+e a última avaliação do orçamento.
+
+Uso:
+    python benchmark.py --engines ps,ga,hybrid,memetic,tpe --seeds 5 --evaluations 500
+    python benchmark.py --backend executable --cost 0.01 --noise 0.05 --output resultados.json
+"""
+import argparse
+import io
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+import teste
+
+# =============================================================================
+# ### CONFIGURAÇÃO DO BENCHMARK ###
+# =============================================================================
+# Orçamento de cada execução: número de execuções reais do modelo (repetições
+# atendidas pelo cache não contam) e um teto de tempo por execução, em segundos.
+# Com orçamento o híbrido (GA seguido de PS) divide as fases pelas avaliações.
+BENCHMARK_EVALUATIONS = 500
+BENCHMARK_SECONDS = 60
+
+# Sementes usadas (0, 1, ..., BENCHMARK_SEEDS - 1): cada par (problema, motor)
+# roda uma vez por semente, com tune(seed=semente).
+BENCHMARK_SEEDS = 3
+
+# Custo artificial de cada avaliação (segundos) e desvio padrão do ruído,
+# relativo à escala do problema (0.05 = 5% da escala).
+BENCHMARK_COST_SECONDS = 0.0
+BENCHMARK_NOISE = 0.0
+
+BENCHMARK_OUTPUT_PATH = os.path.join(teste.SCRIPT_DIR, "resultados_benchmark.json")
+
+# =============================================================================
+# ### PROBLEMAS SINTÉTICOS ###
+# =============================================================================
+def sphere(params):
+    """Esfera deslocada em 4 inteiros; a categoria soma uma penalidade fixa."""
+    *values, kind = params
+    targets = (17, -23, 5, 40)
+    penalty = {'a': 0, 'b': 25, 'c': 50, 'd': 100}[kind]
+    return sum((int(v) - t) ** 2 for v, t in zip(values, targets)) + penalty
+
+def rastrigin(params):
+    """Rastrigin em 3 inteiros (passo 0.25 na coordenada), muitos mínimos locais."""
+    kind, *values = params
+    shift = {'x': 0, 'y': 3, 'z': -6}[kind]
+    total = 10 * len(values)
+    for v in values:
+        z = (int(v) - shift) / 4
+        total += z * z - 10 * math.cos(2 * math.pi * z)
+    return total + (0 if kind == 'y' else 2)
+
+def interaction(params):
+    """
+    A categoria muda a posição do ótimo dos inteiros: 'x' tem uma bacia larga e
+    rasa, 'z' a estreita que contém o ótimo global (110 em z, 150, 30).
+    """
+    mode, a, b = params[0], int(params[1]), int(params[2])
+    center, bonus, width = {'x': ((60, 120), 100, 0.002),
+                            'y': ((20, 180), 104, 0.01),
+                            'z': ((150, 30), 110, 0.05)}[mode]
+    return bonus - width * ((a - center[0]) ** 2 + (b - center[1]) ** 2)
+
+# 'target' é o valor considerado resolvido; 'scale' é a amplitude típica do
+# objetivo, usada para dimensionar o ruído.
+PROBLEMS = {
+    'esfera': {'function': sphere, 'goal': 'min', 'optimum': 0, 'target': 2, 'scale': 100,
+               'space': [{'type': 'int', 'min': -50, 'max': 50}] * 4
+                        + [{'type': 'cat', 'options': ['a', 'b', 'c', 'd']}]},
+    'rastrigin': {'function': rastrigin, 'goal': 'min', 'optimum': 0, 'target': 0.5, 'scale': 20,
+                  'space': [{'type': 'cat', 'options': ['x', 'y', 'z']}]
+                           + [{'type': 'int', 'min': -20, 'max': 20}] * 3},
+    'interacao': {'function': interaction, 'goal': 'max', 'optimum': 110, 'target': 109, 'scale': 10,
+                  'space': [{'type': 'cat', 'options': ['x', 'y', 'z']},
+                            {'type': 'int', 'min': 0, 'max': 200},
+                            {'type': 'int', 'min': 0, 'max': 200}]},
+}
+
+class NoisyObjective:
+    """
+    Função objetivo de um problema com custo e ruído. O ruído vem de um gerador
+    próprio, semeado por execução, para não interferir na sequência do otimizador.
+    """
+
+    def __init__(self, problem, cost=0.0, noise=0.0, seed=0):
+        self.problem = problem
+        self.cost = cost
+        self.noise = noise
+        self.rng = random.Random(seed)
+
+    def __call__(self, params):
+        if self.cost > 0:
+            time.sleep(self.cost)
+        value = PROBLEMS[self.problem]['function'](params)
+        if self.noise > 0:
+            value += self.rng.gauss(0, self.noise * PROBLEMS[self.problem]['scale'])
+        return value
+
+def model_main(argv):
+    """
+    Executável substituto: 'benchmark.py --model NOME [--cost C] [--noise N] [--seed S] p1 p2 ...'
+    imprime o valor do problema, como o modelo real. O ruído é semeado pela semente e
+    pelos parâmetros, então o mesmo ponto sempre devolve o mesmo valor.
+    """
+    parser = argparse.ArgumentParser(prog='benchmark.py --model')
+    parser.add_argument('--model', required=True, choices=sorted(PROBLEMS))
+    parser.add_argument('--cost', type=float, default=0.0)
+    parser.add_argument('--noise', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('params', nargs='*')
+    args = parser.parse_args(argv)
+    objective = NoisyObjective(args.model, args.cost, args.noise, f"{args.seed}:{' '.join(args.params)}")
+    print(objective(args.params))
+
+def model_executable(directory, problem, cost, noise, seed):
+    """Cria o script que chama este arquivo em modo --model (backend 'executable')."""
+    path = os.path.join(directory, f"modelo_{problem}.sh")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.abspath(__file__)}" --model {problem} '
+                f'--cost {cost} --noise {noise} --seed {seed} "$@"\n')
+    os.chmod(path, 0o755)
+    return path
+
+# =============================================================================
+# ### MOTORES ###
+# =============================================================================
+# Motor do benchmark -> algoritmo do tune(). 'hybrid' é o run_hybrid_algorithm
+# (GA seguido de PS, 'ga-ps' no teste.py); 'memetic' é o 'hybrid' do menu.
+ENGINES = {'ps': 'ps', 'ga': 'ga', 'hybrid': 'ga-ps', 'memetic': 'hybrid', 'tpe': 'tpe'}
+
+# =============================================================================
+# ### EXECUÇÃO E MEDIÇÃO ###
+# =============================================================================
+class RunRecorder:
+    """
+    Recebe as execuções do modelo pelo on_evaluation do tune(): conta avaliações,
+    acumula o tempo no modelo e monta a curva do melhor valor. Execuções que chegam
+    depois do fim do orçamento (antes de os workers pararem) são ignoradas.
+    """
+
+    def __init__(self, goal, target, budget):
+        self.sign = 1.0 if goal == 'max' else -1.0
+        self.target = target
+        self.budget = budget
+        self.started = None  # Início da primeira execução
+        self.finished = None  # Fim da última execução dentro do orçamento
+        self.evaluations = 0
+        self.objective_time = 0.0
+        self.failures = 0
+        self.best_value = None
+        self.best_params = None
+        self.evaluations_to_target = None
+        self.curve = []  # [avaliação, segundos, melhor valor] a cada melhoria
+
+    def record(self, entry):
+        if self.evaluations >= self.budget:
+            return
+        if self.started is None:
+            self.started = entry['time'] - entry['wall_time']
+        self.finished = entry['time']
+        self.evaluations += 1
+        self.objective_time += entry['wall_time']
+        value = entry['value']
+        if entry['status'] != 'ok' or value is None:
+            self.failures += 1
+        elif self.best_value is None or self.sign * value > self.sign * self.best_value:
+            self.best_value = value
+            self.best_params = entry['params']
+            self.curve.append([self.evaluations, round(entry['time'] - self.started, 4), value])
+            if self.evaluations_to_target is None and self.sign * value >= self.sign * self.target:
+                self.evaluations_to_target = self.evaluations
+
+    def overhead(self):
+        """Tempo fora do modelo entre a primeira e a última avaliação do orçamento."""
+        if self.started is None:
+            return 0.0
+        return max(0.0, self.finished - self.started - self.objective_time)
+
+def run_benchmark(problem, engine, seed, backend='function', evaluations=BENCHMARK_EVALUATIONS,
+                  seconds=BENCHMARK_SECONDS, cost=BENCHMARK_COST_SECONDS, noise=BENCHMARK_NOISE,
+                  workdir=None):
+    """Executa um motor em um problema com semente e orçamento fixos; retorna o resultado."""
+    spec = PROBLEMS[problem]
+    recorder = RunRecorder(spec['goal'], spec['target'], evaluations)
+
+    if backend == 'function':
+        options = {'objective': NoisyObjective(problem, cost, noise, seed)}
+    else:
+        options = {'executable_path': model_executable(workdir, problem, cost, noise, seed)}
+
+    # Com um único worker a sequência de avaliações depende só da semente
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        teste.tune(spec['space'], algorithm=ENGINES[engine], goal=spec['goal'],
+                   time_limit_minutes=seconds / 60, max_evaluations=evaluations,
+                   on_evaluation=recorder.record, seed=seed, **options)
+    wall_time = time.perf_counter() - started
+
+    overhead = recorder.overhead()
+    return {'problem': problem, 'engine': engine, 'seed': seed, 'backend': backend,
+            'evaluations': recorder.evaluations, 'failures': recorder.failures,
+            'evaluations_to_target': recorder.evaluations_to_target,
+            'best_value': recorder.best_value, 'best_params': recorder.best_params,
+            'target': spec['target'], 'optimum': spec['optimum'],
+            'wall_time': round(wall_time, 4), 'objective_time': round(recorder.objective_time, 4),
+            'overhead': round(overhead, 4),
+            'overhead_per_evaluation': round(overhead / recorder.evaluations, 6) if recorder.evaluations else None,
+            'curve': recorder.curve}
+
+def summarize(runs):
+    """Agrega as execuções por (problema, motor)."""
+    groups = {}
+    for run in runs:
+        groups.setdefault((run['problem'], run['engine']), []).append(run)
+    summary = []
+    for (problem, engine), group in groups.items():
+        reached = [run['evaluations_to_target'] for run in group if run['evaluations_to_target'] is not None]
+        bests = [run['best_value'] for run in group if run['best_value'] is not None]
+        overheads = [run['overhead_per_evaluation'] for run in group if run['overhead_per_evaluation'] is not None]
+        summary.append({'problem': problem, 'engine': engine, 'runs': len(group),
+                        'success_rate': len(reached) / len(group),
+                        'median_evaluations_to_target': statistics.median(reached) if reached else None,
+                        'mean_best_value': statistics.mean(bests) if bests else None,
+                        'mean_wall_time': statistics.mean(run['wall_time'] for run in group),
+                        'mean_overhead_per_evaluation': statistics.mean(overheads) if overheads else None})
+    return summary
+
+def print_summary(summary):
+    print(f"\n{'Problema':<11} {'Motor':<8} {'Sucesso':>8} {'Aval. alvo':>11} "
+          f"{'Melhor médio':>13} {'Tempo (s)':>10} {'Overhead/aval':>14}")
+    for row in summary:
+        to_target = row['median_evaluations_to_target']
+        best = row['mean_best_value']
+        overhead = row['mean_overhead_per_evaluation']
+        print(f"{row['problem']:<11} {row['engine']:<8} {row['success_rate']:>8.0%} "
+              f"{'-' if to_target is None else f'{to_target:g}':>11} "
+              f"{'-' if best is None else f'{best:.4g}':>13} {row['mean_wall_time']:>10.2f} "
+              f"{'-' if overhead is None else teste.format_latency(overhead):>14}")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if '--model' in argv:
+        return model_main(argv)
+
+    parser = argparse.ArgumentParser(description="Benchmark dos motores de busca do teste.py.")
+    parser.add_argument('--problems', default=','.join(PROBLEMS),
+                        help=f"problemas separados por vírgula ({', '.join(PROBLEMS)})")
+    parser.add_argument('--engines', default=','.join(ENGINES),
+                        help=f"motores separados por vírgula ({', '.join(ENGINES)})")
+    parser.add_argument('--seeds', type=int, default=BENCHMARK_SEEDS)
+    parser.add_argument('--evaluations', type=int, default=BENCHMARK_EVALUATIONS)
+    parser.add_argument('--seconds', type=float, default=BENCHMARK_SECONDS)
+    parser.add_argument('--cost', type=float, default=BENCHMARK_COST_SECONDS)
+    parser.add_argument('--noise', type=float, default=BENCHMARK_NOISE)
+    parser.add_argument('--backend', choices=('function', 'executable'), default='function')
+    parser.add_argument('--output', default=BENCHMARK_OUTPUT_PATH)
+    args = parser.parse_args(argv)
+
+    problems = [p for p in args.problems.split(',') if p]
+    engines = [e for e in args.engines.split(',') if e]
+    for name in problems:
+        if name not in PROBLEMS:
+            parser.error(f"problema desconhecido {name!r}")
+    for name in engines:
+        if name not in ENGINES:
+            parser.error(f"motor desconhecido {name!r}")
+
+    # As avaliações são medidas pelo benchmark; desliga o histórico e o trace em disco.
+    # Um único worker mantém cada execução reprodutível pela semente
+    teste.EVAL_STORE_ENABLED = False
+    teste.TRACE_ENABLED = False
+    teste.WORKER_COUNT = 1
+
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for problem in problems:
+            for engine in engines:
+                for seed in range(args.seeds):
+                    run = run_benchmark(problem, engine, seed, args.backend, args.evaluations,
+                                        args.seconds, args.cost, args.noise, workdir)
+                    print(f"{problem} / {engine} / semente {seed}: melhor {run['best_value']} "
+                          f"em {run['evaluations']} avaliações ({run['wall_time']:.2f}s)", flush=True)
+                    runs.append(run)
+
+    summary = summarize(runs)
+    print_summary(summary)
+    config = {key: getattr(args, key) for key in ('seeds', 'evaluations', 'seconds', 'cost', 'noise', 'backend')}
+    config.update(problems=problems, engines=engines)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'config': config, 'summary': summary, 'runs': runs}, f, indent=2)
+    print(f"\nResultados gravados em {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Avaliação distribuída do teste.py: o broker TCP que o processo principal abre para
+os workers e os agentes remotos, e o cliente que cada thread de worker usa.
+
+Protocolo: mensagens JSON, uma por linha, sobre TCP.
+  worker -> broker: {"type": "submit", "id", "params", "objective_multiplier", "limit", "capped"}
+  broker -> worker: {"type": "result", "id", "fitness", "status", "value", "wall_time", "agent"}
+                    e {"type": "heartbeat"} enquanto o worker tem jobs na fila
+  agente -> broker: {"type": "hello", "name", "slots", "executable_hash"}, {"type": "heartbeat"}
+                    e {"type": "result", ...} com o id do job
+  broker -> agente: {"type": "job", "id", "params", "objective_multiplier", "limit", "capped"}
+
+Os prazos e limites (BROKER_*, AGENT_HEARTBEAT_SECONDS) vêm do teste.py pelos
+construtores; o lado do worker (run_remote_batch) e o agente (run_agent) ficam lá.
+"""
+import json
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+
+from exporter import format_latency
+
+# =============================================================================
+# ### BROKER, AGENTES E CLIENTE ###
+# =============================================================================
+class MessageConnection:
+    """Mensagens JSON (uma por linha) sobre um socket TCP; o envio é protegido por lock."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.closed = False
+        self._lock = threading.Lock()
+        self._reader = sock.makefile('rb')
+
+    def send(self, message):
+        data = (json.dumps(message) + "\n").encode('utf-8')
+        with self._lock:
+            self.sock.sendall(data)
+
+    def messages(self):
+        """Itera as mensagens recebidas até a conexão fechar (ou estourar o timeout)."""
+        try:
+            for line in self._reader:
+                yield json.loads(line)
+        except (OSError, ValueError):
+            return
+
+    def close(self):
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._reader.close()
+        self.sock.close()
+
+class AgentState:
+    """Um agente conectado ao broker, com as avaliações em andamento e as estatísticas."""
+
+    def __init__(self, connection, name, slots):
+        self.connection = connection
+        self.name = name
+        self.slots = slots
+        self.running = {}  # id do job -> job
+        self.connected = True
+        self.connected_at = time.time()
+        self.disconnected_at = None
+        self.completed = 0
+        self.failures = 0
+        self.busy_time = 0.0
+        self.lost_jobs = 0
+
+    def throughput(self):
+        """Avaliações por segundo enquanto esteve conectado."""
+        duration = (self.disconnected_at or time.time()) - self.connected_at
+        return self.completed / duration if duration > 0 else 0.0
+
+class EvaluationBroker:
+    """
+    Fila de trabalho TCP do processo principal. Os workers submetem configurações e
+    esperam o resultado; cada configuração vai para o agente com mais slots livres
+    (proporcionalmente). A leitura de cada agente tem timeout de 'agent_timeout':
+    sem resultado nem heartbeat nesse intervalo o agente é dado como perdido e os
+    jobs dele voltam ao início da fila, até 'max_dispatches' envios por job. Os
+    workers com jobs na fila recebem um heartbeat a cada 'heartbeat_interval'.
+    """
+
+    def __init__(self, bind, port, agent_timeout=15, executable_hash=None, heartbeat_interval=3,
+                 max_dispatches=3):
+        self.bind = bind
+        self.port = port
+        self.agent_timeout = agent_timeout
+        self.executable_hash = executable_hash
+        self.heartbeat_interval = heartbeat_interval
+        self.max_dispatches = max_dispatches
+        self.pending = deque()  # Jobs esperando um slot livre
+        self.agents = []        # Todos os agentes da execução (inclusive os perdidos)
+        self.redispatched = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Abre a porta do broker e atende as conexões em threads daemon."""
+        broker = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                broker._serve(self.request)
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        socketserver.ThreadingTCPServer.daemon_threads = True
+        self._server = socketserver.ThreadingTCPServer((self.bind, self.port), Handler)
+        self.port = self._server.server_address[1]  # Porta 0: escolhida pelo sistema
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._heartbeat, daemon=True).start()
+
+    def stop(self):
+        """Fecha a porta e as conexões (os agentes voltam a tentar conectar)."""
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        with self._lock:
+            for agent in self.agents:
+                if agent.connected:
+                    agent.connected = False
+                    agent.disconnected_at = time.time()
+                    agent.connection.close()
+
+    def _heartbeat(self):
+        """Avisa os workers com jobs na fila de que o broker segue ativo."""
+        while not self._stopped.wait(self.heartbeat_interval):
+            with self._lock:
+                clients = {job['client'] for job in self.pending if not job['client'].closed}
+            for client in clients:
+                try:
+                    client.send({'type': 'heartbeat'})
+                except OSError:
+                    client.closed = True
+
+    def _serve(self, sock):
+        connection = MessageConnection(sock)
+        agent = None
+        try:
+            for message in connection.messages():
+                kind = message.get('type')
+                if kind == 'submit':
+                    self._submit(connection, message)
+                elif kind == 'hello':
+                    agent = self._register(connection, message)
+                    sock.settimeout(self.agent_timeout)
+                elif kind == 'result' and agent is not None:
+                    self._complete(agent, message)
+                # 'heartbeat' só renova o timeout de leitura
+        finally:
+            with self._lock:
+                if agent is not None:
+                    self._lose(agent)
+                    self._dispatch()
+                else:
+                    # Worker encerrado: o que ele ainda tinha na fila não interessa mais
+                    connection.closed = True
+                    self.pending = deque(job for job in self.pending if job['client'] is not connection)
+            connection.close()
+
+    def _register(self, connection, message):
+        agent = AgentState(connection, str(message.get('name', '?')), max(1, int(message.get('slots', 1))))
+        print(f"Agente conectado: {agent.name} ({agent.slots} slots)")
+        if self.executable_hash and message.get('executable_hash') not in (None, self.executable_hash):
+            print(f"AVISO: o executável do agente {agent.name} é diferente do local (hash distinto)")
+        with self._lock:
+            self.agents.append(agent)
+            self._dispatch()
+        return agent
+
+    def _submit(self, connection, message):
+        with self._lock:
+            self._next_id += 1
+            self.pending.append({'id': self._next_id, 'client': connection, 'client_id': message['id'],
+                                 'dispatches': 0,
+                                 'job': {key: message.get(key) for key in
+                                         ('params', 'objective_multiplier', 'limit', 'capped')}})
+            self._dispatch()
+
+    def _dispatch(self):
+        """Envia jobs da fila aos agentes com slots livres (chamado com o lock)."""
+        while self.pending:
+            free = [agent for agent in self.agents if agent.connected and len(agent.running) < agent.slots]
+            if not free:
+                return
+            agent = min(free, key=lambda a: len(a.running) / a.slots)
+            job = self.pending.popleft()
+            if job['client'].closed:
+                continue
+            job['dispatches'] += 1
+            agent.running[job['id']] = job
+            try:
+                agent.connection.send(dict(job['job'], type='job', id=job['id']))
+            except OSError:
+                self._lose(agent)
+
+    def _lose(self, agent):
+        """Remove um agente e devolve os jobs dele à fila (chamado com o lock)."""
+        if not agent.connected:
+            return
+        agent.connected = False
+        agent.disconnected_at = time.time()
+        jobs = list(agent.running.values())
+        agent.running.clear()
+        agent.lost_jobs += len(jobs)
+        agent.connection.close()
+        print(f"AVISO: Agente {agent.name} perdido com {len(jobs)} avaliações em andamento")
+        for job in reversed(jobs):
+            if job['dispatches'] >= self.max_dispatches:
+                # Perdas repetidas não provam que a configuração é ruim (podem ser as
+                # máquinas): volta sem fitness e não é memoizada
+                self._reply(job, {'fitness': None, 'status': 'lost', 'value': None,
+                                  'wall_time': 0.0, 'agent': agent.name})
+                continue
+            self.redispatched += 1
+            self.pending.appendleft(job)
+
+    def _complete(self, agent, message):
+        with self._lock:
+            job = agent.running.pop(message.get('id'), None)
+            if job is not None:
+                agent.completed += 1
+                agent.busy_time += message.get('wall_time') or 0.0
+                if message.get('status') != 'ok':
+                    agent.failures += 1
+                self._reply(job, {key: message.get(key) for key in ('fitness', 'status', 'value', 'wall_time')},
+                            agent=agent.name)
+            self._dispatch()
+
+    def _reply(self, job, result, **extra):
+        client = job['client']
+        if client.closed:
+            return
+        try:
+            client.send(dict(result, type='result', id=job['client_id'], **extra))
+        except OSError:
+            client.closed = True
+
+    def status_line(self):
+        """Resumo curto para o status periódico do monitor."""
+        with self._lock:
+            connected = [agent for agent in self.agents if agent.connected]
+            return (f"Agentes: {len(connected)} conectados ({sum(a.slots for a in connected)} slots) | "
+                    f"{len(self.pending)} na fila | {self.redispatched} reenviadas")
+
+    def print_stats(self):
+        """Estatísticas por agente para o relatório final."""
+        print(f"Avaliação Distribuída: {len(self.agents)} agentes | {self.redispatched} avaliações reenviadas "
+              f"após perda de agente")
+        for agent in self.agents:
+            latency = agent.busy_time / agent.completed if agent.completed else 0.0
+            print(f"  {agent.name}: {agent.slots} slots | {agent.completed} avaliações "
+                  f"({agent.throughput():.2f}/s) | latência média {format_latency(latency)} | "
+                  f"{agent.failures} falhas | {agent.lost_jobs} perdidas"
+                  f"{'' if agent.disconnected_at is None else ' | desconectado'}")
+
+class BrokerClient:
+    """
+    Conexão de uma thread do worker com o broker; cada chamada espera os seus resultados.
+    Entre duas mensagens do broker (resultado ou heartbeat) a espera máxima é o maior
+    limite dos jobs + 2 x 'agent_timeout' (o do broker): um job num agente responde dentro do
+    limite ou volta à fila quando o agente é dado como perdido. Passado esse prazo o
+    broker é considerado inalcançável e a chamada falha com ConnectionError.
+    """
+
+    def __init__(self, address, agent_timeout=15):
+        self.agent_timeout = agent_timeout
+        self.connection = MessageConnection(socket.create_connection(address))
+        self._messages = self.connection.messages()
+        self._next_id = 0
+
+    def evaluate(self, jobs):
+        ids = []
+        for job in jobs:
+            self._next_id += 1
+            ids.append(self._next_id)
+            self.connection.send(dict(job, type='submit', id=self._next_id))
+        self.connection.sock.settimeout(max(job['limit'] for job in jobs) + 2 * self.agent_timeout)
+        results = {}
+        while len(results) < len(ids):
+            message = next(self._messages, None)
+            if message is None:
+                raise ConnectionError("conexão com o broker encerrada ou sem resposta")
+            if message.get('type') == 'result':
+                results[message['id']] = message
+        return [results[i] for i in ids]
+
+    def close(self):
+        self.connection.close()
+
+class AgentEvaluationLog:
+    """
+    Substitui o trace no agente: guarda, por thread, o registro da última execução
+    (status, valor bruto e tempo), que volta ao broker junto com o fitness.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def record(self, entry):
+        self._local.last = entry
+
+    def last(self):
+        return getattr(self._local, 'last', None)
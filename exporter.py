@@ -0,0 +1,197 @@
+"""
+Observabilidade do teste.py: histograma de latência, trace JSONL por avaliação e
+métricas ao vivo no formato de texto do Prometheus.
+
+Sem estado global do otimizador: o teste.py passa a configuração (TRACE_*, METRICS_*)
+e os contadores compartilhados (EvaluationMetrics) pelos construtores.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =============================================================================
+# ### HISTOGRAMA DE LATÊNCIA ###
+# =============================================================================
+# Limites superiores (segundos) dos baldes do histograma de latência: 1 ms a ~30 min
+LATENCY_BUCKET_BOUNDS = [0.001 * (1.25 ** i) for i in range(65)]
+
+def latency_percentile(histogram, q):
+    """Estima o percentil 'q' (0-1) da latência interpolando dentro do balde."""
+    total = sum(histogram)
+    if total == 0:
+        return 0.0
+    target = q * total
+    cumulative = 0.0
+    for i, count in enumerate(histogram):
+        if count and cumulative + count >= target:
+            lower = LATENCY_BUCKET_BOUNDS[i - 1] if i > 0 else 0.0
+            upper = LATENCY_BUCKET_BOUNDS[i] if i < len(LATENCY_BUCKET_BOUNDS) else lower
+            return lower + (upper - lower) * (target - cumulative) / count
+        cumulative += count
+    return LATENCY_BUCKET_BOUNDS[-1]
+
+def format_latency(seconds):
+    """Formata uma latência em µs, ms ou s."""
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.0f}µs"
+    return f"{seconds * 1000:.1f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+
+# =============================================================================
+# ### TRACE POR AVALIAÇÃO E EXPORTAÇÃO DE MÉTRICAS ###
+# =============================================================================
+class TraceWriter:
+    """
+    Trace JSONL por avaliação, gravado fora do caminho quente.
+
+    record() só acrescenta o registro a uma lista em memória; uma thread daemon do
+    processo serializa o lote acumulado e o grava com uma única escrita em modo
+    O_APPEND, então vários workers compartilham o arquivo sem intercalar linhas.
+    """
+
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pending = []
+        # Reentrante: flush() também é chamado pelo handler de SIGTERM do worker
+        self._lock = threading.RLock()
+        self._thread = None
+
+    def record(self, entry):
+        with self._lock:
+            self._pending.append(entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """Grava as linhas acumuladas."""
+        with self._lock:
+            entries, self._pending = self._pending, []
+        if not entries:
+            return
+        data = "".join(json.dumps(entry) + "\n" for entry in entries).encode('utf-8')
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"AVISO: Falha ao gravar o trace em '{self.path}': {e}", file=sys.stderr)
+
+class MetricsExporter:
+    """
+    Métricas ao vivo do processo principal no formato de texto do Prometheus,
+    servidas em GET /metrics na porta 'port' e/ou gravadas no arquivo 'textfile_path'
+    (None desativa cada um). Os contadores vêm da memória compartilhada dos
+    workers; o melhor valor é atualizado pelo monitor.
+    """
+
+    def __init__(self, eval_metrics, algorithm, start_time, end_time, port=None, textfile_path=None):
+        self.eval_metrics = eval_metrics
+        self.algorithm = algorithm
+        self.start_time = start_time
+        self.end_time = end_time
+        self.port = port
+        self.textfile_path = textfile_path
+        self.best_value = None  # Valor real (sem o multiplicador do objetivo)
+        self._server = None
+
+    def render(self):
+        """Texto de exposição com o estado atual."""
+        metrics = self.eval_metrics.snapshot()
+        now = time.time()
+        elapsed = max(now - self.start_time, 1e-9)
+        failures = metrics['timeouts'] + metrics['parse_failures'] + metrics['crashes']
+        labels = f'algorithm="{self.algorithm}"'
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP autotune_{name} {help_text}")
+            lines.append(f"# TYPE autotune_{name} {kind}")
+            for extra, value in samples:
+                label_set = labels + (',' + extra if extra else '')
+                lines.append(f"autotune_{name}{{{label_set}}} {value}")
+
+        metric('evaluations_total', 'counter', "Execuções do modelo.",
+               [('', metrics['evaluations'])])
+        metric('evaluations_per_second', 'gauge', "Execuções por segundo desde o início.",
+               [('', metrics['evaluations'] / elapsed)])
+        metric('failures_total', 'counter', "Execuções com falha por status.",
+               [('status="timeout"', metrics['timeouts']),
+                ('status="parse"', metrics['parse_failures']),
+                ('status="crash"', metrics['crashes']),
+                ('status="capped"', metrics['capped'])])
+        metric('failure_rate', 'gauge', "Fração das execuções que falharam.",
+               [('', failures / metrics['evaluations'] if metrics['evaluations'] else 0.0)])
+        metric('rejected_total', 'counter', "Candidatos inviáveis descartados sem executar.",
+               [('', metrics['rejected'])])
+        metric('best_value', 'gauge', "Melhor valor encontrado até agora.",
+               [('', 'NaN' if self.best_value is None else self.best_value)])
+        metric('eval_seconds_total', 'counter', "Tempo de parede somado das execuções.",
+               [('', metrics['eval_time'])])
+        metric('latency_seconds', 'gauge', "Latência por execução (quantis do histograma).",
+               [(f'quantile="{q}"', latency_percentile(metrics['histogram'], q))
+                for q in (0.5, 0.95, 0.99)])
+        metric('elapsed_seconds', 'gauge', "Tempo desde o início da otimização.",
+               [('', now - self.start_time)])
+        metric('remaining_seconds', 'gauge', "Tempo restante até o limite.",
+               [('', max(0.0, self.end_time - now))])
+        return "\n".join(lines) + "\n"
+
+    def start(self):
+        """Inicia o servidor HTTP (se configurado) em uma thread daemon."""
+        if self.port is None:
+            return
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Sem log por requisição no console do monitor
+
+        try:
+            self._server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        except OSError as e:
+            print(f"AVISO: Não foi possível abrir a porta de métricas {self.port}: {e}")
+            return
+        self.port = self._server.server_address[1]  # Porta 0: escolhida pelo sistema
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"Métricas ao vivo em http://127.0.0.1:{self.port}/metrics")
+
+    def write_textfile(self):
+        """Reescreve o arquivo de métricas de forma atômica (se configurado)."""
+        if self.textfile_path is None:
+            return
+        temporary = f"{self.textfile_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(temporary, self.textfile_path)
+        except OSError as e:
+            print(f"AVISO: Falha ao gravar as métricas em '{self.textfile_path}': {e}", file=sys.stderr)
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,158 @@
+"""
+Espaço de parâmetros do teste.py: tipos, coordenadas de busca, condições e a
+codificação dos indivíduos em genomas.
+
+Funções puras, sem estado global do otimizador; usadas pelo teste.py, pelo modelo
+substituto e pelo TPE (surrogates.py).
+"""
+import math
+import random
+
+# =============================================================================
+# ### TIPOS DE PARÂMETROS ###
+# =============================================================================
+# Cada parâmetro é buscado em uma "coordenada" numérica:
+#   cat       - índice da opção (sem ordem: só igual ou diferente)
+#   ord       - índice da opção (com ordem: os vizinhos são as opções adjacentes)
+#   int/float - o próprio valor
+#   log-int   - log do valor (a decodificação arredonda para inteiro)
+#   log-float - log do valor
+# Mutação, passos da busca local, densidades do TPE e distâncias do modelo substituto
+# operam nessa coordenada: um parâmetro de 1 a 10^6 em escala log recebe passos
+# proporcionais ao próprio valor em vez de saltos lineares de range/10.
+#
+# Um parâmetro com 'condition' = {'parent': j, 'values': [...]} só está ativo quando o
+# parâmetro j (anterior a ele) está ativo e vale um dos 'values' (no tipo do pai: texto
+# para 'cat'/'ord', número para os demais; ver condition_values). Inativo, ele fica
+# fixo no valor padrão (primeira opção ou mínimo), então variações nele não geram
+# pontos novos e o espaço efetivo de busca encolhe.
+PARAM_TYPES = ('cat', 'ord', 'int', 'float', 'log-int', 'log-float')
+
+def coordinate_bounds(p_def):
+    """Retorna (mínimo, máximo, tipo) da coordenada: tipo 'cat', 'int' (discreta) ou 'float'."""
+    p_type = p_def['type']
+    if p_type == 'cat':
+        return 0, len(p_def['options']) - 1, 'cat'
+    if p_type == 'ord':
+        return 0, len(p_def['options']) - 1, 'int'
+    if p_type in ('int', 'budget'):
+        return p_def['min'], p_def['max'], 'int'
+    if p_type == 'float':
+        return float(p_def['min']), float(p_def['max']), 'float'
+    # Escala log; log-int cobre [min, max + 1) para cada inteiro ter a sua faixa
+    upper = p_def['max'] + 1 if p_type == 'log-int' else p_def['max']
+    return math.log(p_def['min']), math.log(upper), 'float'
+
+def to_coordinate(p_def, value):
+    """Coordenada de busca de um valor do parâmetro."""
+    p_type = p_def['type']
+    if p_type in ('cat', 'ord'):
+        return p_def['options'].index(value)
+    if p_type == 'log-int':
+        return math.log(value + 0.5)
+    if p_type == 'log-float':
+        return math.log(value)
+    return value
+
+def from_coordinate(p_def, coordinate):
+    """Valor do parâmetro para uma coordenada (limitada ao intervalo válido)."""
+    low, high, _ = coordinate_bounds(p_def)
+    coordinate = max(low, min(high, coordinate))
+    p_type = p_def['type']
+    if p_type in ('cat', 'ord'):
+        return p_def['options'][int(round(coordinate))]
+    if p_type == 'log-int':
+        return max(p_def['min'], min(p_def['max'], int(math.exp(coordinate))))
+    if p_type == 'log-float':
+        return max(p_def['min'], min(p_def['max'], math.exp(coordinate)))
+    if p_type == 'float':
+        return coordinate
+    return int(round(coordinate))
+
+def random_coordinate(low, high, kind):
+    """Coordenada uniforme em [low, high]."""
+    if kind == 'float':
+        return random.uniform(low, high)
+    return random.randint(low, high)
+
+def default_value(p_def):
+    """Valor de um parâmetro inativo: a primeira opção ou o mínimo."""
+    return p_def['options'][0] if p_def['type'] in ('cat', 'ord') else p_def['min']
+
+def condition_values(parent_def, values):
+    """
+    Converte os valores de uma condição para o tipo do parâmetro pai: opções de
+    'cat'/'ord' como texto, números para os demais ('3' e 3.0 viram 3 num pai 'int').
+    Lança ValueError se algum valor não pode ser assumido pelo pai.
+    """
+    p_type = parent_def['type']
+    converted = []
+    for value in values:
+        if p_type in ('cat', 'ord'):
+            value = str(value).strip()
+            if value not in parent_def['options']:
+                raise ValueError(f"{value!r} não é uma opção do parâmetro pai")
+        else:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{value!r} não é numérico")
+            if p_type in ('int', 'log-int'):
+                if not value.is_integer():
+                    raise ValueError(f"{value!r} não é inteiro")
+                value = int(value)
+            if not parent_def['min'] <= value <= parent_def['max']:
+                raise ValueError(f"{value!r} fora do intervalo [{parent_def['min']}, {parent_def['max']}]")
+        converted.append(value)
+    return converted
+
+def is_active(individual, i, param_definitions):
+    """True se as condições do parâmetro i (e de seus pais) são satisfeitas."""
+    condition = param_definitions[i].get('condition')
+    while condition:
+        parent = condition['parent']
+        if individual[parent] not in condition['values']:
+            return False
+        condition = param_definitions[parent].get('condition')
+    return True
+
+def apply_conditions(individual, param_definitions):
+    """Retorna o indivíduo com os parâmetros inativos fixados no valor padrão."""
+    if not any('condition' in p_def for p_def in param_definitions):
+        return individual
+    individual = list(individual)
+    # Pais vêm antes dos filhos, então a ordem natural resolve as cadeias
+    for i, p_def in enumerate(param_definitions):
+        if 'condition' in p_def and not is_active(individual, i, param_definitions):
+            individual[i] = default_value(p_def)
+    return individual
+
+
+# =============================================================================
+# ### GENOMAS ###
+# =============================================================================
+# Um genoma é a tupla com a coordenada de busca de cada parâmetro (índice da opção,
+# valor ou log do valor). O GA, o modelo substituto e as regiões de falha trabalham
+# sobre genomas; a conversão de volta para valores acontece só na fronteira com evaluate().
+def encode_individual(individual, param_definitions):
+    """Converte um indivíduo (valores de parâmetros) em genoma."""
+    return tuple(to_coordinate(p_def, value) for value, p_def in zip(individual, param_definitions))
+
+def decode_individual(genome, param_definitions):
+    """Converte um genoma de volta para a lista de valores de parâmetros."""
+    return apply_conditions([from_coordinate(p_def, gene)
+                             for gene, p_def in zip(genome, param_definitions)], param_definitions)
+
+def gene_bounds(param_definitions):
+    """Retorna (mínimo, máximo, tipo da coordenada, amplitude da mutação) de cada gene."""
+    bounds = []
+    for p_def in param_definitions:
+        low, high, kind = coordinate_bounds(p_def)
+        if kind == 'cat':
+            amplitude = 0
+        elif kind == 'int':
+            amplitude = max(1, (high - low) // 10)
+        else:
+            amplitude = (high - low) / 10
+        bounds.append((low, high, kind, amplitude))
+    return bounds
@@ -0,0 +1,204 @@
+"""
+Modelos da busca do teste.py: o modelo substituto k-NN que pré-seleciona candidatos
+nos workers e o TPE que propõe os pontos da busca baseada em modelo.
+
+Não dependem do estado global do otimizador; a configuração (SURROGATE_*, TPE_*), as
+restrições e o gerador de pontos aleatórios vêm do teste.py pelos construtores.
+"""
+import heapq
+import math
+import random
+from collections import deque
+
+from space import (apply_conditions, coordinate_bounds, encode_individual, from_coordinate, gene_bounds,
+                   random_coordinate, to_coordinate)
+
+# =============================================================================
+# ### MODELO SUBSTITUTO (PRÉ-SELEÇÃO DE CANDIDATOS) ###
+# =============================================================================
+class KNNSurrogate:
+    """
+    Modelo substituto k-NN treinado incrementalmente com as avaliações do worker.
+
+    Trabalha sobre genomas (coordenadas de busca) com uma distância mista:
+    categóricos contam 0/1 por divergência e os demais a diferença de coordenada
+    normalizada pelo intervalo. A previsão é a média dos K vizinhos mais próximos
+    ponderada pelo inverso da distância. Falhas (-inf) entram como o pior valor
+    finito observado, para afastar a busca dessas regiões.
+    """
+
+    def __init__(self, param_definitions, k=5, max_points=2000):
+        self.param_definitions = param_definitions
+        self.k = k
+        bounds = gene_bounds(param_definitions)
+        self.is_cat = [kind == 'cat' for _, _, kind, _ in bounds]
+        self.scales = [float(high - low) or 1.0 for low, high, _, _ in bounds]
+        self.points = deque(maxlen=max_points)
+        self.worst = None
+
+    def __len__(self):
+        return len(self.points)
+
+    def observe(self, individual, fitness):
+        """Acrescenta uma avaliação real (indivíduo decodificado) ao conjunto de treino."""
+        genome = encode_individual(individual, self.param_definitions)
+        if fitness != -float('inf') and (self.worst is None or fitness < self.worst):
+            self.worst = fitness
+        self.points.append((genome, fitness))
+
+    def distance(self, a, b):
+        """Distância mista entre dois genomas."""
+        total = 0.0
+        for x, y, is_cat, scale in zip(a, b, self.is_cat, self.scales):
+            if is_cat:
+                total += x != y
+            else:
+                total += abs(x - y) / scale
+        return total
+
+    def predict(self, genome):
+        """Fitness previsto para um genoma."""
+        floor = (self.worst if self.worst is not None else 0.0) - 1.0
+        nearest = heapq.nsmallest(self.k, ((self.distance(genome, g), f) for g, f in self.points),
+                                  key=lambda item: item[0])
+        weight_sum = 0.0
+        value_sum = 0.0
+        for dist, fitness in nearest:
+            if fitness == -float('inf'):
+                fitness = floor
+            if dist == 0:
+                return fitness
+            weight_sum += 1.0 / dist
+            value_sum += fitness / dist
+        return value_sum / weight_sum if weight_sum else 0.0
+
+# =============================================================================
+# ### TPE (OTIMIZAÇÃO BASEADA EM MODELO) ###
+# =============================================================================
+class TPESampler:
+    """
+    Tree-structured Parzen Estimator sobre as coordenadas de busca dos parâmetros.
+
+    As observações são divididas em "boas" (fração gamma de maior fitness) e
+    "ruins". Cada parâmetro ganha duas densidades independentes, l(x) sobre as boas
+    e g(x) sobre as ruins: categóricos usam frequências com suavização (+1 por
+    opção) e os demais uma mistura de gaussianas na coordenada (log nos tipos log-*)
+    centradas nos pontos observados, com um componente uniforme como prior. A proposta
+    é o candidato, amostrado de l(x), que maximiza l(x)/g(x). Pontos ainda em avaliação entram como ruins ("constant
+    liar"), o que espalha as propostas de um mesmo lote.
+    """
+
+    def __init__(self, param_definitions, random_individual, is_feasible=None, startup_points=(),
+                 gamma=0.25, candidates=24, startup=20):
+        """
+        'random_individual(param_definitions)' sorteia um ponto (usado no início e quando
+        o modelo não acha candidato novo), 'is_feasible(individual)' descarta candidatos
+        inviáveis e 'startup_points' são os primeiros pontos propostos (desenho inicial).
+        """
+        self.param_definitions = param_definitions
+        self.bounds = [coordinate_bounds(p_def) for p_def in param_definitions]
+        self.random_individual = random_individual
+        self.is_feasible = is_feasible or (lambda individual: True)
+        self.gamma = gamma
+        self.candidates = candidates
+        self.startup = startup
+        self.observations = []  # (indivíduo, fitness)
+        self.pending = []       # Propostas ainda em avaliação
+        self.startup_points = list(startup_points)
+
+    def tell(self, individual, fitness):
+        """Registra o resultado de uma proposta."""
+        if individual in self.pending:
+            self.pending.remove(individual)
+        self.observations.append((individual, fitness))
+
+    def ask(self, count):
+        """Propõe 'count' novos pontos (marcados como pendentes até o tell)."""
+        proposals = []
+        for _ in range(count):
+            individual = self._propose()
+            self.pending.append(individual)
+            proposals.append(individual)
+        return proposals
+
+    def _propose(self):
+        seen = {tuple(ind) for ind, _ in self.observations}
+        seen.update(tuple(ind) for ind in self.pending)
+
+        if len(self.observations) < self.startup:
+            while self.startup_points:
+                individual = self.startup_points.pop()
+                if tuple(individual) not in seen:
+                    return individual
+            return self._random_unseen(seen)
+
+        ranked = sorted(self.observations, key=lambda obs: obs[1], reverse=True)
+        n_good = max(1, int(math.ceil(self.gamma * len(ranked))))
+        good = [ind for ind, _ in ranked[:n_good]]
+        bad = [ind for ind, _ in ranked[n_good:]] + self.pending
+
+        best_candidate = None
+        best_score = -float('inf')
+        for _ in range(self.candidates):
+            candidate = apply_conditions([self._sample(d, good)
+                                          for d in range(len(self.param_definitions))],
+                                         self.param_definitions)
+            if tuple(candidate) in seen or not self.is_feasible(candidate):
+                continue
+            score = sum(math.log(self._density(d, candidate[d], good)) -
+                        math.log(self._density(d, candidate[d], bad))
+                        for d in range(len(self.param_definitions)))
+            if score > best_score:
+                best_score = score
+                best_candidate = candidate
+
+        return best_candidate if best_candidate is not None else self._random_unseen(seen)
+
+    def _random_unseen(self, seen, attempts=20):
+        individual = self.random_individual(self.param_definitions)
+        for _ in range(attempts):
+            if tuple(individual) not in seen:
+                break
+            individual = self.random_individual(self.param_definitions)
+        return individual
+
+    def _bandwidth(self, d, n_points):
+        low, high, kind = self.bounds[d]
+        bandwidth = (high - low) * 0.2 * (n_points ** -0.2)
+        return max(1.0, bandwidth) if kind == 'int' else max(bandwidth, 1e-12)
+
+    def _sample(self, d, points):
+        """Amostra o valor do parâmetro d a partir da densidade estimada sobre 'points'."""
+        p_def = self.param_definitions[d]
+        if p_def['type'] == 'cat':
+            weights = [1 + sum(1 for ind in points if ind[d] == option) for option in p_def['options']]
+            return random.choices(p_def['options'], weights=weights)[0]
+
+        low, high, kind = self.bounds[d]
+        # Prior uniforme com o mesmo peso de um ponto observado
+        if random.random() < 1.0 / (len(points) + 1):
+            return from_coordinate(p_def, random_coordinate(low, high, kind))
+        center = to_coordinate(p_def, random.choice(points)[d])
+        coordinate = random.gauss(center, self._bandwidth(d, len(points)))
+        if kind == 'int':
+            coordinate = int(round(coordinate))
+        return from_coordinate(p_def, coordinate)
+
+    def _density(self, d, value, points):
+        """Densidade (não normalizada entre parâmetros) do valor 'value' no parâmetro d."""
+        p_def = self.param_definitions[d]
+        if p_def['type'] == 'cat':
+            count = sum(1 for ind in points if ind[d] == value)
+            return (count + 1.0) / (len(points) + len(p_def['options']))
+
+        low, high, kind = self.bounds[d]
+        weight = 1.0 / (len(points) + 1)
+        width = high - low + 1 if kind == 'int' else (high - low) or 1.0
+        density = weight / width
+        if points:
+            x = to_coordinate(p_def, value)
+            sigma = self._bandwidth(d, len(points))
+            norm = weight / (sigma * math.sqrt(2 * math.pi))
+            for ind in points:
+                density += norm * math.exp(-0.5 * ((x - to_coordinate(p_def, ind[d])) / sigma) ** 2)
+        return max(density, 1e-300)
@@ -2,9 +2,36 @@ import subprocess
 import random
 import time
 import sys
-from multiprocessing import Pool, cpu_count, Manager
+import multiprocessing
+import multiprocessing.util
+from multiprocessing import Pool, cpu_count
+from multiprocessing.managers import SyncManager
+from collections import OrderedDict, deque
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+import queue
+import bisect
+import heapq
+import itertools
+import math
+import hashlib
+import json
 import os
 import copy
+import statistics
+import argparse
+import importlib
+import pickle
+import signal
+import socket
+
+from space import (PARAM_TYPES, coordinate_bounds, to_coordinate, from_coordinate, random_coordinate,
+                   default_value, condition_values, is_active, apply_conditions,
+                   encode_individual, decode_individual, gene_bounds)
+from surrogates import KNNSurrogate, TPESampler
+from exporter import (LATENCY_BUCKET_BOUNDS, latency_percentile, format_latency,
+                      TraceWriter, MetricsExporter)
+from broker import MessageConnection, EvaluationBroker, BrokerClient, AgentEvaluationLog
 
 # =============================================================================
 # ### CONFIGURAÇÃO PRINCIPAL (HARD-CODED) ###
@@ -18,6 +45,244 @@ TIME_LIMIT_MINUTES = 10
 # Número de processos paralelos (Multi-Start)
 WORKER_COUNT = 8
 
+# Tempo máximo (segundos) de uma avaliação
+EVAL_TIMEOUT_SECONDS = 30
+
+# Timeout adaptativo: após ADAPTIVE_TIMEOUT_MIN_SAMPLES execuções, o limite de cada
+# avaliação passa a ser ADAPTIVE_TIMEOUT_FACTOR x o percentil ADAPTIVE_TIMEOUT_PERCENTILE
+# da latência observada (nunca acima de EVAL_TIMEOUT_SECONDS). Uma execução abortada
+# por esse limite menor não conta como falha da configuração nem vai para o histórico;
+# só o timeout em EVAL_TIMEOUT_SECONDS é falha definitiva, e o ponto volta a executar
+# se for proposto de novo. Desligado por padrão: com latências muito variáveis o
+# limite menor pode abortar configurações boas e só atrasar a busca.
+ADAPTIVE_TIMEOUT = False
+ADAPTIVE_TIMEOUT_PERCENTILE = 0.99
+ADAPTIVE_TIMEOUT_FACTOR = 3.0
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 30
+
+# Capping adaptativo (somente com objetivo 'min' e quando a saída do modelo é o seu
+# próprio tempo de execução em segundos): uma avaliação que passar de CAPPING_FACTOR x o
+# tempo do melhor global é abortada e registrada com o limite inferior (tempo >= limite),
+# em vez de contar como falha.
+CAPPING_ENABLED = False
+CAPPING_FACTOR = 1.5
+CAPPING_MIN_SECONDS = 0.5
+
+# Tratamento de ruído (objetivos medidos, como tempo de execução, variam entre execuções):
+#   NOISE_HANDLING     - um candidato que parece melhor é remedido e disputa com o incumbente
+#                        (teste t de Welch) antes de ser aceito; as medições param assim que
+#                        a decisão fica clara
+#   NOISE_MIN_SAMPLES  - medições mínimas de cada lado antes de decidir
+#   NOISE_MAX_SAMPLES  - teto de medições por configuração; sem significância, decide pela média
+#   NOISE_CONFIDENCE   - nível de confiança do teste e dos intervalos do relatório
+#   FINAL_VALIDATION_TOP_K / FINAL_VALIDATION_SAMPLES - revalidação final dos melhores
+NOISE_HANDLING = False
+NOISE_MIN_SAMPLES = 3
+NOISE_MAX_SAMPLES = 10
+NOISE_CONFIDENCE = 0.95
+FINAL_VALIDATION_TOP_K = 5
+FINAL_VALIDATION_SAMPLES = 10
+
+# Protocolo de invocação do executável:
+#   'oneshot'   - um processo novo por avaliação (padrão; funciona com qualquer executável)
+#   'coprocess' - cada worker inicia o executável uma vez (com COPROCESS_ARGS) e envia uma
+#                 linha de parâmetros por avaliação pelo stdin, lendo um score por linha
+#   'batch'     - uma invocação (com BATCH_ARGS) lê N linhas de parâmetros pelo stdin e
+#                 escreve N scores; usado na avaliação das populações do GA
+# Em 'coprocess' e 'batch' os parâmetros de cada linha são separados por espaço.
+EXECUTION_MODE = 'oneshot'
+COPROCESS_ARGS = ['--serve']
+BATCH_ARGS = ['--batch']
+
+# Desenho inicial dos pontos de partida do PS, das populações iniciais do GA/memético e
+# dos pontos iniciais do TPE: 'random' (uniforme, padrão), 'lhs' (hipercubo latino) ou 'halton'
+# (sequência de Halton embaralhada). Com 'lhs' e 'halton' os categóricos recebem as opções
+# de forma balanceada e o desenho, sem pontos repetidos, é repartido entre os workers, que
+# cobrem o espaço sem se sobrepor.
+INITIAL_DESIGN = 'random'
+
+# Checkpoints (desligados por padrão): com CHECKPOINT_ENABLED cada tarefa (ilha do
+# GA/memético, busca do PS, escalonador do TPE ou do Hyperband) grava o próprio estado em
+# CHECKPOINT_DIR a cada CHECKPOINT_INTERVAL_SECONDS, e o processo principal grava o melhor
+# global e o tempo já consumido. Com 'python teste.py --resume' a execução continua de
+# onde parou, com o tempo restante ('--config ARQUIVO --resume' grava mesmo desligado).
+# As avaliações já feitas são reaproveitadas pelo histórico (EVAL_STORE_ENABLED).
+# Valem para o prompt interativo e o --config; tune() só grava checkpoints com o
+# argumento checkpoint_dir, num subdiretório próprio de cada configuração.
+CHECKPOINT_ENABLED = False
+CHECKPOINT_DIR = os.path.join(SCRIPT_DIR, "checkpoint")
+CHECKPOINT_INTERVAL_SECONDS = 30
+
+# Trace por avaliação: uma linha JSON por execução do modelo com parâmetros, valor bruto,
+# tempo de parede, status, worker, algoritmo e fase da busca (geração do GA, passos do PS,
+# refinamento do memético...). Cada processo acumula as linhas em memória e uma thread
+# as grava em lote a cada TRACE_FLUSH_SECONDS.
+TRACE_ENABLED = False
+TRACE_PATH = os.path.join(SCRIPT_DIR, "trace_avaliacoes.jsonl")
+TRACE_FLUSH_SECONDS = 1.0
+
+# Exportação de métricas ao vivo no formato de texto do Prometheus (None desativa):
+#   METRICS_HTTP_PORT     - porta local (127.0.0.1) que responde GET /metrics
+#   METRICS_TEXTFILE_PATH - arquivo .prom reescrito a cada METRICS_EXPORT_INTERVAL
+#                           segundos (textfile collector do node_exporter)
+METRICS_HTTP_PORT = None
+METRICS_TEXTFILE_PATH = None
+METRICS_EXPORT_INTERVAL = 5
+
+# Perfil do otimizador: cronometra o que cada processo gasta fora do modelo, por fase
+# (geração de candidatos, seleção, preparo da avaliação, parsing da saída e envio de
+# resultados), e mostra o resumo por worker no relatório final.
+PROFILE_PHASES = False
+# Perfil detalhado de cada processo worker, gravado em PROFILE_DIR ao encerrar:
+#   None       - desativado
+#   'cprofile' - cProfile determinístico (worker_<pid>.prof, legível pelo pstats)
+#   'sampling' - amostra as pilhas das threads a cada PROFILE_SAMPLE_INTERVAL segundos
+#                (worker_<pid>.folded, formato de pilhas agregadas do flamegraph)
+PROFILE_MODE = None
+PROFILE_DIR = os.path.join(SCRIPT_DIR, "perfil")
+PROFILE_SAMPLE_INTERVAL = 0.005
+
+# Avaliação distribuída em várias máquinas. Com BROKER_ENABLED o processo principal abre
+# uma fila de trabalho TCP em BROKER_BIND:BROKER_PORT e os workers enviam a ela cada
+# execução do modelo (cache, restrições e métricas continuam nos workers). Agentes em
+# qualquer máquina executam as configurações e devolvem os resultados:
+#     python teste.py --agent host-do-otimizador:5557 [--slots N] [--executable caminho]
+# Um agente sem mensagens (heartbeat a cada AGENT_HEARTBEAT_SECONDS) por
+# BROKER_AGENT_TIMEOUT segundos é dado como perdido e as avaliações dele voltam para a
+# fila, até BROKER_MAX_DISPATCHES envios por configuração; depois disso ela volta ao
+# worker sem resultado (não é memoizada). Do lado do worker, sem notícias do broker por
+# limite da avaliação + 2 x BROKER_AGENT_TIMEOUT (o broker manda heartbeat enquanto as
+# configurações esperam na fila) a conexão é descartada e as avaliações voltam sem
+# resultado. Com o broker, WORKER_COUNT é o número de buscas paralelas: use pelo menos o
+# total de slots dos agentes.
+BROKER_ENABLED = False
+BROKER_BIND = '0.0.0.0'
+BROKER_PORT = 5557
+BROKER_AGENT_TIMEOUT = 15
+BROKER_MAX_DISPATCHES = 3
+AGENT_HEARTBEAT_SECONDS = 3
+AGENT_RECONNECT_SECONDS = 5
+
+# Slots de avaliação com afinidade de CPU (Linux). Execuções simultâneas disputando os
+# mesmos núcleos, caches e banda de memória distorcem o tempo medido. Com CPU_AFFINITY
+# cada worker (e o executável que ele lança) fica preso a um conjunto exclusivo de
+# núcleos físicos, com os irmãos de hyperthreading juntos no mesmo slot:
+#   CORES_PER_EVALUATION     - núcleos físicos por slot (executáveis multithread)
+#   AFFINITY_RESERVED_CORES  - núcleos deixados para o processo principal e o Manager
+# O número de workers passa a ser o número de slots que cabem na topologia detectada.
+# Nos agentes (--agent) cada slot do agente recebe o seu conjunto de núcleos.
+CPU_AFFINITY = False
+CORES_PER_EVALUATION = 1
+AFFINITY_RESERVED_CORES = 1
+
+# Restrições sobre as configurações, conferidas antes de qualquer execução do modelo.
+# Os parâmetros são p1..pN na ordem do setup (incluindo o orçamento, se houver).
+#   CONSTRAINTS              - expressões Python que precisam ser verdadeiras,
+#                              ex.: "p1 + p3 <= 150" ou "p2 != 'c' or p1 < 50"
+#   FORBIDDEN_CONFIGURATIONS - dicionários {posição: valor}; é proibida a configuração
+#                              que coincide com todos os pares de algum deles, ex.: {2: 'c', 3: 0}
+#   CONSTRAINT_PREDICATE     - função (ou 'modulo:funcao') que recebe a lista de valores
+#                              e retorna False para configurações proibidas
+# Uma expressão ou predicado que lança exceção conta como violado.
+CONSTRAINTS = []
+FORBIDDEN_CONFIGURATIONS = []
+CONSTRAINT_PREDICATE = None
+
+# Regiões de falha aprendidas: um candidato com FAILURE_REGION_MIN_FAILURES falhas
+# observadas (crash, timeout ou saída inválida, nesta execução ou no histórico) a uma
+# distância normalizada de até FAILURE_REGION_RADIUS é descartado sem executar.
+# Desligado por padrão: falhas intermitentes do ambiente podem excluir regiões boas.
+FAILURE_LEARNING = False
+FAILURE_REGION_RADIUS = 0.1
+FAILURE_REGION_MIN_FAILURES = 2
+# Tentativas de gerar candidatos viáveis antes de aceitar um inviável
+FEASIBILITY_MAX_TRIES = 100
+
+# Sondagem dos vizinhos no Pattern Search:
+#   PS_POLL_WORKERS - avaliações simultâneas por busca (1 = sequencial, eixo a eixo).
+#                     Para uma única busca usar todos os núcleos, combine por exemplo
+#                     WORKER_COUNT = 1 com PS_POLL_WORKERS = número de núcleos.
+#   PS_POLL_MODE    - 'complete' (avalia o conjunto de sondagem inteiro e escolhe o melhor)
+#                     ou 'opportunistic' (aceita a primeira melhora e cancela o restante)
+PS_POLL_WORKERS = 1
+PS_POLL_MODE = 'complete'
+
+# Malha adaptativa do Pattern Search: passo inicial de cada eixo inteiro como fração
+# do seu intervalo, fator de expansão do passo após sucesso (falhas dividem por 2) e
+# movimentos de padrão (saltos ao longo da última direção bem-sucedida).
+PS_INITIAL_STEP_RATIO = 0.2
+PS_STEP_EXPANSION = 2.0
+PS_PATTERN_MOVES = True
+# Eixos contínuos (float, log-int, log-float): o passo é considerado zero (eixo convergido)
+# abaixo desta fração do intervalo da coordenada
+PS_FLOAT_RESOLUTION = 1e-3
+
+# Escalonador multi-start (algoritmo 'ps'): uma busca que converge é substituída na hora.
+#   RESTART_PERTURBATION_RATIO - fração dos reinícios que parte de uma perturbação do
+#                                melhor global (o resto parte de pontos aleatórios novos)
+#   RESTART_PERTURBATION_SCALE - desvio da perturbação, em fração do intervalo de cada inteiro
+#                                (e probabilidade de trocar cada categórico)
+#   RESTART_FAILURE_BACKOFF    - espera (s) antes de relançar uma busca que terminou com
+#                                exceção; dobra a cada falha seguida no mesmo slot
+#   RESTART_MAX_FAILURES       - falhas seguidas após as quais o slot deixa de ser relançado
+RESTART_PERTURBATION_RATIO = 0.5
+RESTART_PERTURBATION_SCALE = 0.1
+RESTART_FAILURE_BACKOFF = 1.0
+RESTART_MAX_FAILURES = 5
+
+# Encerramento antecipado (qualquer algoritmo; None desativa):
+#   MAX_EVALUATIONS        - orçamento de execuções do modelo
+#   NO_IMPROVEMENT_MINUTES - encerra se o melhor global não melhora por esse tempo
+MAX_EVALUATIONS = None
+NO_IMPROVEMENT_MINUTES = None
+
+# Otimização baseada em modelo (algoritmo 'tpe'):
+#   TPE_STARTUP    - avaliações aleatórias antes de usar o modelo
+#   TPE_GAMMA      - fração das observações consideradas "boas"
+#   TPE_CANDIDATES - candidatos amostrados de l(x) por proposta (vence o maior l(x)/g(x))
+TPE_STARTUP = 20
+TPE_GAMMA = 0.25
+TPE_CANDIDATES = 24
+
+# Multi-fidelidade (algoritmo 'hyperband', requer um parâmetro do tipo 'budget'):
+#   HYPERBAND_ETA - fator de redução: só 1/ETA de cada degrau é promovido ao orçamento
+#                   seguinte, ETA vezes maior
+HYPERBAND_ETA = 3
+
+# Modelo substituto (k-NN) para pré-seleção: os candidatos gerados pelo GA e os vizinhos
+# do Pattern Search são ordenados pelo fitness previsto e só a fração
+# SURROGATE_ACCEPT_RATIO mais promissora é enviada ao executável. O modelo de cada worker
+# é treinado com as avaliações que ele observa e só filtra após SURROGATE_MIN_POINTS.
+SURROGATE_ENABLED = False
+SURROGATE_ACCEPT_RATIO = 0.5
+SURROGATE_K = 5
+SURROGATE_MIN_POINTS = 20
+SURROGATE_MAX_POINTS = 2000
+
+# Modelo de ilhas (GA e memético): as populações paralelas trocam seus melhores
+# indivíduos a cada MIGRATION_INTERVAL gerações.
+#   MIGRATION_TOPOLOGY: None (populações isoladas, padrão), 'ring' (ilha i envia
+#                       para i+1) ou 'all' (todas para todas)
+#   MIGRATION_REPLACEMENT: 'worst' (imigrantes substituem os piores) ou 'random'
+#                          (substituem indivíduos aleatórios fora da elite)
+MIGRATION_TOPOLOGY = None
+MIGRATION_INTERVAL = 5
+MIGRATION_COUNT = 2
+MIGRATION_REPLACEMENT = 'worst'
+
+# Cache de avaliações compartilhado entre os workers.
+# Desative (False) para objetivos ruidosos, em que cada chamada deve re-executar o modelo.
+CACHE_ENABLED = True
+# Número máximo de entradas no cache (as menos usadas recentemente são descartadas)
+CACHE_MAX_SIZE = 100000
+
+# Histórico persistente de avaliações (log JSONL append-only, chaveado pelo hash
+# do executável + parâmetros). É pré-carregado no cache no início de cada execução,
+# então sessões repetidas não executam de novo configurações já medidas.
+# Requer CACHE_ENABLED = True.
+EVAL_STORE_ENABLED = True
+EVAL_STORE_PATH = os.path.join(SCRIPT_DIR, "historico_avaliacoes.jsonl")
+
 # =============================================================================
 # ### FUNÇÃO 1: SETUP INTERATIVO ###
 # =============================================================================
@@ -44,8 +309,11 @@ def setup_parameters():
     print("  ps     - Pattern Search (busca local)")
     print("  ga     - Algoritmo Genético (busca global)")
     print("  hybrid - Híbrido (GA primeiro, depois PS para refinamento)")
-    algo_prompt = "\nQual algoritmo deseja usar? (ps / ga / hybrid): "
-    algorithm = get_user_input(algo_prompt, str, lambda v: v.lower() in ['ps', 'ga', 'hybrid'])
+    print("  tpe    - Otimização baseada em modelo (Tree-structured Parzen Estimator)")
+    print("  hyperband - Multi-fidelidade (successive halving / Hyperband; requer um parâmetro 'budget')")
+    algo_prompt = "\nQual algoritmo deseja usar? (ps / ga / hybrid / tpe / hyperband): "
+    algorithm = get_user_input(algo_prompt, str,
+                               lambda v: v.lower() in ['ps', 'ga', 'hybrid', 'tpe', 'hyperband'])
     algorithm = algorithm.lower()
 
     # 2. Objetivo
@@ -64,49 +332,1442 @@ def setup_parameters():
     for i in range(num_params):
         print(f"\n--- Parâmetro {i+1} de {num_params} ---")
 
-        # 4a. Tipo
-        p_type_prompt = f"Qual o tipo do parâmetro {i+1}? (cat / int): "
-        p_type = get_user_input(p_type_prompt, str, lambda v: v.lower() in ['cat', 'int'])
+        # 4a. Tipo ('budget': inteiro de fidelidade, no máximo um por executável)
+        has_budget = any(p['type'] == 'budget' for p in param_definitions)
+        p_types = list(PARAM_TYPES) if has_budget else list(PARAM_TYPES) + ['budget']
+        p_type_prompt = f"Qual o tipo do parâmetro {i+1}? ({' / '.join(p_types)}): "
+        p_type = get_user_input(p_type_prompt, str, lambda v: v.lower() in p_types).lower()
 
-        if p_type.lower() == 'cat':
-            # 4b. Categórico
-            options_prompt = "Digite as opções separadas por vírgula (ex: baixo,medio,alto): "
+        if p_type in ('cat', 'ord'):
+            # 4b. Categórico ('ord': as opções têm ordem, ex.: baixo < medio < alto)
+            if p_type == 'cat':
+                options_prompt = "Digite as opções separadas por vírgula (ex: baixo,medio,alto): "
+            else:
+                options_prompt = "Digite as opções EM ORDEM, separadas por vírgula (ex: baixo,medio,alto): "
             options_str = get_user_input(options_prompt, str, lambda v: len(v) > 0)
             options_list = [opt.strip() for opt in options_str.split(',')]
 
             param_definitions.append({
-                'type': 'cat',
+                'type': p_type,
                 'options': options_list
             })
 
-        elif p_type.lower() == 'int':
-            # 4c. Inteiro
-            p_min = get_user_input(f"Valor MÍNIMO para o parâmetro {i+1}: ", int)
-            p_max = get_user_input(f"Valor MÁXIMO para o parâmetro {i+1}: ", int, lambda v: v >= p_min)
+        elif p_type in ('int', 'float', 'log-int', 'log-float'):
+            # 4c. Numérico (escala log: passos proporcionais ao valor, requer mínimo > 0)
+            caster = int if p_type in ('int', 'log-int') else float
+            log_scale = p_type.startswith('log')
+            p_min = get_user_input(f"Valor MÍNIMO para o parâmetro {i+1}: ", caster,
+                                   lambda v: v > 0 or not log_scale)
+            p_max = get_user_input(f"Valor MÁXIMO para o parâmetro {i+1}: ", caster, lambda v: v >= p_min)
+
+            param_definitions.append({
+                'type': p_type,
+                'min': p_min,
+                'max': p_max
+            })
+
+        elif p_type.lower() == 'budget':
+            # 4d. Orçamento (fidelidade): iterações, tamanho da entrada, épocas...
+            # Não é otimizado; os algoritmos comuns o fixam no máximo
+            p_min = get_user_input(f"Orçamento MÍNIMO para o parâmetro {i+1}: ", int, lambda v: v > 0)
+            p_max = get_user_input(f"Orçamento MÁXIMO (fidelidade total) para o parâmetro {i+1}: ",
+                                   int, lambda v: v >= p_min)
 
             param_definitions.append({
-                'type': 'int',
+                'type': 'budget',
                 'min': p_min,
                 'max': p_max
             })
 
+    # 5. Parâmetros condicionais: só fazem diferença para certos valores de outro parâmetro
+    cond_prompt = "\nAlgum parâmetro só fica ativo para certos valores de outro? (s / n): "
+    if num_params > 1 and get_user_input(cond_prompt, str, lambda v: v.lower() in ['s', 'n']).lower() == 's':
+        while True:
+            child = get_user_input(f"Número do parâmetro condicional (2 a {num_params}, 0 para terminar): ",
+                                   int, lambda v: v == 0 or 2 <= v <= num_params)
+            if child == 0:
+                break
+            parent = get_user_input(f"Ele depende de qual parâmetro? (1 a {child - 1}): ", int,
+                                    lambda v: 1 <= v < child and param_definitions[v - 1]['type'] != 'budget')
+            values = get_user_input(f"Valores do parâmetro {parent} que ativam o parâmetro {child} "
+                                    f"(separados por vírgula): ",
+                                    lambda v: condition_values(param_definitions[parent - 1], v.split(',')),
+                                    lambda v: len(v) > 0)
+            param_definitions[child - 1]['condition'] = {
+                'parent': parent - 1,
+                'values': values
+            }
+
+    if algorithm == 'hyperband' and not any(p['type'] == 'budget' for p in param_definitions):
+        print("\nAVISO: nenhum parâmetro 'budget' definido; o Hyperband avaliará tudo em fidelidade total.")
+
     print("\n" + "="*60)
     print("Configuração Concluída!")
     print("="*60 + "\n")
 
     return algorithm, objective_multiplier, param_definitions
 
+# =============================================================================
+# ### RESTRIÇÕES E REGIÕES DE FALHA ###
+# =============================================================================
+# Candidatos inviáveis são descartados já na geração (aleatória, desenho inicial,
+# crossover/mutação, vizinhos do Pattern Search e propostas do TPE), antes de qualquer
+# subprocesso. evaluate() ainda confere as restrições declaradas como salvaguarda.
+class ConstraintSet:
+    """
+    Restrições declaradas sobre a configuração completa (orçamento na sua posição):
+    expressões sobre p1..pN, configurações proibidas ({posição: valor}) e um predicado.
+    O código compilado e o predicado importado ficam fora do pickle e são recriados
+    sob demanda em cada processo.
+    """
+
+    def __init__(self, expressions=(), forbidden=(), predicate=None, budget_param=None):
+        self.expressions = [str(expression) for expression in expressions]
+        self.forbidden = [{int(position): str(value) for position, value in rule.items()}
+                          for rule in forbidden]
+        self.predicate = predicate
+        self.budget_param = budget_param
+        self._compiled = None
+        self._predicate = None
+        for expression in self.expressions:
+            try:
+                compile(expression, '<restrição>', 'eval')
+            except SyntaxError as e:
+                raise ValueError(f"restrição inválida {expression!r}: {e.msg}")
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_compiled'] = None
+        state['_predicate'] = None
+        return state
+
+    def __bool__(self):
+        return bool(self.expressions or self.forbidden or self.predicate)
+
+    def allows(self, individual, budget=None):
+        """True se a configuração satisfaz todas as restrições."""
+        params = insert_budget(individual, self.budget_param, budget)
+        for rule in self.forbidden:
+            if all(0 < position <= len(params) and str(params[position - 1]) == value
+                   for position, value in rule.items()):
+                return False
+
+        if self.expressions:
+            if self._compiled is None:
+                self._compiled = [compile(e, '<restrição>', 'eval') for e in self.expressions]
+            names = {f"p{i}": value for i, value in enumerate(params, 1)}
+            names['math'] = math
+            for code in self._compiled:
+                try:
+                    if not eval(code, {}, names):
+                        return False
+                except Exception:
+                    return False
+
+        if self.predicate is not None:
+            if self._predicate is None:
+                self._predicate = (load_objective(self.predicate) if isinstance(self.predicate, str)
+                                   else self.predicate)
+            try:
+                return bool(self._predicate(list(params)))
+            except Exception:
+                return False
+        return True
+
+def build_constraints(spec, budget_param):
+    """
+    ConstraintSet a partir de {'expressions', 'forbidden', 'predicate'} (None usa as
+    constantes do topo do arquivo). Retorna None se não houver nenhuma restrição.
+    """
+    if spec is None:
+        spec = {'expressions': CONSTRAINTS, 'forbidden': FORBIDDEN_CONFIGURATIONS,
+                'predicate': CONSTRAINT_PREDICATE}
+    constraints = ConstraintSet(spec.get('expressions', ()), spec.get('forbidden', ()),
+                                spec.get('predicate'), budget_param)
+    return constraints if constraints else None
+
+class FailureLog:
+    """
+    Registro das configurações que falharam, compartilhado por todos os workers.
+    Vive no processo do Manager e só cresce: cada processo busca apenas o que é novo.
+    """
+
+    def __init__(self, initial=()):
+        self._entries = [tuple(key) for key in initial]
+        self._lock = threading.Lock()
+
+    def add(self, key):
+        with self._lock:
+            self._entries.append(tuple(key))
+
+    def since(self, index):
+        """Falhas registradas a partir da posição 'index'."""
+        with self._lock:
+            return self._entries[index:]
+
+    def count(self):
+        with self._lock:
+            return len(self._entries)
+
+class FailureRegions:
+    """
+    Cópia local (por processo) das falhas do FailureLog, usada para evitar regiões
+    propensas a falhas. Usa a distância mista do modelo substituto sobre as coordenadas
+    de busca: categóricos diferentes já separam os pontos, numéricos somam a diferença
+    normalizada pelo intervalo. O orçamento não entra na distância.
+    """
+
+    MAX_POINTS = 2000
+
+    def __init__(self, param_definitions, failure_log, budget_param=None):
+        self.param_definitions = param_definitions
+        self.failure_log = failure_log
+        self.budget_param = budget_param
+        bounds = gene_bounds(param_definitions)
+        self.is_cat = [kind == 'cat' for _, _, kind, _ in bounds]
+        self.scales = [float(high - low) or 1.0 for low, high, _, _ in bounds]
+        self.points = deque(maxlen=self.MAX_POINTS)
+        self._synced = 0
+        self._refreshed = 0.0
+
+    def refresh(self):
+        """Traz as falhas novas do registro compartilhado (no máximo uma vez por segundo)."""
+        now = time.monotonic()
+        if now - self._refreshed < 1.0:
+            return
+        self._refreshed = now
+        entries = self.failure_log.since(self._synced)
+        self._synced += len(entries)
+        for key in entries:
+            params = list(key)
+            if self.budget_param is not None:
+                del params[self.budget_param[0]]
+            try:
+                self.points.append(encode_individual(params, self.param_definitions))
+            except (ValueError, TypeError):
+                continue  # Histórico de outro espaço de parâmetros
+
+    def is_failure_prone(self, individual):
+        """True se há falhas suficientes perto de 'individual'."""
+        self.refresh()
+        if len(self.points) < FAILURE_REGION_MIN_FAILURES:
+            return False
+        genome = encode_individual(individual, self.param_definitions)
+        near = 0
+        for point in self.points:
+            distance = 0.0
+            for x, y, is_cat, scale in zip(genome, point, self.is_cat, self.scales):
+                distance += (x != y) if is_cat else abs(x - y) / scale
+                if distance > FAILURE_REGION_RADIUS:
+                    break
+            else:
+                near += 1
+                if near >= FAILURE_REGION_MIN_FAILURES:
+                    return True
+        return False
+
+def is_feasible(individual, budget=None):
+    """
+    True se o candidato satisfaz as restrições declaradas e não cai em uma região
+    de falha aprendida. Descartes são contados nas métricas ('rejected').
+    """
+    if ((_constraints is not None and not _constraints.allows(individual, budget)) or
+            (_failure_regions is not None and _failure_regions.is_failure_prone(individual))):
+        record_metric('rejected', 1)
+        return False
+    return True
+
+def feasible_genomes(make_batch, count, param_definitions):
+    """
+    Junta 'count' genomas viáveis chamando make_batch(n) (até FEASIBILITY_MAX_TRIES
+    lotes). Se o espaço viável for pequeno demais, completa com o último lote.
+    """
+    if _constraints is None and _failure_regions is None:
+        return make_batch(count)
+    genomes = []
+    batch = []
+    for _ in range(FEASIBILITY_MAX_TRIES):
+        if len(genomes) >= count:
+            break
+        batch = make_batch(count - len(genomes))
+        started = phase_start()
+        genomes.extend(g for g in batch if is_feasible(decode_individual(g, param_definitions)))
+        phase_end('generation', started)
+    return (genomes + batch)[:count]
+
+def record_failure(params):
+    """Registra uma configuração completa que falhou (para o aprendizado de regiões)."""
+    if _failure_regions is not None:
+        _failure_regions.failure_log.add(params)
+
+def init_feasibility(constraints, failure_regions):
+    """Instala as restrições e as regiões de falha no processo atual."""
+    global _constraints, _failure_regions
+    _constraints = constraints
+    _failure_regions = failure_regions
+
+# =============================================================================
+# ### CACHE DE AVALIAÇÕES (COMPARTILHADO ENTRE WORKERS) ###
+# =============================================================================
+def compute_executable_hash(path):
+    """Calcula o SHA-256 do executável (identifica a versão do modelo no histórico)."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+class EvaluationStore:
+    """
+    Histórico persistente de avaliações em um arquivo JSONL append-only.
+
+    Cada linha guarda o hash do executável, os parâmetros e o valor bruto de saída
+    (sem o multiplicador do objetivo), de modo que execuções 'max' e 'min' sobre o
+    mesmo executável compartilham o histórico. Falhas são gravadas com valor nulo.
+    """
+
+    def __init__(self, path, executable_hash, objective_multiplier):
+        self.path = path
+        self.executable_hash = executable_hash
+        self.objective_multiplier = objective_multiplier
+        self._file = None
+
+    def load(self):
+        """Lê o histórico e retorna a lista de (chave, fitness) deste executável."""
+        entries = []
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Linha truncada (execução interrompida durante a escrita)
+                    continue
+                if record.get('exe') != self.executable_hash:
+                    continue
+                value = record.get('value')
+                fitness = -float('inf') if value is None else value * self.objective_multiplier
+                entries.append((tuple(record['params']), fitness))
+        return entries
+
+    def append(self, key, fitness):
+        """Acrescenta uma avaliação ao final do arquivo."""
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        value = None if fitness == -float('inf') else fitness * self.objective_multiplier
+        record = {'exe': self.executable_hash, 'params': list(key), 'value': value}
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+class EvaluationCache:
+    """
+    Tabela de memoização LRU com tamanho limitado, chaveada pela tupla de parâmetros.
+
+    Vive dentro do processo do Manager; os workers acessam através de um proxy,
+    de modo que um ponto já avaliado por qualquer worker não executa o modelo de novo.
+    Se um histórico persistente for informado, ele é pré-carregado aqui e cada nova
+    avaliação é gravada nele (o processo do Manager é o único escritor do arquivo).
+    """
+
+    def __init__(self, max_size=CACHE_MAX_SIZE, store_path=None, executable_hash=None,
+                 objective_multiplier=1.0):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        # O Manager atende cada cliente em uma thread própria
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.preloaded = 0
+        self.stored = 0
+
+        self._store = None
+        if store_path is not None:
+            self._store = EvaluationStore(store_path, executable_hash, objective_multiplier)
+            for key, fitness in self._store.load():
+                self._data[key] = fitness
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+            self.preloaded = len(self._data)
+
+    def get(self, key):
+        """Retorna o fitness memoizado ou None se o ponto nunca foi avaliado."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, persist=True):
+        """
+        Armazena um fitness, descartando a entrada menos usada se necessário.
+        Com persist=False o valor fica só na memória (ex.: limites de execuções abortadas).
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            if self._store is not None and persist:
+                self._store.append(key, value)
+                self.stored += 1
+
+    def failures(self):
+        """Chaves das configurações que falharam (semente do aprendizado de regiões)."""
+        with self._lock:
+            return [key for key, value in self._data.items() if value == -float('inf')]
+
+    def stats(self):
+        """Retorna os contadores do cache para o relatório final."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'preloaded': self.preloaded,
+                'stored': self.stored,
+            }
+
+# =============================================================================
+# ### MÉTRICAS DE AVALIAÇÃO (MEMÓRIA COMPARTILHADA) ###
+# =============================================================================
+class EvaluationMetrics:
+    """
+    Contadores de avaliação por worker em memória compartilhada.
+
+    Cada worker escreve apenas na sua própria fatia do array (sem lock e sem IPC
+    no caminho quente); o processo principal soma as fatias para montar o status
+    e o relatório. Cada fatia guarda os contadores de FIELDS seguidos de um
+    histograma de latência com os baldes de LATENCY_BUCKET_BOUNDS (+ estouro).
+    Com 'main_slot' há uma fatia extra, fora das fatias dos workers, para o processo
+    principal (perfil dos escalonadores TPE/Hyperband e dos reinícios do multi-start).
+    Cada fatia de worker tem um dono (pid): um worker novo só pega uma fatia livre ou
+    de um worker que já terminou, nunca a de um worker vivo.
+    """
+
+    PHASES = ('generation', 'selection', 'launch', 'parsing', 'reporting')
+    FIELDS = ('evaluations', 'timeouts', 'parse_failures', 'crashes', 'eval_time',
+              'surrogate_fit_time', 'surrogate_predict_time', 'surrogate_candidates',
+              'surrogate_accepted', 'capped', 'rejected') + tuple(f"phase_{p}" for p in PHASES) + \
+             ('eval_time_sq',)
+    COUNT_FIELDS = ('evaluations', 'timeouts', 'parse_failures', 'crashes',
+                    'surrogate_candidates', 'surrogate_accepted', 'capped', 'rejected')
+    STATUS_OFFSETS = {'timeout': 1, 'parse': 2, 'crash': 3, 'capped': 9}
+    EVAL_TIME_OFFSET = 4
+    EVAL_TIME_SQ_OFFSET = FIELDS.index('eval_time_sq')  # Variância da latência por slot
+
+    def __init__(self, slot_count, main_slot=False):
+        self.slot_count = slot_count
+        self.total_slots = slot_count + 1 if main_slot else slot_count
+        self.slot_size = len(self.FIELDS) + len(LATENCY_BUCKET_BOUNDS) + 1
+        self._array = multiprocessing.Array('d', self.total_slots * self.slot_size, lock=False)
+        self._owners = multiprocessing.Array('i', slot_count)  # pid dono de cada fatia (0: livre)
+        self._base = None  # Início da fatia do processo atual (None fora dos workers)
+        self._lock = None  # Criado no worker: protege a fatia entre threads de sondagem
+
+    def __getstate__(self):
+        # A fatia e o lock são do processo atual; cada worker reserva a sua no attach()
+        state = dict(self.__dict__)
+        state['_base'] = state['_lock'] = None
+        return state
+
+    def attach(self):
+        """
+        Reserva uma fatia para o processo worker atual (chamado no initializer). Um
+        worker substituído pelo Pool (ou de um pool anterior) libera a sua ao sair; se
+        ele foi morto, a fatia é recuperada quando o pid dono não existe mais. Os
+        contadores da fatia continuam somando. RuntimeError se todas estão em uso.
+        """
+        pid = os.getpid()
+        with self._owners.get_lock():
+            for slot, owner in enumerate(self._owners):
+                if owner == 0 or owner == pid or not process_alive(owner):
+                    self._owners[slot] = pid
+                    break
+            else:
+                raise RuntimeError(f"todas as {self.slot_count} fatias de métricas estão em uso "
+                                   f"por workers vivos")
+        self._base = slot * self.slot_size
+        self._lock = threading.Lock()
+        multiprocessing.util.Finalize(self, self.release, args=(slot, pid), exitpriority=0)
+        return slot
+
+    def release(self, slot, pid):
+        """Devolve a fatia 'slot' se ela ainda pertence a 'pid'."""
+        with self._owners.get_lock():
+            if self._owners[slot] == pid:
+                self._owners[slot] = 0
+
+    def attach_main(self):
+        """Associa o processo principal à fatia extra (requer 'main_slot')."""
+        self._base = self.slot_count * self.slot_size
+        self._lock = threading.Lock()
+
+    def record(self, wall_time, status='ok'):
+        """Registra uma execução do modelo na fatia do worker atual."""
+        base = self._base
+        if base is None:
+            return
+        array = self._array
+        bucket = bisect.bisect_left(LATENCY_BUCKET_BOUNDS, wall_time)
+        with self._lock:
+            array[base] += 1
+            if status != 'ok':
+                array[base + self.STATUS_OFFSETS[status]] += 1
+            array[base + self.EVAL_TIME_OFFSET] += wall_time
+            array[base + self.EVAL_TIME_SQ_OFFSET] += wall_time * wall_time
+            array[base + len(self.FIELDS) + bucket] += 1
+
+    def add(self, field, value):
+        """Soma 'value' a um contador auxiliar (ex.: tempos do modelo substituto)."""
+        base = self._base
+        if base is None:
+            return
+        with self._lock:
+            self._array[base + self.FIELDS.index(field)] += value
+
+    def snapshot(self):
+        """Soma as fatias de todos os workers (leitura sem lock, feita pelo monitor)."""
+        values = self._array[:]
+        totals = dict.fromkeys(self.FIELDS, 0.0)
+        histogram = [0.0] * (len(LATENCY_BUCKET_BOUNDS) + 1)
+        for slot in range(self.total_slots):
+            base = slot * self.slot_size
+            for i, field in enumerate(self.FIELDS):
+                totals[field] += values[base + i]
+            offset = base + len(self.FIELDS)
+            for i in range(len(histogram)):
+                histogram[i] += values[offset + i]
+        for field in self.COUNT_FIELDS:
+            totals[field] = int(totals[field])
+        totals['histogram'] = histogram
+        return totals
+
+    def slot_snapshot(self):
+        """Contadores de FIELDS de cada fatia, na ordem dos slots (a do principal por último)."""
+        values = self._array[:]
+        return [dict(zip(self.FIELDS, values[slot * self.slot_size:slot * self.slot_size + len(self.FIELDS)]))
+                for slot in range(self.total_slots)]
+
+def process_alive(pid):
+    """True se existe um processo com este pid."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Existe, mas é de outro usuário
+    return True
+
+# =============================================================================
+# ### SLOTS DE AVALIAÇÃO (AFINIDADE DE CPU) ###
+# =============================================================================
+def physical_cores():
+    """
+    CPUs lógicas disponíveis a este processo agrupadas por núcleo físico, em ordem de
+    (socket, núcleo). Sem a topologia em /sys cada CPU lógica conta como um núcleo.
+    """
+    cores = {}
+    for cpu in sorted(os.sched_getaffinity(0)):
+        topology = f"/sys/devices/system/cpu/cpu{cpu}/topology/"
+        try:
+            with open(topology + "physical_package_id") as f:
+                package = int(f.read())
+            with open(topology + "core_id") as f:
+                core = int(f.read())
+        except (OSError, ValueError):
+            package, core = 0, cpu
+        cores.setdefault((package, core), []).append(cpu)
+    return [(package, cpus) for (package, _), cpus in sorted(cores.items())]
+
+def evaluation_slots(cores, cores_per_slot=CORES_PER_EVALUATION, reserved=AFFINITY_RESERVED_CORES):
+    """
+    Divide os núcleos físicos ('cores': lista de (socket, [CPUs lógicas])) em slots de
+    'cores_per_slot' núcleos do mesmo socket, depois de separar 'reserved' núcleos
+    para o processo principal. Retorna (CPUs reservadas, [CPUs de cada slot]).
+    Se a reserva não deixar nenhum slot, nada é reservado.
+    """
+    if len(cores) - reserved < cores_per_slot:
+        reserved = 0
+    reserved_cpus = [cpu for _, cpus in cores[:reserved] for cpu in cpus]
+    slots = []
+    current, current_package = [], None
+    for package, cpus in cores[reserved:]:
+        if package != current_package:
+            current, current_package = [], package  # Um slot não atravessa sockets
+        current.append(cpus)
+        if len(current) == cores_per_slot:
+            slots.append(sorted(cpu for core in current for cpu in core))
+            current = []
+    return reserved_cpus, slots
+
+def detect_evaluation_slots():
+    """Slots da máquina atual, ou (None, None) se a afinidade não estiver disponível."""
+    if not hasattr(os, 'sched_setaffinity'):
+        print("AVISO: Afinidade de CPU não suportada neste sistema; CPU_AFFINITY ignorado.")
+        return None, None
+    reserved_cpus, slots = evaluation_slots(physical_cores())
+    if not slots:
+        print(f"AVISO: Núcleos insuficientes para slots de {CORES_PER_EVALUATION} núcleos; "
+              f"CPU_AFFINITY ignorado.")
+        return None, None
+    return reserved_cpus, slots
+
+def pin_to_slot(cpus):
+    """Prende a thread atual (e os processos que ela lançar) às CPUs do slot."""
+    try:
+        os.sched_setaffinity(0, cpus)
+    except OSError as e:
+        print(f"AVISO: Não foi possível fixar a afinidade em {cpus}: {e}", file=sys.stderr)
+
+def format_cpus(cpus):
+    """Lista de CPUs compacta: [0, 1, 2, 5] -> '0-2,5'."""
+    ranges = []
+    for cpu in cpus:
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(f"{a}-{b}" if a != b else f"{a}" for a, b in ranges)
+
+def print_slot_report(eval_metrics, cpu_slots):
+    """Latência por slot (média e desvio) e a dispersão entre os slots."""
+    print("Slots de Avaliação (afinidade de CPU):")
+    means = []
+    for slot, values in enumerate(eval_metrics.slot_snapshot()[:eval_metrics.slot_count]):
+        count = values['evaluations']
+        if not count:
+            print(f"  Slot {slot + 1} [CPUs {format_cpus(cpu_slots[slot])}]: sem execuções")
+            continue
+        mean = values['eval_time'] / count
+        deviation = math.sqrt(max(0.0, values['eval_time_sq'] / count - mean * mean))
+        means.append(mean)
+        print(f"  Slot {slot + 1} [CPUs {format_cpus(cpu_slots[slot])}]: {int(count)} execuções | "
+              f"média {format_latency(mean)} | desvio {format_latency(deviation)} "
+              f"(CV {100.0 * deviation / mean if mean else 0.0:.1f}%)")
+    if len(means) > 1:
+        overall = statistics.mean(means)
+        print(f"  Dispersão entre slots: desvio das médias = "
+              f"{100.0 * statistics.stdev(means) / overall if overall else 0.0:.1f}% da média geral")
+
+# =============================================================================
+# ### PERFIL DO OTIMIZADOR (CUSTO DA BUSCA x CUSTO DO MODELO) ###
+# =============================================================================
+PHASE_LABELS = {'generation': 'geração de candidatos', 'selection': 'seleção',
+                'launch': 'preparo da avaliação', 'parsing': 'parsing da saída',
+                'reporting': 'envio de resultados'}
+
+def init_profiling(metrics):
+    """Liga a cronometragem das fases no processo atual (None desliga)."""
+    global _profile_metrics
+    _profile_metrics = metrics if PROFILE_PHASES else None
+
+def phase_start():
+    """Início de um trecho cronometrado (None com o perfil desligado)."""
+    return time.perf_counter() if _profile_metrics is not None else None
+
+def phase_end(phase, started):
+    """Soma o tempo desde 'started' à fase 'phase' (ver EvaluationMetrics.PHASES)."""
+    if started is not None:
+        _profile_metrics.add('phase_' + phase, time.perf_counter() - started)
+
+class SamplingProfiler:
+    """
+    Profiler por amostragem: uma thread lê as pilhas de todas as outras threads do
+    processo a cada 'interval' segundos e conta as pilhas iguais. Custo fixo por
+    amostra, independente de quantas funções o otimizador chama.
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL, max_depth=40):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def enable(self):
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                names = []
+                while frame is not None and len(names) < self.max_depth:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack = ';'.join(reversed(names))
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.items():
+                f.write(f"{stack} {count}\n")
+
+def start_worker_profiler():
+    """Inicia o perfil detalhado do worker (PROFILE_MODE), gravado por stop_worker_profiler."""
+    global _worker_profiler
+    if PROFILE_MODE is None:
+        return
+    if PROFILE_MODE == 'cprofile':
+        import cProfile
+        _worker_profiler = cProfile.Profile()
+    else:
+        _worker_profiler = SamplingProfiler()
+    _worker_profiler.enable()
+    # Encerramento normal do worker; o pool.terminate() passa por terminate_worker
+    multiprocessing.util.Finalize(None, stop_worker_profiler, exitpriority=10)
+
+def stop_worker_profiler():
+    """Para o perfil detalhado do worker e o grava em PROFILE_DIR."""
+    global _worker_profiler
+    profiler, _worker_profiler = _worker_profiler, None
+    if profiler is None:
+        return
+    profiler.disable()
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    extension = 'prof' if PROFILE_MODE == 'cprofile' else 'folded'
+    path = os.path.join(PROFILE_DIR, f"worker_{os.getpid()}.{extension}")
+    if PROFILE_MODE == 'cprofile':
+        profiler.dump_stats(path)
+    else:
+        profiler.dump(path)
+
+def clear_profiles():
+    """Remove os perfis detalhados de uma execução anterior."""
+    if os.path.isdir(PROFILE_DIR):
+        for name in os.listdir(PROFILE_DIR):
+            if name.startswith('worker_') and name.endswith(('.prof', '.folded')):
+                os.remove(os.path.join(PROFILE_DIR, name))
+
+def print_phase_profile(eval_metrics):
+    """Relatório do perfil por fase: total e por worker, comparado ao tempo no modelo."""
+    slots = eval_metrics.slot_snapshot()
+    print("Perfil do Otimizador (tempo fora do modelo, por fase):")
+    totals = {phase: sum(slot[f"phase_{phase}"] for slot in slots) for phase in EvaluationMetrics.PHASES}
+    search_time = sum(totals.values())
+    eval_time = sum(slot['eval_time'] for slot in slots)
+    for phase in EvaluationMetrics.PHASES:
+        share = 100.0 * totals[phase] / search_time if search_time else 0.0
+        print(f"  {PHASE_LABELS[phase]:<22} {totals[phase]:9.3f}s ({share:5.1f}%)")
+    if search_time + eval_time > 0:
+        print(f"  Busca x modelo: {search_time:.2f}s x {eval_time:.2f}s "
+              f"({100.0 * search_time / (search_time + eval_time):.1f}% do tempo medido é do otimizador)")
+    for slot, values in enumerate(slots):
+        label = f"Worker {slot + 1}" if slot < eval_metrics.slot_count else "Principal"
+        phases = " | ".join(f"{phase} {values[f'phase_{phase}']:.2f}s" for phase in EvaluationMetrics.PHASES)
+        print(f"  {label}: modelo {values['eval_time']:.2f}s ({int(values['evaluations'])} execuções) | {phases}")
+
+def worker_occupancy(eval_metrics, run_duration, concurrency=1):
+    """
+    Retorna (tempo ocupado, capacidade) dos workers, em segundos de núcleo. Ocupado é o
+    tempo no modelo e, com PROFILE_PHASES, também o das fases do otimizador. Cada fatia
+    de worker pode ocupar até 'concurrency' núcleos (sondagem simultânea do PS) durante
+    'run_duration'; o processo principal não entra na conta.
+    """
+    busy = 0.0
+    for values in eval_metrics.slot_snapshot()[:eval_metrics.slot_count]:
+        measured = values['eval_time']
+        if PROFILE_PHASES:
+            measured += sum(values[f"phase_{phase}"] for phase in EvaluationMetrics.PHASES)
+        busy += min(measured, concurrency * run_duration)
+    return busy, eval_metrics.slot_count * concurrency * run_duration
+
+def print_profile_files(top=15):
+    """Resumo dos perfis detalhados gravados pelos workers (PROFILE_MODE)."""
+    files = sorted(os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR)
+                   if name.startswith('worker_')) if os.path.isdir(PROFILE_DIR) else []
+    if not files:
+        print(f"Perfil detalhado ({PROFILE_MODE}): nenhum arquivo gravado em '{PROFILE_DIR}'")
+        return
+    print(f"Perfil detalhado ({PROFILE_MODE}): {len(files)} arquivos em '{PROFILE_DIR}'")
+    if PROFILE_MODE == 'cprofile':
+        import pstats
+        stats = pstats.Stats(*files, stream=sys.stdout)
+        stats.sort_stats('tottime').print_stats(top)
+        return
+    # Amostragem: funções com mais amostras no topo da pilha (tempo próprio)
+    own = {}
+    samples = 0
+    for path in files:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                own[stack.rsplit(';', 1)[-1]] = own.get(stack.rsplit(';', 1)[-1], 0) + int(count)
+                samples += int(count)
+    for name, count in heapq.nlargest(top, own.items(), key=lambda item: item[1]):
+        print(f"  {100.0 * count / samples:5.1f}%  {name}")
+
+# =============================================================================
+# ### CANAL DE MELHORIAS (WORKERS -> MONITOR) ###
+# =============================================================================
+class ImprovementChannel:
+    """
+    Canal leve de melhorias entre os workers e o monitor.
+
+    Combina uma multiprocessing.Queue (leitura bloqueante no monitor, sem polling)
+    com um slot em memória compartilhada que guarda o melhor fitness global. O worker
+    compara com o slot antes de enviar, então só melhorias globais atravessam a fila
+    e melhorias apenas locais não custam IPC.
+    """
+
+    def __init__(self):
+        self._queue = multiprocessing.Queue()
+        self._best = multiprocessing.Value('d', -float('inf'))
+
+    def put(self, fitness, individual):
+        """Publica uma melhoria; retorna False se ela não supera o melhor global."""
+        if fitness <= self._best.value:
+            return False
+        with self._best.get_lock():
+            if fitness <= self._best.value:
+                return False
+            self._best.value = fitness
+        self._queue.put((fitness, list(individual)))
+        return True
+
+    def seed(self, fitness):
+        """Define o melhor global sem publicar (retomada de um checkpoint)."""
+        with self._best.get_lock():
+            self._best.value = max(self._best.value, fitness)
+
+    def get(self, timeout=None):
+        """Aguarda a próxima melhoria (lança queue.Empty ao fim do timeout)."""
+        return self._queue.get(timeout=timeout)
+
+    def best_fitness(self):
+        """Melhor fitness global publicado até agora (leitura direta da memória)."""
+        return self._best.value
+
+# =============================================================================
+# ### MODELO DE ILHAS (MIGRAÇÃO ENTRE POPULAÇÕES) ###
+# =============================================================================
+class MigrationHub:
+    """
+    Caixas de entrada de migrantes, uma por ilha (população paralela).
+
+    A migração é assíncrona: cada ilha envia seus melhores indivíduos para as
+    vizinhas e recolhe, sem bloquear, o que já tiver chegado na sua caixa.
+    """
+
+    def __init__(self, island_count, topology='ring'):
+        self.island_count = island_count
+        self.topology = topology
+        self._inboxes = [multiprocessing.Queue() for _ in range(island_count)]
+
+    def targets(self, island_id):
+        """Ilhas que recebem os emigrantes de 'island_id'."""
+        if self.island_count < 2:
+            return []
+        if self.topology == 'all':
+            return [i for i in range(self.island_count) if i != island_id]
+        return [(island_id + 1) % self.island_count]
+
+    def send(self, island_id, migrants):
+        """Envia uma lista de (fitness, indivíduo) para as ilhas vizinhas."""
+        for target in self.targets(island_id):
+            self._inboxes[target].put(migrants)
+
+    def receive(self, island_id):
+        """Recolhe todos os migrantes que já chegaram para 'island_id'."""
+        received = []
+        inbox = self._inboxes[island_id]
+        while True:
+            try:
+                received.extend(inbox.get_nowait())
+            except queue.Empty:
+                return received
+
+def migrate(population, fitnesses, island_id, elitism_count=2):
+    """
+    Troca de indivíduos da ilha 'island_id' com as vizinhas: envia os
+    MIGRATION_COUNT melhores e insere os melhores imigrantes recebidos
+    segundo MIGRATION_REPLACEMENT. Altera 'population' e 'fitnesses' no lugar.
+    """
+    if _migration_hub is None or island_id is None:
+        return
+
+    sorted_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i], reverse=True)
+    emigrants = [(fitnesses[i], population[i]) for i in sorted_indices[:MIGRATION_COUNT]]
+    _migration_hub.send(island_id, emigrants)
+
+    immigrants = sorted(_migration_hub.receive(island_id), key=lambda m: m[0], reverse=True)
+    immigrants = immigrants[:MIGRATION_COUNT]
+    if not immigrants:
+        return
+
+    if MIGRATION_REPLACEMENT == 'random':
+        candidates = sorted_indices[elitism_count:]
+        replaced = random.sample(candidates, min(len(immigrants), len(candidates)))
+    else:  # 'worst'
+        replaced = sorted_indices[::-1][:len(immigrants)]
+
+    for idx, (fitness, individual) in zip(replaced, immigrants):
+        # Na política 'worst' um imigrante pior que o residente não entra
+        if MIGRATION_REPLACEMENT != 'random' and fitness <= fitnesses[idx]:
+            continue
+        population[idx] = individual
+        fitnesses[idx] = fitness
+
+# =============================================================================
+# ### MODELO SUBSTITUTO (PRÉ-SELEÇÃO DE CANDIDATOS) ###
+# =============================================================================
+# O modelo (KNNSurrogate) fica em surrogates.py; aqui ficam os ganchos dos workers.
+def surrogate_ready():
+    """True se o modelo substituto do worker já tem dados suficientes para filtrar."""
+    return _surrogate is not None and len(_surrogate) >= SURROGATE_MIN_POINTS
+
+def observe_evaluation(params, fitness):
+    """Alimenta o modelo substituto do worker com uma avaliação real."""
+    if _surrogate is None:
+        return
+    started = time.perf_counter()
+    _surrogate.observe(params, fitness)
+    record_metric('surrogate_fit_time', time.perf_counter() - started)
+
+def screen_candidates(candidates, keep, encoded=True):
+    """
+    Ordena os candidatos pelo fitness previsto e devolve os 'keep' mais promissores.
+    'encoded' indica se os candidatos são genomas (GA) ou indivíduos decodificados (PS).
+    """
+    if not surrogate_ready() or keep >= len(candidates):
+        return candidates[:keep]
+    started = time.perf_counter()
+    if encoded:
+        genomes = candidates
+    else:
+        genomes = [encode_individual(c, _surrogate.param_definitions) for c in candidates]
+    predictions = [_surrogate.predict(g) for g in genomes]
+    ranked = heapq.nlargest(keep, range(len(candidates)), key=predictions.__getitem__)
+    record_metric('surrogate_predict_time', time.perf_counter() - started)
+    record_metric('surrogate_candidates', len(candidates))
+    record_metric('surrogate_accepted', keep)
+    return [candidates[i] for i in ranked]
+
+class TuningManager(SyncManager):
+    """Manager com os objetos compartilhados específicos do auto-tuning."""
+    pass
+
+TuningManager.register('EvaluationCache', EvaluationCache)
+TuningManager.register('FailureLog', FailureLog)
+
+# Estado global de cada processo worker (preenchido pelo initializer do Pool)
+_eval_cache = None
+_poll_executor = None
+_thread_state = threading.local()  # Coprocesso / conexão com o broker de cada thread
+_eval_metrics = None
+_improvement_channel = None
+_migration_hub = None
+_surrogate = None
+_budget_param = None  # (posição, definição) do parâmetro de orçamento, se houver
+_objective = None     # Função Python avaliada no próprio worker (em vez do executável)
+_constraints = None   # ConstraintSet (None = sem restrições declaradas)
+_failure_regions = None
+_worker_slot = None   # Fatia do worker nas métricas (identifica o worker no trace)
+_trace_writer = None
+_trace_algorithm = None
+_trace_phase = None   # Fase atual da busca neste worker (ver trace_phase)
+_profile_metrics = None  # Métricas onde as fases do otimizador são somadas (None = sem perfil)
+_worker_profiler = None  # cProfile ou SamplingProfiler do worker (PROFILE_MODE)
+_broker_address = None   # (host, porta) do broker: as execuções vão para os agentes remotos
+_evaluation_feed = None  # Fila das execuções para o on_evaluation do processo principal
+
+def init_worker(eval_cache=None, eval_metrics=None, improvement_channel=None, migration_hub=None,
+                surrogate_space=None, budget_param=None, objective=None, executable_path=None,
+                constraints=None, failure_regions=None, algorithm=None, broker_address=None,
+                cpu_slots=None, checkpoint_dir=None, evaluation_feed=None, seed=None):
+    """Initializer do Pool: guarda os objetos compartilhados no processo worker."""
+    global _eval_cache, _eval_metrics, _improvement_channel, _migration_hub, _surrogate, _budget_param
+    global _objective, _worker_slot, _trace_writer, _trace_algorithm, _broker_address, EXECUTABLE_PATH
+    global CHECKPOINT_DIR, _evaluation_feed
+    _eval_cache = eval_cache
+    _eval_metrics = eval_metrics
+    _improvement_channel = improvement_channel
+    _migration_hub = migration_hub
+    _budget_param = budget_param
+    _objective = objective
+    _broker_address = broker_address
+    _evaluation_feed = evaluation_feed
+    if executable_path is not None:
+        EXECUTABLE_PATH = executable_path
+    if checkpoint_dir is not None:
+        CHECKPOINT_DIR = checkpoint_dir
+    init_feasibility(constraints, failure_regions)
+    # O processo principal converte SIGTERM em interrupção; os workers mantêm o padrão
+    # (com o trace ou o perfil detalhado ativos, gravam antes o que está pendente)
+    signal.signal(signal.SIGTERM, terminate_worker if TRACE_ENABLED or PROFILE_MODE else signal.SIG_DFL)
+    if surrogate_space is not None:
+        _surrogate = KNNSurrogate(surrogate_space, SURROGATE_K, SURROGATE_MAX_POINTS)
+    if _eval_metrics is not None:
+        _worker_slot = _eval_metrics.attach()
+        if cpu_slots:
+            pin_to_slot(cpu_slots[_worker_slot % len(cpu_slots)])
+    if seed is not None:
+        # O random é re-semeado a cada fork; com semente cada slot tem a sua sequência
+        random.seed(f"{seed}:{_worker_slot}")
+    init_profiling(_eval_metrics)
+    start_worker_profiler()
+    _trace_algorithm = algorithm
+    if TRACE_ENABLED:
+        _trace_writer = TraceWriter(TRACE_PATH, TRACE_FLUSH_SECONDS)
+
+def terminate_worker(signum, frame):
+    """SIGTERM do pool.terminate(): grava o trace e o perfil pendentes e encerra o worker."""
+    try:
+        if _trace_writer is not None:
+            _trace_writer.flush()
+        stop_worker_profiler()
+    finally:
+        os._exit(0)
+
+def trace_phase(phase, **details):
+    """Define a fase da busca anotada nas próximas linhas do trace deste worker."""
+    global _trace_phase
+    if _trace_writer is not None or _evaluation_feed is not None:
+        _trace_phase = dict(details, name=phase)
+
+def report_improvement(fitness, individual, objective_multiplier=None):
+    """
+    Envia uma melhoria ao monitor (ignorada se não superar o melhor global).
+    Com NOISE_HANDLING o candidato é remedido até ficar claro se supera o melhor
+    global, e o valor publicado é a média das medições.
+    """
+    if _improvement_channel is None:
+        return
+    if NOISE_HANDLING and objective_multiplier is not None:
+        if fitness <= _improvement_channel.best_fitness():
+            return
+        fitness = confirm_against_value(individual, fitness, _improvement_channel.best_fitness(),
+                                        objective_multiplier)
+        if fitness is None:
+            return
+    started = phase_start()
+    _improvement_channel.put(fitness, individual)
+    phase_end('reporting', started)
+
+def record_metric(field, value):
+    """Soma um valor a um contador auxiliar das métricas do worker."""
+    if _eval_metrics is not None:
+        _eval_metrics.add(field, value)
+
+def record_evaluation(wall_time, status='ok', params=None, value=None):
+    """
+    Registra uma execução do modelo nas métricas do worker
+    ('ok', 'timeout', 'parse', 'crash' ou 'capped') e no trace, se ativo, e a envia
+    ao on_evaluation do processo principal. 'value' é a saída bruta do modelo (None em falhas).
+    """
+    if _eval_metrics is not None:
+        _eval_metrics.record(wall_time, status)
+    if _trace_writer is None and _evaluation_feed is None:
+        return
+    entry = {'time': time.time(), 'worker': _worker_slot, 'pid': os.getpid(),
+             'algorithm': _trace_algorithm, 'phase': _trace_phase,
+             'params': list(params) if params is not None else None,
+             'value': value, 'wall_time': wall_time, 'status': status}
+    if _trace_writer is not None:
+        _trace_writer.record(entry)
+    if _evaluation_feed is not None:
+        _evaluation_feed.put(entry)
+
+# =============================================================================
+# ### LIMITE DE TEMPO DAS AVALIAÇÕES (TIMEOUT ADAPTATIVO E CAPPING) ###
+# =============================================================================
+class CappedFitness(float):
+    """
+    Fitness de uma execução abortada pelo capping. O valor é um limite: a execução
+    levaria pelo menos o tempo do cap, então o fitness real é no máximo este.
+    Os algoritmos o tratam como um float comum; o cache não o grava no histórico.
+    """
+
+class AdaptiveTimeoutFitness(float):
+    """
+    -inf de uma execução abortada pelo timeout adaptativo (limite abaixo de
+    EVAL_TIMEOUT_SECONDS). A configuração só é mais lenta que o normal, não
+    necessariamente inválida: não vai para o histórico nem para as regiões de falha.
+    """
+
+def timeout_fitness(limit):
+    """Fitness de um timeout: falha real só no limite fixo EVAL_TIMEOUT_SECONDS."""
+    if limit < EVAL_TIMEOUT_SECONDS:
+        return AdaptiveTimeoutFitness(-float('inf'))
+    return -float('inf')
+
+def is_point_failure(fitness):
+    """True se o -inf é propriedade da configuração (entra nas regiões de falha)."""
+    return fitness == -float('inf') and not isinstance(fitness, AdaptiveTimeoutFitness)
+
+def persistable(fitness):
+    """True se o resultado pode ir para o histórico em disco."""
+    return not isinstance(fitness, (CappedFitness, AdaptiveTimeoutFitness))
+
+_timeout_state = {'value': EVAL_TIMEOUT_SECONDS, 'refreshed': 0.0}
+
+def latency_timeout():
+    """
+    Timeout derivado da distribuição de latência observada por todos os workers,
+    recalculado no máximo uma vez por segundo em cada processo.
+    """
+    if not ADAPTIVE_TIMEOUT or _eval_metrics is None:
+        return EVAL_TIMEOUT_SECONDS
+    now = time.monotonic()
+    if now - _timeout_state['refreshed'] >= 1.0:
+        _timeout_state['refreshed'] = now
+        histogram = _eval_metrics.snapshot()['histogram']
+        if sum(histogram) >= ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+            observed = latency_percentile(histogram, ADAPTIVE_TIMEOUT_PERCENTILE)
+            _timeout_state['value'] = min(EVAL_TIMEOUT_SECONDS,
+                                          max(CAPPING_MIN_SECONDS, ADAPTIVE_TIMEOUT_FACTOR * observed))
+    return _timeout_state['value']
+
+def evaluation_limit(objective_multiplier):
+    """
+    Retorna (limite em segundos, capped) para a próxima avaliação. 'capped' é True
+    quando o limite vem do tempo do melhor global e não do timeout.
+    """
+    remote = getattr(_thread_state, 'remote_limit', None)
+    if remote is not None:
+        return remote  # Agente: o limite vem do worker que enviou o job
+    timeout = latency_timeout()
+    if not CAPPING_ENABLED or objective_multiplier > 0 or _improvement_channel is None:
+        return timeout, False
+    incumbent = _improvement_channel.best_fitness()
+    if incumbent == -float('inf'):
+        return timeout, False
+    # Com objetivo 'min' o fitness é -tempo
+    cap = max(CAPPING_MIN_SECONDS, CAPPING_FACTOR * incumbent * objective_multiplier)
+    if cap < timeout:
+        return cap, True
+    return timeout, False
+
+def capped_fitness(limit, objective_multiplier):
+    """Fitness-limite de uma execução abortada após 'limit' segundos."""
+    return CappedFitness(limit * objective_multiplier)
+
+# =============================================================================
+# ### CHECKPOINTS (RETOMADA DA EXECUÇÃO) ###
+# =============================================================================
+# Um arquivo por tarefa, escrito apenas por ela: 'estado' (processo principal),
+# 'ilha_<i>' (GA/memético), 'busca_<i>' (Pattern Search), 'tpe' e 'hyperband'.
+# Os workers só gravam; na retomada o processo principal lê os arquivos e entrega
+# o estado de cada tarefa junto com os argumentos dela.
+CHECKPOINT_MANIFEST = 'estado'
+
+def checkpoint_path(name):
+    return os.path.join(CHECKPOINT_DIR, f"{name}.pkl")
+
+def save_checkpoint(name, state):
+    """
+    Grava o estado de uma tarefa de forma atômica: escreve um arquivo temporário e o
+    troca pelo definitivo com os.replace, então uma interrupção no meio da escrita
+    preserva o checkpoint anterior.
+    """
+    path = checkpoint_path(name)
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        with open(temporary, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+    except OSError as e:
+        print(f"AVISO: Falha ao gravar o checkpoint '{path}': {e}", file=sys.stderr)
+
+def load_checkpoint(name):
+    """Estado gravado de uma tarefa, ou None se não existir (ou estiver ilegível)."""
+    path = checkpoint_path(name)
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, pickle.UnpicklingError) as e:
+        print(f"AVISO: Checkpoint '{path}' ilegível ({e}); a tarefa recomeça do zero", file=sys.stderr)
+        return None
+
+def clear_checkpoints():
+    """Apaga os checkpoints de uma execução anterior (início sem --resume)."""
+    if not os.path.isdir(CHECKPOINT_DIR):
+        return
+    for entry in os.listdir(CHECKPOINT_DIR):
+        if entry.endswith(('.pkl', '.tmp')):
+            os.remove(os.path.join(CHECKPOINT_DIR, entry))
+
+def checkpoint_due(last_time):
+    """True se já passou o intervalo entre checkpoints desde 'last_time'."""
+    return time.time() - last_time >= CHECKPOINT_INTERVAL_SECONDS
+
 # =============================================================================
 # ### FUNÇÃO 2: AVALIAÇÃO (BLACK-BOX) ###
 # =============================================================================
 # (Definida no topo para que os workers do pool possam acessá-la)
-def evaluate(params, objective_multiplier, eval_counter=None):
+def split_budget_parameter(param_definitions):
+    """
+    Separa o parâmetro de orçamento ('budget') do espaço de busca.
+    Retorna (definições sem o orçamento, (posição, definição) ou None).
+    """
+    for index, p_def in enumerate(param_definitions):
+        if p_def['type'] == 'budget':
+            remaining = []
+            for other in param_definitions[:index] + param_definitions[index + 1:]:
+                condition = other.get('condition')
+                if condition and condition['parent'] > index:
+                    # Os pais depois do orçamento deslocam uma posição
+                    other = dict(other, condition=dict(condition, parent=condition['parent'] - 1))
+                remaining.append(other)
+            return remaining, (index, p_def)
+    return param_definitions, None
+
+def insert_budget(params, budget_param, budget=None):
+    """
+    Monta a linha de argumentos do executável inserindo o orçamento na sua posição
+    (fidelidade total, o máximo, quando 'budget' é None).
+    """
+    if budget_param is None:
+        return list(params)
+    index, p_def = budget_param
+    full_params = list(params)
+    full_params.insert(index, p_def['max'] if budget is None else budget)
+    return full_params
+
+def memoize(cache_key, fitness):
+    """
+    Guarda o resultado de uma execução no cache. Faltas do executável (None) e
+    abortos do timeout adaptativo não são propriedade do ponto e não entram: o ponto
+    executa de novo quando voltar. Limites do capping ficam só na memória e continuam
+    CappedFitness, para que os acertos seguintes saibam que são limites.
+    """
+    if _eval_cache is None or fitness is None or isinstance(fitness, AdaptiveTimeoutFitness):
+        return
+    if not isinstance(fitness, CappedFitness):
+        fitness = float(fitness)
+    _eval_cache.put(cache_key, fitness, persist=persistable(fitness))
+
+def evaluate(params, objective_multiplier, budget=None):
+    """
+    Retorna o valor de saída do modelo para 'params', já multiplicado pelo
+    objetivo (para sempre maximizar). Consulta o cache compartilhado antes
+    de executar o modelo externo. 'budget' escolhe a fidelidade (padrão: máxima).
+    """
+    started = phase_start()
+    if _constraints is not None and not _constraints.allows(params, budget):
+        record_metric('rejected', 1)
+        phase_end('launch', started)
+        return -float('inf')
+    full_params = insert_budget(params, _budget_param, budget)
+    cache_key = tuple(full_params)
+    if _eval_cache is not None:
+        cached = _eval_cache.get(cache_key)
+        if cached is not None:
+            phase_end('launch', started)
+            return cached
+    phase_end('launch', started)
+
+    fitness = run_executable(full_params, objective_multiplier)
+    started = phase_start()
+    if is_point_failure(fitness):
+        record_failure(full_params)
+
+    memoize(cache_key, fitness)
+
+    fitness = -float('inf') if fitness is None else fitness
+    # O modelo substituto só aprende com avaliações em fidelidade total
+    if budget is None or _budget_param is None or budget == _budget_param[1]['max']:
+        observe_evaluation(params, fitness)
+    phase_end('reporting', started)
+    return fitness
+
+def evaluate_population(population, objective_multiplier):
+    """
+    Avalia uma população inteira. Os indivíduos ausentes do cache são enviados
+    juntos ao executável (modos 'batch' e 'coprocess'); no modo 'oneshot'
+    equivale a chamar evaluate() para cada um.
+    """
+    started = phase_start()
+    fitnesses = [None] * len(population)
+    pending = {}
+    for i, individual in enumerate(population):
+        if _constraints is not None and not _constraints.allows(individual):
+            record_metric('rejected', 1)
+            fitnesses[i] = -float('inf')
+            continue
+        cache_key = tuple(insert_budget(individual, _budget_param))
+        if _eval_cache is not None:
+            cached = _eval_cache.get(cache_key)
+            if cached is not None:
+                fitnesses[i] = cached
+                continue
+        # Indivíduos repetidos na mesma população executam uma única vez
+        pending.setdefault(cache_key, []).append(i)
+
+    keys = list(pending)
+    phase_end('launch', started)
+    results = run_executable_batch([list(k) for k in keys], objective_multiplier)
+
+    started = phase_start()
+    for cache_key, fitness in zip(keys, results):
+        if is_point_failure(fitness):
+            record_failure(cache_key)
+        memoize(cache_key, fitness)
+        fitness = -float('inf') if fitness is None else fitness
+        observe_evaluation(population[pending[cache_key][0]], fitness)
+        for i in pending[cache_key]:
+            fitnesses[i] = fitness
+    phase_end('reporting', started)
+
+    return fitnesses
+
+def parse_output(output_str):
+    """Extrai o valor numérico da saída do modelo ('Rótulo: valor' ou apenas 'valor')."""
+    output_str = output_str.strip()
+    if ':' in output_str:
+        return float(output_str.split(':')[-1].strip())
+    return float(output_str)
+
+def format_param_line(params):
+    """Linha de parâmetros enviada pelo stdin nos modos 'coprocess' e 'batch'."""
+    return " ".join(str(p) for p in params)
+
+class CoprocessError(Exception):
+    """Falha do coprocesso; 'partial' guarda as saídas lidas antes da falha."""
+
+    def __init__(self, message, partial=None, timed_out=False, item_failed=False):
+        super().__init__(message)
+        self.partial = partial or []
+        self.timed_out = timed_out
+        # True quando a falha ocorreu durante o processamento do próximo item
+        self.item_failed = item_failed
+
+class Coprocess:
+    """
+    Mantém o executável vivo durante a vida do worker (modo 'coprocess').
+
+    Protocolo: o executável é iniciado uma vez com COPROCESS_ARGS, lê uma linha de
+    parâmetros separados por espaço pelo stdin e escreve uma linha com o score no
+    stdout, repetidamente. Em caso de timeout ou término inesperado o processo é
+    encerrado e reiniciado na próxima requisição, sem afetar o worker.
+    """
+
+    def __init__(self, command):
+        self.command = command
+        self.process = None
+        self._lines = None
+        self.restarts = 0
+
+    def _start(self):
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        # Thread leitora: permite timeout na leitura em qualquer plataforma
+        self._lines = queue.Queue()
+        reader = threading.Thread(target=self._read_loop, args=(self.process.stdout, self._lines),
+                                  daemon=True)
+        reader.start()
+
+    @staticmethod
+    def _read_loop(stream, lines):
+        for line in stream:
+            lines.put(line)
+        lines.put(None)  # EOF: o processo terminou
+
+    def stop(self):
+        """Encerra o processo atual (o próximo request inicia outro)."""
+        if self.process is None:
+            return
+        try:
+            self.process.kill()
+            self.process.wait(timeout=5)
+        except Exception:
+            pass
+        self.process = None
+
+    def request(self, param_lines, timeout):
+        """Envia as linhas de parâmetros e retorna uma linha de saída para cada uma."""
+        if self.process is None or self.process.poll() is not None:
+            if self._lines is not None:
+                self.restarts += 1
+            self._start()
+
+        try:
+            self.process.stdin.write("".join(line + "\n" for line in param_lines))
+            self.process.stdin.flush()
+        except OSError as e:
+            self.stop()
+            raise CoprocessError(f"falha ao escrever no coprocesso: {e}")
+
+        outputs = []
+        for _ in param_lines:
+            try:
+                line = self._lines.get(timeout=timeout)
+            except queue.Empty:
+                self.stop()
+                raise CoprocessError(f"timeout (>{timeout}s)", outputs, timed_out=True,
+                                     item_failed=True)
+            if line is None:
+                self.stop()
+                raise CoprocessError("coprocesso terminou inesperadamente", outputs,
+                                     item_failed=True)
+            outputs.append(line)
+        return outputs
+
+def get_coprocess():
+    """Retorna o coprocesso da thread atual do worker, criando-o na primeira chamada."""
+    coprocess = getattr(_thread_state, 'coprocess', None)
+    if coprocess is None:
+        coprocess = _thread_state.coprocess = Coprocess([EXECUTABLE_PATH] + COPROCESS_ARGS)
+    return coprocess
+
+def run_executable(params, objective_multiplier):
     """
     Executa o modelo externo e retorna seu valor de saída,
     já multiplicado pelo objetivo (para sempre maximizar).
+    Retorna None se o executável não foi encontrado.
+    """
+    if _objective is not None:
+        return run_objective(params, objective_multiplier)
+    if _broker_address is not None:
+        return run_remote_batch([params], objective_multiplier)[0]
+    if EXECUTION_MODE == 'coprocess':
+        return run_executable_batch([params], objective_multiplier)[0]
+    return run_executable_oneshot(params, objective_multiplier)
+
+def run_objective(params, objective_multiplier):
     """
+    Backend em processo: chama a função objetivo Python diretamente no worker,
+    sem subprocesso nem parsing de texto. Exceções contam como erro de execução;
+    não há timeout (a função roda no próprio processo).
+    """
+    started = time.perf_counter()
+    try:
+        output_value = float(_objective(list(params)))
+    except Exception as e:
+        print(f"AVISO: Falha ao avaliar {params}. Erro: {type(e).__name__}: {e}", file=sys.stderr)
+        record_evaluation(time.perf_counter() - started, 'crash', params)
+        return -float('inf')
+    record_evaluation(time.perf_counter() - started, 'ok', params, output_value)
+    return output_value * objective_multiplier
+
+def run_executable_oneshot(params, objective_multiplier):
+    """Avaliação clássica: um processo novo por conjunto de parâmetros."""
     str_params = [str(p) for p in params]
     command = [EXECUTABLE_PATH] + str_params
+    limit, capped = evaluation_limit(objective_multiplier)
+    started = time.perf_counter()
 
     try:
         result = subprocess.run(
@@ -114,110 +1775,634 @@ def evaluate(params, objective_multiplier, eval_counter=None):
             capture_output=True,
             text=True,
             check=True,
-            timeout=30
+            timeout=limit
         )
-
-        output_str = result.stdout.strip()
-
-        if ':' in output_str:
-            value_part = output_str.split(':')[-1]
-            output_value = float(value_part.strip())
-        else:
-            output_value = float(output_str)
-
-        # Incrementa o contador de execuções (sem lock - Manager().Value é thread-safe)
-        if eval_counter is not None:
-            eval_counter.value += 1
-
-        return output_value * objective_multiplier
-
     except subprocess.TimeoutExpired:
-        print(f"AVISO: Timeout ao avaliar {params} (>30s)", file=sys.stderr)
-        if eval_counter is not None:
-            eval_counter.value += 1
-        return -float('inf')
+        if capped:
+            record_evaluation(time.perf_counter() - started, 'capped', params)
+            return capped_fitness(limit, objective_multiplier)
+        print(f"AVISO: Timeout ao avaliar {params} (>{limit:.1f}s)", file=sys.stderr)
+        record_evaluation(time.perf_counter() - started, 'timeout', params)
+        return timeout_fitness(limit)
 
     except FileNotFoundError:
         print(f"ERRO: Executável não encontrado em '{EXECUTABLE_PATH}'", file=sys.stderr)
         print(f"Diretório atual: {os.getcwd()}", file=sys.stderr)
-        if eval_counter is not None:
-            eval_counter.value += 1
-        return -float('inf')
+        record_evaluation(time.perf_counter() - started, 'crash', params)
+        return None
 
     except Exception as e:
         print(f"AVISO: Falha ao avaliar {params}. Erro: {type(e).__name__}: {e}", file=sys.stderr)
+        record_evaluation(time.perf_counter() - started, 'crash', params)
+        return -float('inf')
 
-        # Incrementa o contador mesmo em caso de falha
-        if eval_counter is not None:
-            eval_counter.value += 1
-
+    wall_time = time.perf_counter() - started
+    parse_started = phase_start()
+    try:
+        output_value = parse_output(result.stdout)
+    except ValueError:
+        print(f"AVISO: Falha ao avaliar {params}. Saída inválida: {result.stdout.strip()!r}",
+              file=sys.stderr)
+        record_evaluation(wall_time, 'parse', params)
         return -float('inf')
+    finally:
+        phase_end('parsing', parse_started)
+
+    record_evaluation(wall_time, 'ok', params, output_value)
+    return output_value * objective_multiplier
+
+def run_executable_batch(population, objective_multiplier):
+    """
+    Avalia vários conjuntos de parâmetros de uma vez e retorna a lista de fitness
+    (None onde o executável não foi encontrado).
+
+    - 'coprocess': envia todas as linhas ao coprocesso do worker (pipeline)
+    - 'batch': uma única invocação com BATCH_ARGS recebe as N linhas pelo stdin
+    - 'oneshot': um processo por indivíduo
+    Com o broker ativo, todos vão de uma vez para os agentes remotos.
+    Se o modo em lote falhar, os indivíduos sem resultado são reavaliados um a um.
+    """
+    if not population:
+        return []
+    if _objective is not None:
+        return [run_objective(p, objective_multiplier) for p in population]
+    if _broker_address is not None:
+        return run_remote_batch(population, objective_multiplier)
+    if EXECUTION_MODE not in ('coprocess', 'batch'):
+        return [run_executable_oneshot(p, objective_multiplier) for p in population]
+
+    param_lines = [format_param_line(p) for p in population]
+    limit, capped = evaluation_limit(objective_multiplier)
+    started = time.perf_counter()
+    failure_status = 'crash'
+    try:
+        if EXECUTION_MODE == 'coprocess':
+            outputs = get_coprocess().request(param_lines, limit)
+        else:
+            result = subprocess.run(
+                [EXECUTABLE_PATH] + BATCH_ARGS,
+                input="".join(line + "\n" for line in param_lines),
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=limit * len(population)
+            )
+            outputs = result.stdout.splitlines()
+            if len(outputs) != len(population):
+                raise CoprocessError(f"esperadas {len(population)} linhas, recebidas {len(outputs)}")
+    except FileNotFoundError:
+        print(f"ERRO: Executável não encontrado em '{EXECUTABLE_PATH}'", file=sys.stderr)
+        return [None] * len(population)
+    except (CoprocessError, subprocess.SubprocessError, OSError) as e:
+        outputs = getattr(e, 'partial', [])
+        print(f"AVISO: Falha na avaliação em lote ({EXECUTION_MODE}). Erro: {type(e).__name__}: {e}",
+              file=sys.stderr)
+        if getattr(e, 'item_failed', False) and len(outputs) < len(population):
+            # O indivíduo que derrubou (ou travou) o coprocesso recebe -inf sem ser
+            # reexecutado; os seguintes são reenviados a um coprocesso novo
+            if e.timed_out and capped:
+                failure_status = 'capped'
+            elif e.timed_out:
+                print(f"AVISO: Timeout ao avaliar {population[len(outputs)]} (>{limit:.1f}s)",
+                      file=sys.stderr)
+                failure_status = 'timeout'
+            outputs = outputs + [None]
+
+    # Tempo de parede do lote dividido igualmente entre as configurações respondidas
+    wall_time = (time.perf_counter() - started) / len(outputs) if outputs else 0.0
+
+    fitnesses = []
+    parse_started = phase_start()
+    for params, output in zip(population, outputs):
+        if output is None:
+            record_evaluation(wall_time, failure_status, params)
+            if failure_status == 'capped':
+                fitnesses.append(capped_fitness(limit, objective_multiplier))
+            elif failure_status == 'timeout':
+                fitnesses.append(timeout_fitness(limit))
+            else:
+                fitnesses.append(-float('inf'))
+            continue
+        try:
+            output_value = parse_output(output)
+            fitnesses.append(output_value * objective_multiplier)
+            record_evaluation(wall_time, 'ok', params, output_value)
+        except ValueError:
+            print(f"AVISO: Falha ao avaliar {params}. Saída inválida: {output.strip()!r}",
+                  file=sys.stderr)
+            record_evaluation(wall_time, 'parse', params)
+            fitnesses.append(-float('inf'))
+    phase_end('parsing', parse_started)
+
+    # Fallback: o que ficou sem resposta é avaliado individualmente
+    for params in population[len(fitnesses):]:
+        fitnesses.append(run_executable_oneshot(params, objective_multiplier)
+                         if EXECUTION_MODE == 'batch'
+                         else run_executable(params, objective_multiplier))
+    return fitnesses
 
 # =============================================================================
-# ### FUNÇÃO 3: GERADOR ALEATÓRIO ###
+# ### AVALIAÇÃO DISTRIBUÍDA (BROKER E AGENTES) ###
 # =============================================================================
-def generate_random_individual(param_definitions):
-    """Cria um ponto de partida aleatório com base nas definições."""
-    individual = []
-    for p_def in param_definitions:
-        if p_def['type'] == 'cat':
-            individual.append(random.choice(p_def['options']))
-        elif p_def['type'] == 'int':
-            individual.append(random.randint(p_def['min'], p_def['max']))
-    return individual
+# Protocolo e broker em broker.py; aqui ficam o lado do worker e o agente.
+def get_broker_client():
+    """Retorna a conexão da thread atual do worker com o broker, criando-a na primeira chamada."""
+    client = getattr(_thread_state, 'broker', None)
+    if client is None:
+        client = _thread_state.broker = BrokerClient(_broker_address, BROKER_AGENT_TIMEOUT)
+    return client
+
+def run_remote_batch(population, objective_multiplier):
+    """
+    Avalia as configurações nos agentes remotos. O resultado de cada uma é registrado
+    nas métricas e no trace do worker como se a execução fosse local.
+    """
+    limit, capped = evaluation_limit(objective_multiplier)
+    jobs = [{'params': list(params), 'objective_multiplier': objective_multiplier,
+             'limit': limit, 'capped': capped} for params in population]
+    try:
+        results = get_broker_client().evaluate(jobs)
+    except (OSError, ConnectionError) as e:
+        print(f"AVISO: Falha ao enviar avaliações ao broker. Erro: {type(e).__name__}: {e}", file=sys.stderr)
+        # Descarta a conexão: o broker tira da fila o que ela ainda tinha pendente
+        client = getattr(_thread_state, 'broker', None)
+        if client is not None:
+            client.close()
+        _thread_state.broker = None
+        return [None] * len(population)
+
+    fitnesses = []
+    for params, result in zip(population, results):
+        status = result['status']
+        # 'missing': executável ausente no agente; 'lost': configuração perdida com os
+        # agentes BROKER_MAX_DISPATCHES vezes (nenhum dos dois é propriedade do ponto)
+        record_evaluation(result['wall_time'], 'crash' if status in ('missing', 'lost') else status,
+                          params, result['value'])
+        if result['fitness'] is None:
+            fitnesses.append(None)
+        elif status == 'capped':
+            fitnesses.append(CappedFitness(result['fitness']))
+        elif status == 'timeout':
+            fitnesses.append(timeout_fitness(limit))
+        else:
+            fitnesses.append(float(result['fitness']))
+    return fitnesses
+
+def run_agent_job(job, log):
+    """Executa um job recebido do broker com o limite de tempo definido pelo worker."""
+    _thread_state.remote_limit = (job['limit'], job['capped'])
+    fitness = run_executable(job['params'], job['objective_multiplier'])
+    entry = log.last() or {'status': 'crash', 'value': None, 'wall_time': 0.0}
+    return {'type': 'result', 'id': job['id'],
+            'fitness': None if fitness is None else float(fitness),
+            'status': 'missing' if fitness is None else entry['status'],
+            'value': entry['value'], 'wall_time': entry['wall_time']}
+
+def run_agent(address, slots=None):
+    """
+    Agente de avaliação (opção --agent host:porta): conecta ao broker, executa os jobs
+    recebidos em até 'slots' threads e devolve os resultados. Reconecta sozinho se o
+    broker cair ou ainda não estiver no ar; Ctrl+C encerra.
+    """
+    global _trace_writer
+    host, _, port = address.rpartition(':')
+    cpu_slots = None
+    if CPU_AFFINITY:
+        reserved_cpus, cpu_slots = detect_evaluation_slots()
+        if reserved_cpus:
+            pin_to_slot(reserved_cpus)  # Conexão e heartbeat fora dos núcleos de medição
+    slots = slots or (len(cpu_slots) if cpu_slots else cpu_count())
+    log = _trace_writer = AgentEvaluationLog()
+    # Cada thread de execução do agente fica presa a um slot (e o executável herda)
+    slot_ids = itertools.count()
+    executor = ThreadPoolExecutor(max_workers=slots, initializer=(
+        (lambda: pin_to_slot(cpu_slots[next(slot_ids) % len(cpu_slots)])) if cpu_slots else None))
+    executable_hash = compute_executable_hash(EXECUTABLE_PATH) if os.path.exists(EXECUTABLE_PATH) else None
+    if executable_hash is None:
+        print(f"AVISO: Executável não encontrado em '{EXECUTABLE_PATH}'")
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"Agente {name}: {slots} slots | executável '{EXECUTABLE_PATH}' | broker {host}:{port}")
+
+    while True:
+        try:
+            connection = MessageConnection(socket.create_connection((host or '127.0.0.1', int(port))))
+            connection.send({'type': 'hello', 'name': name, 'slots': slots,
+                             'executable_hash': executable_hash})
+        except OSError as e:
+            print(f"Broker indisponível ({e}); nova tentativa em {AGENT_RECONNECT_SECONDS}s")
+            time.sleep(AGENT_RECONNECT_SECONDS)
+            continue
+        print("Conectado ao broker.")
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(AGENT_HEARTBEAT_SECONDS):
+                try:
+                    connection.send({'type': 'heartbeat'})
+                except OSError:
+                    return
+
+        def run(job):
+            result = run_agent_job(job, log)
+            try:
+                connection.send(result)
+            except OSError:
+                pass  # Broker caiu: o job é reenviado ou descartado por ele
+
+        threading.Thread(target=heartbeat, daemon=True).start()
+        for message in connection.messages():
+            if message.get('type') == 'job':
+                executor.submit(run, message)
+        stop.set()
+        connection.close()
+        print(f"Conexão com o broker encerrada; reconectando em {AGENT_RECONNECT_SECONDS}s")
+        time.sleep(AGENT_RECONNECT_SECONDS)
 
 # =============================================================================
-# ### FUNÇÕES DO ALGORITMO GENÉTICO ###
+# ### RUÍDO: MEDIÇÕES REPETIDAS E CORRIDAS ESTATÍSTICAS ###
 # =============================================================================
-def tournament_selection(population, fitnesses, tournament_size=3):
-    """Seleção por torneio - escolhe o melhor de um grupo aleatório."""
-    tournament_indices = random.sample(range(len(population)), tournament_size)
-    tournament_fitnesses = [fitnesses[i] for i in tournament_indices]
-    winner_idx = tournament_indices[tournament_fitnesses.index(max(tournament_fitnesses))]
-    return copy.deepcopy(population[winner_idx])
-
-def crossover(parent1, parent2, param_definitions):
-    """Crossover de um ponto - combina dois pais para criar um filho."""
-    if len(parent1) <= 1:
-        return copy.deepcopy(parent1)
+# Medições de cada configuração feitas neste worker (chave: parâmetros), em LRU com até
+# CACHE_MAX_SIZE configurações (as corridas remedem sobretudo os incumbentes recentes)
+_noise_samples = OrderedDict()
+_noise_lock = threading.Lock()
+
+def measure_once(individual, objective_multiplier):
+    """Executa o modelo mais uma vez, sem cache (fidelidade total)."""
+    fitness = run_executable(insert_budget(individual, _budget_param), objective_multiplier)
+    return -float('inf') if fitness is None else float(fitness)
+
+def measure_samples(individual, objective_multiplier, count):
+    """Executa 'count' medições independentes de um indivíduo (revalidação final)."""
+    trace_phase('validation')
+    return [measure_once(individual, objective_multiplier) for _ in range(count)]
+
+def noise_samples(individual, fitness):
+    """Lista de medições do indivíduo, iniciada com o fitness já conhecido."""
+    key = tuple(individual)
+    with _noise_lock:
+        samples = _noise_samples.get(key)
+        if samples is not None:
+            _noise_samples.move_to_end(key)
+            return samples
+        samples = _noise_samples[key] = [fitness]
+        if len(_noise_samples) > CACHE_MAX_SIZE:
+            _noise_samples.popitem(last=False)
+        return samples
+
+def t_quantile(confidence, df):
+    """Quantil bicaudal da distribuição t (expansão de Cornish-Fisher sobre a normal)."""
+    z = statistics.NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+    if df <= 0:
+        return float('inf')
+    return (z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2))
+
+def sample_statistics(samples, confidence=NOISE_CONFIDENCE):
+    """Retorna (média, meia-largura do intervalo de confiança) de uma lista de medições."""
+    if any(value == -float('inf') for value in samples):
+        return -float('inf'), 0.0
+    mean = statistics.fmean(samples)
+    if len(samples) < 2:
+        return mean, float('inf')
+    stdev = statistics.stdev(samples)
+    return mean, t_quantile(confidence, len(samples) - 1) * stdev / math.sqrt(len(samples))
+
+def compare_samples(candidate, incumbent):
+    """
+    Teste t de Welch entre duas listas de medições: +1 se o candidato é melhor com
+    a confiança NOISE_CONFIDENCE, -1 se é pior, 0 se ainda não dá para decidir.
+    """
+    cand_mean = sample_statistics(candidate)[0]
+    inc_mean = sample_statistics(incumbent)[0]
+    if cand_mean == -float('inf') or inc_mean == -float('inf'):
+        return (cand_mean > inc_mean) - (cand_mean < inc_mean)
+    if len(candidate) < NOISE_MIN_SAMPLES or len(incumbent) < NOISE_MIN_SAMPLES:
+        return 0
+    var_c = statistics.variance(candidate) / len(candidate)
+    var_i = statistics.variance(incumbent) / len(incumbent)
+    diff = cand_mean - inc_mean
+    if var_c + var_i == 0:
+        return (diff > 0) - (diff < 0)
+    # Graus de liberdade de Welch-Satterthwaite
+    df = (var_c + var_i) ** 2 / (var_c ** 2 / (len(candidate) - 1) + var_i ** 2 / (len(incumbent) - 1))
+    t = diff / math.sqrt(var_c + var_i)
+    if abs(t) > t_quantile(NOISE_CONFIDENCE, df):
+        return 1 if t > 0 else -1
+    return 0
+
+def race(candidate, candidate_fitness, incumbent, incumbent_fitness, objective_multiplier):
+    """
+    Decide se 'candidate' supera 'incumbent'. Sem NOISE_HANDLING é a comparação direta.
+    Com ele, um candidato que parece melhor é remedido junto com o incumbente (sempre o
+    lado com menos medições) até o teste decidir ou ambos chegarem a NOISE_MAX_SAMPLES.
+    Retorna (candidato venceu, estimativa do candidato, estimativa do incumbente).
+    """
+    if not NOISE_HANDLING or candidate_fitness <= incumbent_fitness:
+        return candidate_fitness > incumbent_fitness, candidate_fitness, incumbent_fitness
+
+    cand_samples = noise_samples(candidate, candidate_fitness)
+    inc_samples = noise_samples(incumbent, incumbent_fitness)
+    decision = compare_samples(cand_samples, inc_samples)
+    while decision == 0 and min(len(cand_samples), len(inc_samples)) < NOISE_MAX_SAMPLES:
+        if len(cand_samples) <= len(inc_samples):
+            cand_samples.append(measure_once(candidate, objective_multiplier))
+        else:
+            inc_samples.append(measure_once(incumbent, objective_multiplier))
+        decision = compare_samples(cand_samples, inc_samples)
 
-    crossover_point = random.randint(1, len(parent1) - 1)
-    child = parent1[:crossover_point] + parent2[crossover_point:]
-    return child
+    cand_mean = sample_statistics(cand_samples)[0]
+    inc_mean = sample_statistics(inc_samples)[0]
+    if decision == 0:
+        decision = 1 if cand_mean > inc_mean else -1
+    return decision > 0, cand_mean, inc_mean
 
-def mutate(individual, param_definitions, mutation_rate=0.1):
-    """Mutação - altera aleatoriamente genes do indivíduo."""
-    mutated = copy.deepcopy(individual)
+def confirm_against_value(individual, fitness, reference, objective_multiplier):
+    """
+    Remede 'individual' até o intervalo de confiança da média ficar todo acima ou
+    abaixo de 'reference' (ou até NOISE_MAX_SAMPLES). Retorna a média se ela
+    supera a referência, senão None.
+    """
+    samples = noise_samples(individual, fitness)
+    while len(samples) < NOISE_MAX_SAMPLES:
+        mean, half_width = sample_statistics(samples)
+        if len(samples) >= NOISE_MIN_SAMPLES and (mean - half_width > reference or
+                                                  mean + half_width < reference):
+            break
+        samples.append(measure_once(individual, objective_multiplier))
+    mean = sample_statistics(samples)[0]
+    return mean if mean > reference else None
 
-    for i in range(len(mutated)):
-        if random.random() < mutation_rate:
-            p_def = param_definitions[i]
+def publish_result(pool, improvement_channel, fitness, individual, objective_multiplier):
+    """
+    Publica um resultado obtido pelo processo principal (TPE, Hyperband). Com
+    NOISE_HANDLING a confirmação roda em um worker, que publica a média.
+    """
+    started = phase_start()
+    if fitness <= improvement_channel.best_fitness():
+        phase_end('reporting', started)
+        return
+    if NOISE_HANDLING:
+        pool.apply_async(report_improvement, (fitness, individual, objective_multiplier))
+    else:
+        improvement_channel.put(fitness, individual)
+    phase_end('reporting', started)
+
+def validate_candidates(pool, candidates, objective_multiplier,
+                        top_k=FINAL_VALIDATION_TOP_K, samples=FINAL_VALIDATION_SAMPLES):
+    """
+    Remede os top-k melhores publicados durante a execução, em paralelo no pool.
+    Retorna [(média, meia-largura do IC, indivíduo)] do melhor para o pior.
+    """
+    unique = {}
+    for fitness, individual in candidates:
+        key = tuple(individual)
+        unique[key] = max(unique.get(key, -float('inf')), fitness)
+    top = heapq.nlargest(top_k, unique.items(), key=lambda item: item[1])
+
+    jobs = [(list(key), pool.apply_async(measure_samples, (list(key), objective_multiplier, samples)))
+            for key, _ in top]
+    validated = []
+    for individual, job in jobs:
+        mean, half_width = sample_statistics(job.get())
+        validated.append((mean, half_width, individual))
+    validated.sort(key=lambda item: item[0], reverse=True)
+    return validated
 
+# =============================================================================
+# ### FUNÇÃO 3: GERADOR ALEATÓRIO ###
+# =============================================================================
+def generate_random_individual(param_definitions):
+    """
+    Cria um ponto de partida aleatório com base nas definições (uniforme na coordenada),
+    sorteando de novo enquanto for inviável (até FEASIBILITY_MAX_TRIES vezes).
+    """
+    for _ in range(FEASIBILITY_MAX_TRIES):
+        individual = []
+        for p_def in param_definitions:
             if p_def['type'] == 'cat':
-                # Mutação categórica: escolhe outra opção aleatória
-                mutated[i] = random.choice(p_def['options'])
+                individual.append(random.choice(p_def['options']))
+            else:
+                individual.append(from_coordinate(p_def, random_coordinate(*coordinate_bounds(p_def))))
+        individual = apply_conditions(individual, param_definitions)
+        if is_feasible(individual):
+            break
+    return individual
 
-            elif p_def['type'] == 'int':
-                # Mutação inteira: adiciona valor aleatório dentro do range
-                range_size = p_def['max'] - p_def['min']
-                mutation_amount = random.randint(-range_size // 10, range_size // 10)
-                mutated[i] = max(p_def['min'], min(p_def['max'], mutated[i] + mutation_amount))
+def first_primes(count):
+    """Os 'count' primeiros números primos (bases da sequência de Halton)."""
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+def latin_hypercube(count, dims):
+    """'count' pontos em [0,1)^dims com exatamente um ponto por estrato em cada eixo."""
+    columns = []
+    for _ in range(dims):
+        strata = list(range(count))
+        random.shuffle(strata)
+        columns.append([(stratum + random.random()) / count for stratum in strata])
+    return [list(point) for point in zip(*columns)]
+
+def scrambled_halton(count, dims):
+    """
+    'count' pontos da sequência de Halton em [0,1)^dims, com uma permutação aleatória
+    dos dígitos em cada base (evita os padrões correlacionados das bases grandes).
+    """
+    points = [[0.0] * dims for _ in range(count)]
+    for d, base in enumerate(first_primes(dims)):
+        digits = list(range(1, base))
+        random.shuffle(digits)
+        permutation = [0] + digits  # O dígito 0 é mantido para a expansão ser finita
+        for i in range(count):
+            n, scale, value = i + 1, 1.0 / base, 0.0
+            while n > 0:
+                value += scale * permutation[n % base]
+                n //= base
+                scale /= base
+            points[i][d] = value
+    return points
+
+def generate_initial_design(param_definitions, count, method=None):
+    """
+    Gera 'count' indivíduos distintos que cobrem o espaço de forma uniforme (INITIAL_DESIGN).
+    Parâmetros numéricos e ordinais vêm do desenho em [0,1), mapeado na coordenada de
+    busca; categóricos são atribuídos de forma balanceada.
+    Repetições (espaços pequenos) e pontos inviáveis são trocados por pontos aleatórios.
+    """
+    method = method or INITIAL_DESIGN
+    if method == 'random' or count <= 0:
+        return [generate_random_individual(param_definitions) for _ in range(count)]
+
+    dims = len(param_definitions)
+    units = latin_hypercube(count, dims) if method == 'lhs' else scrambled_halton(count, dims)
+    columns = []
+    for d, p_def in enumerate(param_definitions):
+        if p_def['type'] == 'cat':
+            options = p_def['options']
+            column = [options[i % len(options)] for i in range(count)]
+            random.shuffle(column)
+        else:
+            low, high, kind = coordinate_bounds(p_def)
+            if kind == 'float':
+                column = [from_coordinate(p_def, low + point[d] * (high - low)) for point in units]
+            else:
+                span = high - low + 1
+                column = [from_coordinate(p_def, low + min(int(point[d] * span), span - 1))
+                          for point in units]
+        columns.append(column)
+
+    design = []
+    seen = set()
+    for individual in zip(*columns):
+        individual = apply_conditions(list(individual), param_definitions)
+        for _ in range(20):
+            if tuple(individual) not in seen and is_feasible(individual):
+                break
+            individual = generate_random_individual(param_definitions)
+        seen.add(tuple(individual))
+        design.append(individual)
+    return design
+
+# =============================================================================
+# ### FUNÇÕES DO ALGORITMO GENÉTICO ###
+# =============================================================================
+# A população do GA é uma lista de genomas: tuplas com a coordenada de busca de cada
+# parâmetro (índice da opção, valor ou log do valor; ver space.py). Tuplas são
+# imutáveis, então filhos e elites são compartilhados sem copy.deepcopy; a conversão
+# de volta para valores acontece só na fronteira com evaluate().
+def random_genomes(count, bounds):
+    """Gera 'count' genomas aleatórios uniformes."""
+    return [tuple(random_coordinate(low, high, kind) for low, high, kind, _ in bounds)
+            for _ in range(count)]
+
+def initial_genomes(initial_population, population_size, param_definitions, bounds):
+    """População inicial: a fatia do desenho inicial recebida do orquestrador (ou aleatória)."""
+    population = [encode_individual(ind, param_definitions)
+                  for ind in (initial_population or [])[:population_size]]
+    return population + feasible_genomes(lambda n: random_genomes(n, bounds),
+                                         population_size - len(population), param_definitions)
+
+def evaluate_genomes(population, param_definitions, objective_multiplier):
+    """Decodifica a população e avalia todos os indivíduos (com cache e lote)."""
+    return evaluate_population([decode_individual(g, param_definitions) for g in population],
+                               objective_multiplier)
+
+def best_index(fitnesses):
+    """Índice do maior fitness."""
+    return max(range(len(fitnesses)), key=fitnesses.__getitem__)
+
+def select_parents(fitnesses, count, tournament_size=3):
+    """Seleção por torneio para 'count' pais de uma vez - retorna os índices vencedores."""
+    size = min(tournament_size, len(fitnesses))
+    contenders = random.choices(range(len(fitnesses)), k=count * size)
+    return [max(contenders[i:i + size], key=fitnesses.__getitem__)
+            for i in range(0, count * size, size)]
+
+def crossover_population(population, parents, count):
+    """Crossover de um ponto para 'count' pares de pais consecutivos em 'parents'."""
+    dim = len(population[0])
+    if dim <= 1:
+        return [population[parents[2 * i]] for i in range(count)]
+    points = [random.randint(1, dim - 1) for _ in range(count)]
+    return [population[parents[2 * i]][:point] + population[parents[2 * i + 1]][point:]
+            for i, point in enumerate(points)]
+
+def mutate_population(population, bounds, mutation_rate=0.1):
+    """
+    Mutação de toda a população. Em vez de sortear um número por gene, sorteia
+    diretamente as posições mutadas no vetor achatado de genes (saltos com
+    distribuição geométrica); apenas as linhas atingidas são reconstruídas.
+    Categóricos recebem um índice aleatório; inteiros um deslocamento de até
+    ±10% do intervalo, limitado aos extremos.
+    """
+    if mutation_rate <= 0 or not population:
+        return population
+
+    dim = len(bounds)
+    total = len(population) * dim
+    if mutation_rate >= 1:
+        positions = range(total)
+    else:
+        positions = []
+        log_keep = math.log(1.0 - mutation_rate)
+        position = -1
+        while True:
+            position += 1 + int(math.log(1.0 - random.random()) / log_keep)
+            if position >= total:
+                break
+            positions.append(position)
+
+    mutated_rows = {}
+    for position in positions:
+        row, col = divmod(position, dim)
+        genome = mutated_rows.get(row)
+        if genome is None:
+            genome = mutated_rows[row] = list(population[row])
+        low, high, kind, amplitude = bounds[col]
+        if kind == 'cat':
+            genome[col] = random.randint(low, high)
+        elif kind == 'int':
+            genome[col] = max(low, min(high, genome[col] + random.randint(-amplitude, amplitude)))
+        else:
+            genome[col] = max(low, min(high, genome[col] + random.uniform(-amplitude, amplitude)))
 
-    return mutated
+    result = list(population)
+    for row, genome in mutated_rows.items():
+        result[row] = tuple(genome)
+    return result
 
-def local_search_refinement(individual, param_definitions, objective_multiplier, eval_counter, max_iterations=5):
+def evolve_population(population, fitnesses, bounds, population_size, mutation_rate, elitism_count,
+                      param_definitions):
+    """
+    Gera a próxima geração inteira: elitismo, seleção, crossover e mutação.
+    Filhos inviáveis são descartados e gerados de novo; com o modelo substituto
+    ativo, os filhos passam antes pela pré-seleção.
+    """
+    started = phase_start()
+    elite = heapq.nlargest(elitism_count, range(len(fitnesses)), key=fitnesses.__getitem__)
+    offspring_count = population_size - len(elite)
+    phase_end('selection', started)
+
+    # Com o modelo substituto ativo, gera mais filhos e mantém só os mais promissores
+    candidate_count = offspring_count
+    if surrogate_ready():
+        candidate_count = int(math.ceil(offspring_count / SURROGATE_ACCEPT_RATIO))
+
+    def make_children(count):
+        started = phase_start()
+        parents = select_parents(fitnesses, 2 * count)
+        phase_end('selection', started)
+        started = phase_start()
+        children = crossover_population(population, parents, count)
+        children = mutate_population(children, bounds, mutation_rate)
+        phase_end('generation', started)
+        return children
+
+    children = feasible_genomes(make_children, candidate_count, param_definitions)
+    children = screen_candidates(children, offspring_count)
+    return [population[i] for i in elite] + children
+
+def local_search_refinement(individual, param_definitions, objective_multiplier, max_iterations=5,
+                            current_fitness=None):
     """
     Aplica busca local (Pattern Search simplificado) em um indivíduo.
     Usado dentro do algoritmo memético para refinar soluções promissoras.
+    Se 'current_fitness' já for conhecido, o ponto inicial não é reavaliado.
     """
     current = copy.deepcopy(individual)
-    current_fitness = evaluate(current, objective_multiplier, eval_counter)
+    if current_fitness is None:
+        current_fitness = evaluate(current, objective_multiplier)
 
     for iteration in range(max_iterations):
         improved = False
 
         for i in range(len(param_definitions)):
             p_def = param_definitions[i]
+            if not is_active(current, i, param_definitions):
+                continue
 
             if p_def['type'] == 'cat':
                 # Testa outras opções categóricas
@@ -225,9 +2410,15 @@ def local_search_refinement(individual, param_definitions, objective_multiplier,
                     if option == current[i]:
                         continue
 
+                    started = phase_start()
                     neighbor = copy.deepcopy(current)
                     neighbor[i] = option
-                    neighbor_fitness = evaluate(neighbor, objective_multiplier, eval_counter)
+                    neighbor = apply_conditions(neighbor, param_definitions)
+                    feasible = is_feasible(neighbor)
+                    phase_end('generation', started)
+                    if not feasible:
+                        continue
+                    neighbor_fitness = evaluate(neighbor, objective_multiplier)
 
                     if neighbor_fitness > current_fitness:
                         current = neighbor
@@ -235,20 +2426,27 @@ def local_search_refinement(individual, param_definitions, objective_multiplier,
                         improved = True
                         break
 
-            elif p_def['type'] == 'int':
-                # Testa pequenas variações
-                step = max(1, (p_def['max'] - p_def['min']) // 20)
+            else:
+                # Testa pequenas variações (na coordenada: escala log para log-int/log-float)
+                low, high, kind = coordinate_bounds(p_def)
+                step = max(1, (high - low) // 20) if kind == 'int' else (high - low) / 20
 
                 for direction in [1, -1]:
+                    started = phase_start()
                     neighbor = copy.deepcopy(current)
-                    new_val = current[i] + (direction * step)
-                    new_val = max(p_def['min'], min(p_def['max'], int(new_val)))
+                    new_val = from_coordinate(p_def, to_coordinate(p_def, current[i]) + direction * step)
 
                     if new_val == current[i]:
+                        phase_end('generation', started)
                         continue
 
                     neighbor[i] = new_val
-                    neighbor_fitness = evaluate(neighbor, objective_multiplier, eval_counter)
+                    neighbor = apply_conditions(neighbor, param_definitions)
+                    feasible = is_feasible(neighbor)
+                    phase_end('generation', started)
+                    if not feasible:
+                        continue
+                    neighbor_fitness = evaluate(neighbor, objective_multiplier)
 
                     if neighbor_fitness > current_fitness:
                         current = neighbor
@@ -268,165 +2466,473 @@ def local_search_refinement(individual, param_definitions, objective_multiplier,
 # =============================================================================
 # ### FUNÇÃO 4: O ALGORITMO (PATTERN SEARCH) - ATUALIZADO ###
 # =============================================================================
-def run_pattern_search(start_individual, param_definitions, end_time, objective_multiplier, results_queue, eval_counter=None):
+def axis_neighbors(individual, i, p_def, step_size):
+    """Vizinhos de 'individual' no eixo i: outras opções (cat) ou ±step_size na coordenada."""
+    neighbors = []
+    if p_def['type'] == 'cat':
+        for new_option in p_def['options']:
+            if new_option == individual[i]:
+                continue
+            neighbor = list(individual)
+            neighbor[i] = new_option
+            neighbors.append(neighbor)
+
+    else:
+        coordinate = to_coordinate(p_def, individual[i])
+        for direction in [1, -1]:
+            new_val = from_coordinate(p_def, coordinate + direction * step_size)
+            if new_val == individual[i]:
+                continue
+            neighbor = list(individual)
+            neighbor[i] = new_val
+            neighbors.append(neighbor)
+
+    return neighbors
+
+def expand_step(step, p_def):
+    """Passo do eixo após uma sondagem bem-sucedida."""
+    low, high, kind = coordinate_bounds(p_def)
+    if kind == 'int':
+        return min(high - low, max(1, int(step * PS_STEP_EXPANSION)))
+    return min(high - low, step * PS_STEP_EXPANSION)
+
+def contract_step(step, p_def):
+    """Passo do eixo após uma sondagem sem melhora (zero quando o eixo convergiu)."""
+    low, high, kind = coordinate_bounds(p_def)
+    if kind == 'int':
+        return step // 2
+    step /= 2
+    return step if step >= (high - low) * PS_FLOAT_RESOLUTION else 0
+
+def get_poll_executor():
+    """Pool de threads do worker usado na sondagem concorrente (criado sob demanda)."""
+    global _poll_executor
+    if _poll_executor is None:
+        _poll_executor = ThreadPoolExecutor(max_workers=PS_POLL_WORKERS)
+    return _poll_executor
+
+def poll_neighbors(neighbors, incumbent_fitness, objective_multiplier, end_time):
+    """
+    Avalia um conjunto de sondagem e retorna (melhor vizinho, fitness).
+
+    Com PS_POLL_WORKERS > 1 os vizinhos são avaliados simultaneamente em threads do
+    worker (cada uma aguarda o seu subprocesso). No modo 'opportunistic' a sondagem
+    para na primeira melhora sobre 'incumbent_fitness': as avaliações ainda não
+    iniciadas são canceladas e as que já estão rodando terminam em segundo plano,
+    alimentando o cache.
+    """
+    best_neighbor = None
+    best_fitness = -float('inf')
+    opportunistic = PS_POLL_MODE == 'opportunistic'
+
+    if PS_POLL_WORKERS <= 1:
+        for neighbor in neighbors:
+            neighbor_fitness = evaluate(neighbor, objective_multiplier)
+            if neighbor_fitness > best_fitness:
+                best_fitness = neighbor_fitness
+                best_neighbor = neighbor
+            if opportunistic and best_fitness > incumbent_fitness:
+                break
+            if time.time() > end_time:
+                break
+        return best_neighbor, best_fitness
+
+    executor = get_poll_executor()
+    futures = {executor.submit(evaluate, neighbor, objective_multiplier): neighbor
+               for neighbor in neighbors}
+    try:
+        for future in as_completed(futures, timeout=max(0.0, end_time - time.time())):
+            neighbor_fitness = future.result()
+            if neighbor_fitness > best_fitness:
+                best_fitness = neighbor_fitness
+                best_neighbor = futures[future]
+            if opportunistic and best_fitness > incumbent_fitness:
+                break
+    except FuturesTimeoutError:
+        pass  # Tempo esgotado: fica com o melhor obtido até aqui
+    for future in futures:
+        future.cancel()
+    return best_neighbor, best_fitness
+
+def run_pattern_search(start_individual, param_definitions, end_time, objective_multiplier,
+                       checkpoint_name=None, resume_state=None):
     """
-    Executa um Pattern Search local e reporta melhorias para a 'results_queue'.
+    Executa um Pattern Search local e reporta melhorias ao monitor.
+    Com 'resume_state' continua a busca gravada no checkpoint (base e passos da malha).
     """
+    if resume_state is not None:
+        random.setstate(resume_state['random'])
+        return pattern_search_from(resume_state['base_individual'], resume_state['base_fitness'],
+                                   param_definitions, end_time, objective_multiplier,
+                                   steps=resume_state['steps'], checkpoint_name=checkpoint_name)
 
     current_best_individual = copy.deepcopy(start_individual)
     # Avalia o ponto inicial
-    current_best_fitness = evaluate(current_best_individual, objective_multiplier, eval_counter)
-    
+    current_best_fitness = evaluate(current_best_individual, objective_multiplier)
+
     # Reporta o ponto inicial para o monitor
     if current_best_fitness > -float('inf'):
-        results_queue.put((current_best_fitness, current_best_individual))
-    
-    int_ranges = [p['max'] - p['min'] for p in param_definitions if p['type'] == 'int']
-    step_size = max(1, int(max(int_ranges) * 0.2) if int_ranges else 20)
-    
-    while step_size >= 1 and time.time() < end_time:
-        improved_in_this_step = True
-        
-        while improved_in_this_step and time.time() < end_time:
-            improved_in_this_step = False
-            
-            for i in range(len(param_definitions)):
-                if time.time() > end_time: break
-                
-                p_def = param_definitions[i]
-                best_neighbor_in_axis = current_best_individual
-                best_fitness_in_axis = current_best_fitness
-                
-                if p_def['type'] == 'cat':
-                    for new_option in p_def['options']:
-                        if new_option == current_best_individual[i]: continue
-
-                        neighbor = copy.deepcopy(current_best_individual)
-                        neighbor[i] = new_option
-                        neighbor_fitness = evaluate(neighbor, objective_multiplier, eval_counter)
-
-                        if neighbor_fitness > best_fitness_in_axis:
-                            best_fitness_in_axis = neighbor_fitness
-                            best_neighbor_in_axis = neighbor
-
-                        if time.time() > end_time: break
-
-                elif p_def['type'] == 'int':
-                    for direction in [1, -1]:
-                        neighbor = copy.deepcopy(current_best_individual)
-                        new_val = neighbor[i] + (direction * step_size)
-                        new_val = max(p_def['min'], min(p_def['max'], int(new_val)))
-
-                        if new_val == neighbor[i]: continue
-
-                        neighbor[i] = new_val
-                        neighbor_fitness = evaluate(neighbor, objective_multiplier, eval_counter)
-                        
-                        if neighbor_fitness > best_fitness_in_axis:
-                            best_fitness_in_axis = neighbor_fitness
-                            best_neighbor_in_axis = neighbor
-                        
-                        if time.time() > end_time: break
-                
-                # ### ALTERAÇÃO AQUI ###
-                # Se encontrou uma melhora neste eixo, reporta para a fila
-                if best_fitness_in_axis > current_best_fitness:
-                    current_best_fitness = best_fitness_in_axis
-                    current_best_individual = best_neighbor_in_axis
-                    
-                    # Coloca o novo melhor na fila para o processo principal ver
-                    results_queue.put((current_best_fitness, current_best_individual))
-                    
-                    improved_in_this_step = True
-            
-        step_size //= 2 
-
-    # Sinaliza o fim (opcional, mas bom)
-    return (current_best_fitness, current_best_individual)
+        report_improvement(current_best_fitness, current_best_individual, objective_multiplier)
+
+    return pattern_search_from(current_best_individual, current_best_fitness, param_definitions,
+                               end_time, objective_multiplier, checkpoint_name=checkpoint_name)
+
+def pattern_search_from(start_individual, start_fitness, param_definitions, end_time, objective_multiplier,
+                        steps=None, checkpoint_name=None):
+    """
+    Núcleo do Pattern Search (estilo Hooke-Jeeves / MADS) a partir de um ponto já avaliado.
+
+    - Malha por eixo: cada parâmetro não categórico tem o seu passo na coordenada de
+      busca (log para os tipos log-*), inicialmente PS_INITIAL_STEP_RATIO do intervalo. O passo do eixo cresce
+      (x PS_STEP_EXPANSION) quando a sondagem nele melhora e cai pela metade quando falha.
+    - Movimento exploratório: sondagem dos vizinhos, eixo a eixo (PS_POLL_WORKERS = 1)
+      ou de todos os eixos de uma vez (PS_POLL_WORKERS > 1).
+    - Movimento de padrão: após uma varredura com melhora, salta ao longo da direção
+      percorrida (base nova - base anterior) enquanto isso continuar melhorando,
+      dobrando o salto a cada sucesso.
+
+    Termina quando todos os passos chegam a zero e uma varredura não melhora. Eixos de
+    parâmetros condicionais inativos não são sondados. 'steps' retoma uma malha já
+    adaptada; com 'checkpoint_name' a base e os passos são gravados entre varreduras.
+    Retorna (melhor fitness, melhor indivíduo).
+    """
+    base_individual = list(start_individual)
+    base_fitness = start_fitness
+
+    if steps is None:
+        steps = {}
+        for i, p_def in enumerate(param_definitions):
+            if p_def['type'] != 'cat':
+                low, high, kind = coordinate_bounds(p_def)
+                if kind == 'int':
+                    # Intervalo de um único valor: o eixo já nasce convergido
+                    steps[i] = max(1, int((high - low) * PS_INITIAL_STEP_RATIO)) if high > low else 0
+                else:
+                    steps[i] = (high - low) * PS_INITIAL_STEP_RATIO
+    else:
+        steps = dict(steps)
+
+    def write_checkpoint():
+        save_checkpoint(checkpoint_name, {'base_individual': base_individual, 'base_fitness': base_fitness,
+                                          'steps': steps, 'random': random.getstate()})
+
+    # Uma busca nova sobrescreve na hora o checkpoint da busca anterior deste slot
+    last_checkpoint = time.time()
+    if checkpoint_name:
+        write_checkpoint()
+
+    # Conjuntos de sondagem: um por eixo (sequencial) ou um único com todos os eixos
+    if PS_POLL_WORKERS > 1:
+        poll_groups = [list(range(len(param_definitions)))]
+    else:
+        poll_groups = [[i] for i in range(len(param_definitions))]
+
+    while time.time() < end_time:
+        previous_base = base_individual
+        improved_in_sweep = False
+
+        # Movimento exploratório
+        for axes in poll_groups:
+            if time.time() > end_time:
+                break
+            trace_phase('ps', move='poll', axes=axes, steps=dict(steps))
+
+            started = phase_start()
+            polled = [i for i in axes
+                      if steps.get(i, 1) > 0 and is_active(base_individual, i, param_definitions)]
+            neighbors = []
+            for i in polled:
+                neighbors.extend(apply_conditions(neighbor, param_definitions)
+                                 for neighbor in axis_neighbors(base_individual, i,
+                                                                param_definitions[i],
+                                                                steps.get(i, 0)))
+            if not neighbors:
+                # Nenhum vizinho distinto (passo pequeno demais para mudar o valor
+                # arredondado): conta como sondagem sem melhora, senão o passo nunca zera
+                for i in polled:
+                    if i in steps:
+                        steps[i] = contract_step(steps[i], param_definitions[i])
+                phase_end('generation', started)
+                continue
+            neighbors = [neighbor for neighbor in neighbors if is_feasible(neighbor)]
+            phase_end('generation', started)
+            if not neighbors:
+                # Todos os vizinhos são inviáveis: conta como sondagem sem melhora
+                for i in axes:
+                    if i in steps:
+                        steps[i] = contract_step(steps[i], param_definitions[i])
+                continue
+            if surrogate_ready():
+                keep = max(1, int(math.ceil(len(neighbors) * SURROGATE_ACCEPT_RATIO)))
+                neighbors = screen_candidates(neighbors, keep, encoded=False)
+
+            best_neighbor, best_fitness = poll_neighbors(neighbors, base_fitness,
+                                                         objective_multiplier, end_time)
+            improved, best_fitness, base_fitness = race(best_neighbor, best_fitness, base_individual,
+                                                        base_fitness, objective_multiplier)
+
+            if improved:
+                # Sucesso: expande o passo dos eixos que se moveram
+                for i in axes:
+                    if i in steps and best_neighbor[i] != base_individual[i]:
+                        steps[i] = expand_step(steps[i], param_definitions[i])
+                base_individual, base_fitness = best_neighbor, best_fitness
+                report_improvement(base_fitness, base_individual, objective_multiplier)
+                improved_in_sweep = True
+            else:
+                # Falha: contrai o passo dos eixos sondados
+                for i in axes:
+                    if i in steps:
+                        steps[i] = contract_step(steps[i], param_definitions[i])
+
+        # Movimento de padrão ao longo da direção da varredura bem-sucedida
+        if improved_in_sweep and PS_PATTERN_MOVES:
+            direction = [to_coordinate(p_def, base_individual[i]) - to_coordinate(p_def, previous_base[i])
+                         if i in steps else 0
+                         for i, p_def in enumerate(param_definitions)]
+            while any(direction) and time.time() < end_time:
+                trace_phase('ps', move='pattern', direction=direction, steps=dict(steps))
+                started = phase_start()
+                candidate = list(base_individual)
+                for i, delta in enumerate(direction):
+                    if delta:
+                        p_def = param_definitions[i]
+                        candidate[i] = from_coordinate(p_def, to_coordinate(p_def, candidate[i]) + delta)
+                candidate = apply_conditions(candidate, param_definitions)
+                usable = candidate != base_individual and is_feasible(candidate)
+                phase_end('generation', started)
+                if not usable:
+                    break
+
+                candidate_fitness = evaluate(candidate, objective_multiplier)
+                improved, candidate_fitness, base_fitness = race(candidate, candidate_fitness,
+                                                                 base_individual, base_fitness,
+                                                                 objective_multiplier)
+                if not improved:
+                    break
+                base_individual, base_fitness = candidate, candidate_fitness
+                report_improvement(base_fitness, base_individual, objective_multiplier)
+                direction = [delta * 2 for delta in direction]
+
+        # Eixos inativos não são sondados, então o passo deles não conta para a parada
+        if not improved_in_sweep and all(step == 0 for i, step in steps.items()
+                                         if is_active(base_individual, i, param_definitions)):
+            break
+
+        if checkpoint_name and checkpoint_due(last_checkpoint):
+            write_checkpoint()
+            last_checkpoint = time.time()
+
+    return (base_fitness, base_individual)
+
+def perturb_individual(individual, param_definitions, scale):
+    """Ponto de reinício próximo de 'individual' (ruído gaussiano na coordenada)."""
+    perturbed = list(individual)
+    for i, p_def in enumerate(param_definitions):
+        low, high, kind = coordinate_bounds(p_def)
+        if kind == 'cat':
+            if random.random() < scale:
+                perturbed[i] = random.choice(p_def['options'])
+            continue
+        coordinate = to_coordinate(p_def, perturbed[i])
+        if kind == 'int':
+            coordinate = int(round(coordinate + random.gauss(0, max(1.0, (high - low) * scale))))
+        else:
+            coordinate += random.gauss(0, (high - low) * scale)
+        perturbed[i] = from_coordinate(p_def, coordinate)
+    return apply_conditions(perturbed, param_definitions)
+
+class MultiStartScheduler:
+    """
+    Escalonador multi-start do Pattern Search (roda no processo principal).
+
+    Cada busca local termina quando todos os passos chegam a zero. Em vez de deixar o
+    núcleo parado até o fim do prazo, o callback do pool lança na mesma hora outra busca,
+    a partir de um ponto aleatório ou de uma perturbação do melhor global. Cada slot
+    grava o checkpoint 'busca_<slot>' da busca em andamento (se 'checkpoints' for True).
+    Uma busca que termina com exceção é registrada e relançada com espera crescente;
+    após RESTART_MAX_FAILURES falhas seguidas o slot é abandonado.
+    """
+
+    def __init__(self, pool, param_definitions, end_time, objective_multiplier, checkpoints=False):
+        self.pool = pool
+        self.param_definitions = param_definitions
+        self.end_time = end_time
+        self.objective_multiplier = objective_multiplier
+        self.checkpoints = checkpoints
+        self.best_individual = None  # Atualizado pelo monitor a cada melhoria global
+        self.restarts = 0
+        self.failures = 0
+        self._consecutive_failures = {}  # slot -> falhas seguidas
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def start(self, starting_points, resume_states=None):
+        """Lança uma busca para cada ponto de partida (ou retoma a do checkpoint do slot)."""
+        resume_states = resume_states or {}
+        with self._lock:
+            for slot, point in enumerate(starting_points):
+                self._launch(slot, point, resume_states.get(slot))
+
+    def stop(self):
+        """Impede novos reinícios (chamado antes de encerrar o pool)."""
+        with self._lock:
+            self._stopped = True
+
+    def next_start_point(self):
+        """Perturbação (viável) do melhor global ou ponto aleatório novo."""
+        started = phase_start()
+        try:
+            if self.best_individual is not None and random.random() < RESTART_PERTURBATION_RATIO:
+                for _ in range(FEASIBILITY_MAX_TRIES):
+                    point = perturb_individual(self.best_individual, self.param_definitions,
+                                               RESTART_PERTURBATION_SCALE)
+                    if is_feasible(point):
+                        return point
+            return generate_random_individual(self.param_definitions)
+        finally:
+            phase_end('generation', started)
+
+    def _launch(self, slot, point, resume_state=None):
+        self.pool.apply_async(run_pattern_search,
+                              args=(point, self.param_definitions, self.end_time,
+                                    self.objective_multiplier),
+                              kwds={'checkpoint_name': f"busca_{slot}" if self.checkpoints else None,
+                                    'resume_state': resume_state},
+                              callback=lambda _result: self._finished(slot),
+                              error_callback=lambda error: self._failed(slot, error))
+
+    def _finished(self, slot):
+        # Executado na thread de resultados do pool
+        with self._lock:
+            self._consecutive_failures[slot] = 0
+            self._restart(slot)
+
+    def _failed(self, slot, error):
+        # Executado na thread de resultados do pool: não pode esperar aqui
+        with self._lock:
+            self.failures += 1
+            failures = self._consecutive_failures[slot] = self._consecutive_failures.get(slot, 0) + 1
+            print(f"ERRO: A busca local do slot {slot} falhou ({failures}ª falha seguida): "
+                  f"{type(error).__name__}: {error}", file=sys.stderr)
+            if error.__cause__ is not None:
+                print(error.__cause__, file=sys.stderr)  # Traceback do worker
+            if failures >= RESTART_MAX_FAILURES:
+                print(f"ERRO: Slot {slot} do multi-start abandonado após {failures} falhas seguidas",
+                      file=sys.stderr)
+                return
+        delay = RESTART_FAILURE_BACKOFF * 2 ** (failures - 1)
+        timer = threading.Timer(delay, self._retry, args=(slot,))
+        timer.daemon = True
+        timer.start()
+
+    def _retry(self, slot):
+        with self._lock:
+            self._restart(slot)
+
+    def _restart(self, slot):
+        """Lança uma nova busca no slot (chamado com o lock)."""
+        if self._stopped or time.time() >= self.end_time:
+            return
+        self.restarts += 1
+        self._launch(slot, self.next_start_point())
 
 # =============================================================================
 # ### FUNÇÃO 5: ALGORITMO GENÉTICO ###
 # =============================================================================
-def run_genetic_algorithm(param_definitions, end_time, objective_multiplier, results_queue,
-                          population_size=50, mutation_rate=0.1, elitism_count=2, eval_counter=None):
+def run_genetic_algorithm(param_definitions, end_time, objective_multiplier,
+                          population_size=50, mutation_rate=0.1, elitism_count=2, island_id=None,
+                          initial_population=None, checkpoint_name=None, resume_state=None):
     """
-    Executa um Algoritmo Genético e reporta melhorias para a 'results_queue'.
+    Executa um Algoritmo Genético e reporta melhorias ao monitor.
 
     Parâmetros:
     - population_size: Tamanho da população
     - mutation_rate: Taxa de mutação (0.0 a 1.0)
     - elitism_count: Número de melhores indivíduos preservados por geração
+    - island_id: Índice da ilha no modelo de ilhas (None = população isolada)
+    - initial_population: Indivíduos do desenho inicial para esta ilha (None = aleatórios)
+    - checkpoint_name: Arquivo de checkpoint da ilha (None = sem checkpoints)
+    - resume_state: Estado lido do checkpoint para continuar de onde parou
     """
 
-    # Inicializa população aleatória
-    population = [generate_random_individual(param_definitions) for _ in range(population_size)]
-
-    # Avalia população inicial
-    fitnesses = [evaluate(ind, objective_multiplier, eval_counter) for ind in population]
-
-    # Encontra melhor da população inicial
-    best_idx = fitnesses.index(max(fitnesses))
-    best_fitness = fitnesses[best_idx]
-    best_individual = copy.deepcopy(population[best_idx])
-
-    # Reporta melhor inicial
-    if best_fitness > -float('inf'):
-        results_queue.put((best_fitness, best_individual))
-
-    generation = 0
+    bounds = gene_bounds(param_definitions)
+    if resume_state is not None:
+        # Retomada: continua da última geração gravada
+        population = resume_state['population']
+        fitnesses = resume_state['fitnesses']
+        best_fitness = resume_state['best_fitness']
+        best_genome = resume_state['best_genome']
+        generation = resume_state['generation']
+        random.setstate(resume_state['random'])
+    else:
+        # Inicializa população (genomas codificados)
+        population = initial_genomes(initial_population, population_size, param_definitions, bounds)
+        trace_phase('ga', island=island_id, generation=0)
+
+        # Avalia população inicial
+        fitnesses = evaluate_genomes(population, param_definitions, objective_multiplier)
+
+        # Encontra melhor da população inicial
+        best_idx = best_index(fitnesses)
+        best_fitness = fitnesses[best_idx]
+        best_genome = population[best_idx]
+
+        # Reporta melhor inicial
+        if best_fitness > -float('inf'):
+            report_improvement(best_fitness, decode_individual(best_genome, param_definitions),
+                               objective_multiplier)
+
+        generation = 0
+    last_checkpoint = time.time()
 
     # Loop evolutivo
     while time.time() < end_time:
         generation += 1
+        trace_phase('ga', island=island_id, generation=generation)
 
-        # Ordena população por fitness (do melhor para o pior)
-        sorted_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i], reverse=True)
-
-        # Elitismo: preserva os melhores
-        new_population = [copy.deepcopy(population[i]) for i in sorted_indices[:elitism_count]]
-
-        # Gera novos indivíduos até completar a população
-        while len(new_population) < population_size:
-            if time.time() > end_time:
-                break
-
-            # Seleção de pais
-            parent1 = tournament_selection(population, fitnesses)
-            parent2 = tournament_selection(population, fitnesses)
-
-            # Crossover
-            child = crossover(parent1, parent2, param_definitions)
-
-            # Mutação
-            child = mutate(child, param_definitions, mutation_rate)
-
-            new_population.append(child)
-
-        # Substitui população
-        population = new_population
+        # Elitismo, seleção, crossover e mutação sobre a população inteira
+        population = evolve_population(population, fitnesses, bounds, population_size,
+                                       mutation_rate, elitism_count, param_definitions)
 
         # Avalia nova população
-        fitnesses = [evaluate(ind, objective_multiplier, eval_counter) for ind in population]
+        fitnesses = evaluate_genomes(population, param_definitions, objective_multiplier)
+
+        # Migração: troca os melhores indivíduos com as ilhas vizinhas
+        if island_id is not None and generation % MIGRATION_INTERVAL == 0:
+            migrate(population, fitnesses, island_id, elitism_count)
 
-        # Verifica se encontrou novo melhor
-        current_best_idx = fitnesses.index(max(fitnesses))
+        # Verifica se encontrou novo melhor (com NOISE_HANDLING, uma única medição boa
+        # não basta: race() remede o candidato e o melhor atual até decidir)
+        current_best_idx = best_index(fitnesses)
         current_best_fitness = fitnesses[current_best_idx]
-        current_best_individual = population[current_best_idx]
 
         if current_best_fitness > best_fitness:
-            best_fitness = current_best_fitness
-            best_individual = copy.deepcopy(current_best_individual)
+            improved, current_best_fitness, best_fitness = race(
+                decode_individual(population[current_best_idx], param_definitions), current_best_fitness,
+                decode_individual(best_genome, param_definitions), best_fitness, objective_multiplier)
+            if improved:
+                best_fitness = current_best_fitness
+                best_genome = population[current_best_idx]
 
-            # Reporta melhoria
-            results_queue.put((best_fitness, best_individual))
+                # Reporta melhoria
+                report_improvement(best_fitness, decode_individual(best_genome, param_definitions),
+                                   objective_multiplier)
 
-    return (best_fitness, best_individual)
+        if checkpoint_name and checkpoint_due(last_checkpoint):
+            save_checkpoint(checkpoint_name, {'population': population, 'fitnesses': fitnesses,
+                                              'best_fitness': best_fitness, 'best_genome': best_genome,
+                                              'generation': generation, 'random': random.getstate()})
+            last_checkpoint = time.time()
+
+    return (best_fitness, decode_individual(best_genome, param_definitions))
 
 # =============================================================================
 # ### FUNÇÃO 6: ESTRATÉGIA HÍBRIDA (GA + PS) ###
 # =============================================================================
-def run_hybrid_algorithm(param_definitions, end_time, objective_multiplier, results_queue,
-                         ga_time_ratio=0.6, population_size=50, mutation_rate=0.1, eval_counter=None):
+def run_hybrid_algorithm(param_definitions, end_time, objective_multiplier,
+                         ga_time_ratio=0.6, population_size=50, mutation_rate=0.1,
+                         ga_evaluations=None):
     """
     Executa uma estratégia híbrida: Algoritmo Genético seguido de Pattern Search.
 
@@ -437,6 +2943,8 @@ def run_hybrid_algorithm(param_definitions, end_time, objective_multiplier, resu
     - ga_time_ratio: Porcentagem do tempo total dedicada ao GA (padrão: 60%)
     - population_size: Tamanho da população do GA
     - mutation_rate: Taxa de mutação do GA
+    - ga_evaluations: Avaliações dedicadas ao GA (com orçamento de execuções). O GA
+      não começa uma geração que ultrapasse esse número; None usa só a fração do tempo
     """
 
     start_time = time.time()
@@ -447,138 +2955,83 @@ def run_hybrid_algorithm(param_definitions, end_time, objective_multiplier, resu
     # FASE 1: ALGORITMO GENÉTICO (Exploração Global)
     # =============================================================================
 
-    # Inicializa população aleatória
-    population = [generate_random_individual(param_definitions) for _ in range(population_size)]
-    fitnesses = [evaluate(ind, objective_multiplier, eval_counter) for ind in population]
+    # Inicializa população aleatória (genomas codificados)
+    bounds = gene_bounds(param_definitions)
+    population = feasible_genomes(lambda n: random_genomes(n, bounds), population_size,
+                                  param_definitions)
+    trace_phase('hybrid-ga', generation=0)
+    fitnesses = evaluate_genomes(population, param_definitions, objective_multiplier)
 
     # Encontra melhor inicial
-    best_idx = fitnesses.index(max(fitnesses))
+    best_idx = best_index(fitnesses)
     best_fitness = fitnesses[best_idx]
-    best_individual = copy.deepcopy(population[best_idx])
+    best_individual = decode_individual(population[best_idx], param_definitions)
 
     if best_fitness > -float('inf'):
-        results_queue.put((best_fitness, best_individual))
+        report_improvement(best_fitness, best_individual, objective_multiplier)
 
     generation = 0
+    evaluated = len(population)
 
     # Loop evolutivo do GA
     while time.time() < ga_end_time:
+        if ga_evaluations is not None and evaluated + population_size > ga_evaluations:
+            break
         generation += 1
+        evaluated += population_size
+        trace_phase('hybrid-ga', generation=generation)
 
-        sorted_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i], reverse=True)
-        new_population = [copy.deepcopy(population[i]) for i in sorted_indices[:2]]  # Elitismo
-
-        while len(new_population) < population_size:
-            if time.time() > ga_end_time:
-                break
-
-            parent1 = tournament_selection(population, fitnesses)
-            parent2 = tournament_selection(population, fitnesses)
-            child = crossover(parent1, parent2, param_definitions)
-            child = mutate(child, param_definitions, mutation_rate)
-            new_population.append(child)
+        population = evolve_population(population, fitnesses, bounds, population_size,
+                                       mutation_rate, 2, param_definitions)  # Elitismo: 2
+        fitnesses = evaluate_genomes(population, param_definitions, objective_multiplier)
 
-        population = new_population
-        fitnesses = [evaluate(ind, objective_multiplier, eval_counter) for ind in population]
-
-        current_best_idx = fitnesses.index(max(fitnesses))
+        current_best_idx = best_index(fitnesses)
         current_best_fitness = fitnesses[current_best_idx]
-        current_best_individual = population[current_best_idx]
 
         if current_best_fitness > best_fitness:
-            best_fitness = current_best_fitness
-            best_individual = copy.deepcopy(current_best_individual)
-            results_queue.put((best_fitness, best_individual))
+            candidate = decode_individual(population[current_best_idx], param_definitions)
+            improved, current_best_fitness, best_fitness = race(candidate, current_best_fitness,
+                                                                best_individual, best_fitness,
+                                                                objective_multiplier)
+            if improved:
+                best_fitness = current_best_fitness
+                best_individual = candidate
+                report_improvement(best_fitness, best_individual, objective_multiplier)
 
     # =============================================================================
     # FASE 2: PATTERN SEARCH (Refinamento Local)
     # =============================================================================
 
     # Pega os top 3 melhores indivíduos do GA como pontos de partida para PS
-    sorted_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i], reverse=True)
-    top_individuals = [copy.deepcopy(population[i]) for i in sorted_indices[:3]]
+    top_indices = heapq.nlargest(3, range(len(fitnesses)), key=fitnesses.__getitem__)
+    top_individuals = [decode_individual(population[i], param_definitions) for i in top_indices]
 
     # Executa Pattern Search em cada um dos top indivíduos
-    for start_individual in top_individuals:
+    for start_individual, start_fitness in zip(top_individuals, [fitnesses[i] for i in top_indices]):
         if time.time() >= end_time:
             break
 
-        current_best_individual = copy.deepcopy(start_individual)
-        current_best_fitness = evaluate(current_best_individual, objective_multiplier, eval_counter)
-
-        int_ranges = [p['max'] - p['min'] for p in param_definitions if p['type'] == 'int']
-        step_size = max(1, int(max(int_ranges) * 0.2) if int_ranges else 20)
-
-        while step_size >= 1 and time.time() < end_time:
-            improved_in_this_step = True
-
-            while improved_in_this_step and time.time() < end_time:
-                improved_in_this_step = False
-
-                for i in range(len(param_definitions)):
-                    if time.time() > end_time:
-                        break
-
-                    p_def = param_definitions[i]
-                    best_neighbor_in_axis = current_best_individual
-                    best_fitness_in_axis = current_best_fitness
-
-                    if p_def['type'] == 'cat':
-                        for new_option in p_def['options']:
-                            if new_option == current_best_individual[i]:
-                                continue
-
-                            neighbor = copy.deepcopy(current_best_individual)
-                            neighbor[i] = new_option
-                            neighbor_fitness = evaluate(neighbor, objective_multiplier, eval_counter)
-
-                            if neighbor_fitness > best_fitness_in_axis:
-                                best_fitness_in_axis = neighbor_fitness
-                                best_neighbor_in_axis = neighbor
-
-                            if time.time() > end_time:
-                                break
-
-                    elif p_def['type'] == 'int':
-                        for direction in [1, -1]:
-                            neighbor = copy.deepcopy(current_best_individual)
-                            new_val = neighbor[i] + (direction * step_size)
-                            new_val = max(p_def['min'], min(p_def['max'], int(new_val)))
-
-                            if new_val == neighbor[i]:
-                                continue
-
-                            neighbor[i] = new_val
-                            neighbor_fitness = evaluate(neighbor, objective_multiplier, eval_counter)
-
-                            if neighbor_fitness > best_fitness_in_axis:
-                                best_fitness_in_axis = neighbor_fitness
-                                best_neighbor_in_axis = neighbor
-
-                            if time.time() > end_time:
-                                break
-
-                    if best_fitness_in_axis > current_best_fitness:
-                        current_best_fitness = best_fitness_in_axis
-                        current_best_individual = best_neighbor_in_axis
-                        results_queue.put((current_best_fitness, current_best_individual))
-                        improved_in_this_step = True
-
-            step_size //= 2
+        current_best_fitness, current_best_individual = pattern_search_from(
+            start_individual, start_fitness, param_definitions, end_time, objective_multiplier)
 
         # Atualiza melhor global se encontrou algo melhor
         if current_best_fitness > best_fitness:
-            best_fitness = current_best_fitness
-            best_individual = copy.deepcopy(current_best_individual)
+            improved, current_best_fitness, best_fitness = race(current_best_individual, current_best_fitness,
+                                                                best_individual, best_fitness,
+                                                                objective_multiplier)
+            if improved:
+                best_fitness = current_best_fitness
+                best_individual = current_best_individual
 
     return (best_fitness, best_individual)
 
 # =============================================================================
 # ### FUNÇÃO 7: ALGORITMO MEMÉTICO (HÍBRIDO VERDADEIRO) ###
 # =============================================================================
-def run_memetic_algorithm(param_definitions, end_time, objective_multiplier, results_queue,
+def run_memetic_algorithm(param_definitions, end_time, objective_multiplier,
                           population_size=50, mutation_rate=0.15, elitism_count=2,
-                          local_search_frequency=1, local_search_top_n=5, eval_counter=None):
+                          local_search_frequency=1, local_search_top_n=5, island_id=None,
+                          initial_population=None, checkpoint_name=None, resume_state=None):
     """
     Algoritmo Memético: Integração verdadeira de GA + Busca Local.
 
@@ -596,54 +3049,53 @@ def run_memetic_algorithm(param_definitions, end_time, objective_multiplier, res
     - elitism_count: Número de melhores preservados
     - local_search_frequency: A cada quantas gerações aplicar busca local (1 = sempre)
     - local_search_top_n: Quantos melhores indivíduos refinar localmente
+    - island_id: Índice da ilha no modelo de ilhas (None = população isolada)
+    - initial_population: Indivíduos do desenho inicial para esta ilha (None = aleatórios)
+    - checkpoint_name: Arquivo de checkpoint da ilha (None = sem checkpoints)
+    - resume_state: Estado lido do checkpoint para continuar de onde parou
     """
 
-    # Inicializa população aleatória
-    population = [generate_random_individual(param_definitions) for _ in range(population_size)]
-    fitnesses = [evaluate(ind, objective_multiplier, eval_counter) for ind in population]
-
-    # Encontra melhor inicial
-    best_idx = fitnesses.index(max(fitnesses))
-    best_fitness = fitnesses[best_idx]
-    best_individual = copy.deepcopy(population[best_idx])
-
-    if best_fitness > -float('inf'):
-        results_queue.put((best_fitness, best_individual))
-
-    generation = 0
+    bounds = gene_bounds(param_definitions)
+    if resume_state is not None:
+        # Retomada: continua da última geração gravada
+        population = resume_state['population']
+        fitnesses = resume_state['fitnesses']
+        best_fitness = resume_state['best_fitness']
+        best_individual = resume_state['best_individual']
+        generation = resume_state['generation']
+        random.setstate(resume_state['random'])
+    else:
+        # Inicializa população (genomas codificados)
+        population = initial_genomes(initial_population, population_size, param_definitions, bounds)
+        trace_phase('memetic', island=island_id, generation=0, stage='evolution')
+        fitnesses = evaluate_genomes(population, param_definitions, objective_multiplier)
+
+        # Encontra melhor inicial
+        best_idx = best_index(fitnesses)
+        best_fitness = fitnesses[best_idx]
+        best_individual = decode_individual(population[best_idx], param_definitions)
+
+        if best_fitness > -float('inf'):
+            report_improvement(best_fitness, best_individual, objective_multiplier)
+
+        generation = 0
+    last_checkpoint = time.time()
 
     # Loop evolutivo com refinamento local integrado
     while time.time() < end_time:
         generation += 1
+        trace_phase('memetic', island=island_id, generation=generation, stage='evolution')
 
         # =================================================================
         # FASE 1: EVOLUÇÃO GENÉTICA (Exploração Global)
         # =================================================================
 
-        # Ordena população por fitness
-        sorted_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i], reverse=True)
+        # Elitismo, seleção por torneio, crossover e mutação sobre a população inteira
+        population = evolve_population(population, fitnesses, bounds, population_size,
+                                       mutation_rate, elitism_count, param_definitions)
 
-        # Elitismo: preserva os melhores
-        new_population = [copy.deepcopy(population[i]) for i in sorted_indices[:elitism_count]]
-
-        # Gera novos indivíduos através de evolução
-        while len(new_population) < population_size:
-            if time.time() > end_time:
-                break
-
-            # Seleção de pais por torneio
-            parent1 = tournament_selection(population, fitnesses)
-            parent2 = tournament_selection(population, fitnesses)
-
-            # Crossover
-            child = crossover(parent1, parent2, param_definitions)
-
-            # Mutação
-            child = mutate(child, param_definitions, mutation_rate)
-
-            new_population.append(child)
-
-        population = new_population
+        # Avalia a população atual
+        fitnesses = evaluate_genomes(population, param_definitions, objective_multiplier)
 
         # =================================================================
         # FASE 2: REFINAMENTO LOCAL (Intensificação)
@@ -651,79 +3103,392 @@ def run_memetic_algorithm(param_definitions, end_time, objective_multiplier, res
 
         # Aplica busca local nos melhores indivíduos a cada N gerações
         if generation % local_search_frequency == 0:
-            # Avalia a população atual
-            fitnesses = [evaluate(ind, objective_multiplier, eval_counter) for ind in population]
-
             # Identifica os top N indivíduos para refinar
-            sorted_indices = sorted(range(len(fitnesses)), key=lambda i: fitnesses[i], reverse=True)
-            top_indices = sorted_indices[:local_search_top_n]
+            started = phase_start()
+            top_indices = heapq.nlargest(local_search_top_n, range(len(fitnesses)),
+                                         key=fitnesses.__getitem__)
+            phase_end('selection', started)
+            trace_phase('memetic', island=island_id, generation=generation, stage='refinement')
 
             # Refina cada um dos top indivíduos com busca local
             for idx in top_indices:
                 if time.time() > end_time:
                     break
 
-                # Aplica busca local (Pattern Search rápido)
+                # Aplica busca local (Pattern Search rápido) no indivíduo decodificado
                 refined_individual, refined_fitness = local_search_refinement(
-                    population[idx],
+                    decode_individual(population[idx], param_definitions),
                     param_definitions,
                     objective_multiplier,
-                    eval_counter,
-                    max_iterations=3  # Busca local rápida
+                    max_iterations=3,  # Busca local rápida
+                    current_fitness=fitnesses[idx]
                 )
 
                 # Substitui o indivíduo original pelo refinado (se melhorou)
                 if refined_fitness > fitnesses[idx]:
-                    population[idx] = refined_individual
+                    improved, refined_fitness, fitnesses[idx] = race(
+                        refined_individual, refined_fitness, decode_individual(population[idx], param_definitions),
+                        fitnesses[idx], objective_multiplier)
+                    if not improved:
+                        continue
+                    population[idx] = encode_individual(refined_individual, param_definitions)
                     fitnesses[idx] = refined_fitness
 
                     # Atualiza melhor global se necessário
                     if refined_fitness > best_fitness:
-                        best_fitness = refined_fitness
-                        best_individual = copy.deepcopy(refined_individual)
-                        results_queue.put((best_fitness, best_individual))
-
-        else:
-            # Se não aplicou busca local, precisa avaliar a população
-            fitnesses = [evaluate(ind, objective_multiplier, eval_counter) for ind in population]
+                        improved, refined_fitness, best_fitness = race(refined_individual, refined_fitness,
+                                                                       best_individual, best_fitness,
+                                                                       objective_multiplier)
+                        if improved:
+                            best_fitness = refined_fitness
+                            best_individual = refined_individual
+                            report_improvement(best_fitness, best_individual, objective_multiplier)
+
+        # Migração: troca os melhores indivíduos com as ilhas vizinhas
+        if island_id is not None and generation % MIGRATION_INTERVAL == 0:
+            migrate(population, fitnesses, island_id, elitism_count)
 
         # =================================================================
         # ATUALIZAÇÃO DO MELHOR GLOBAL
         # =================================================================
 
-        current_best_idx = fitnesses.index(max(fitnesses))
+        current_best_idx = best_index(fitnesses)
         current_best_fitness = fitnesses[current_best_idx]
-        current_best_individual = population[current_best_idx]
 
         if current_best_fitness > best_fitness:
-            best_fitness = current_best_fitness
-            best_individual = copy.deepcopy(current_best_individual)
-            results_queue.put((best_fitness, best_individual))
+            candidate = decode_individual(population[current_best_idx], param_definitions)
+            improved, current_best_fitness, best_fitness = race(candidate, current_best_fitness,
+                                                                best_individual, best_fitness,
+                                                                objective_multiplier)
+            if improved:
+                best_fitness = current_best_fitness
+                best_individual = candidate
+                report_improvement(best_fitness, best_individual, objective_multiplier)
+
+        if checkpoint_name and checkpoint_due(last_checkpoint):
+            save_checkpoint(checkpoint_name, {'population': population, 'fitnesses': fitnesses,
+                                              'best_fitness': best_fitness,
+                                              'best_individual': best_individual,
+                                              'generation': generation, 'random': random.getstate()})
+            last_checkpoint = time.time()
 
     return (best_fitness, best_individual)
 
+# =============================================================================
+# ### FUNÇÃO 8: OTIMIZAÇÃO BASEADA EM MODELO (TPE) ###
+# =============================================================================
+def tpe_sampler(param_definitions):
+    """TPESampler (surrogates.py) com a configuração TPE_*, o desenho inicial e as restrições."""
+    return TPESampler(param_definitions, generate_random_individual, is_feasible,
+                      generate_initial_design(param_definitions, TPE_STARTUP),
+                      gamma=TPE_GAMMA, candidates=TPE_CANDIDATES, startup=TPE_STARTUP)
+
+def run_model_based_search(pool, param_definitions, end_time, objective_multiplier,
+                           improvement_channel, batch_size, stop_event=None,
+                           checkpoint_name=None, resume_state=None):
+    """
+    Conduz o TPE a partir do processo principal: mantém 'batch_size' avaliações em
+    andamento no Pool e, a cada resultado, atualiza o modelo e envia uma nova proposta.
+    As melhorias são publicadas no mesmo canal usado pelos workers. Para no fim do
+    tempo ou quando 'stop_event' é sinalizado (antes de o pool ser encerrado).
+    O checkpoint guarda as observações concluídas; propostas em andamento são refeitas.
+    """
+    sampler = tpe_sampler(param_definitions)
+    if resume_state is not None:
+        sampler.observations = resume_state['observations']
+        sampler.startup_points = resume_state['startup_points']
+        random.setstate(resume_state['random'])
+    completed = queue.Queue()
+    in_flight = 0
+    last_checkpoint = time.time()
+
+    def submit(individual):
+        pool.apply_async(evaluate, (individual, objective_multiplier),
+                         callback=lambda fitness: completed.put((individual, fitness)),
+                         error_callback=lambda error: completed.put((individual, -float('inf'))))
+
+    while time.time() < end_time and not (stop_event and stop_event.is_set()):
+        started = phase_start()
+        proposals = sampler.ask(batch_size - in_flight)
+        phase_end('generation', started)
+        for individual in proposals:
+            submit(individual)
+            in_flight += 1
+
+        try:
+            individual, fitness = completed.get(timeout=min(1.0, max(0.0, end_time - time.time())))
+        except queue.Empty:
+            continue
+        # Processa tudo o que já terminou antes de propor o próximo lote
+        results = [(individual, fitness)]
+        while True:
+            try:
+                results.append(completed.get_nowait())
+            except queue.Empty:
+                break
+
+        for individual, fitness in results:
+            in_flight -= 1
+            sampler.tell(individual, fitness)
+            if fitness > -float('inf'):
+                publish_result(pool, improvement_channel, fitness, individual, objective_multiplier)
+
+        if checkpoint_name and checkpoint_due(last_checkpoint):
+            save_checkpoint(checkpoint_name, {'observations': sampler.observations,
+                                              'startup_points': sampler.startup_points,
+                                              'random': random.getstate()})
+            last_checkpoint = time.time()
+
+# =============================================================================
+# ### FUNÇÃO 9: MULTI-FIDELIDADE (SUCCESSIVE HALVING / HYPERBAND) ###
+# =============================================================================
+def hyperband_budgets(budget_def, eta):
+    """Degraus de orçamento: o máximo dividido sucessivamente por 'eta' até o mínimo."""
+    r_min, r_max = budget_def['min'], budget_def['max']
+    levels = int(math.floor(math.log(r_max / r_min, eta) + 1e-9)) if r_max > r_min else 0
+    budgets = sorted({max(r_min, int(round(r_max / eta ** (levels - k)))) for k in range(levels + 1)})
+    return budgets
+
+class SuccessiveHalving:
+    """
+    Successive halving assíncrono sobre uma sequência de orçamentos crescentes.
+
+    Cada degrau guarda os resultados concluídos nele. Um indivíduo é promovido ao
+    degrau seguinte assim que estiver entre os melhores 1/eta do seu degrau, sem
+    esperar o degrau inteiro terminar, o que mantém todos os workers ocupados.
+    """
+
+    def __init__(self, budgets, eta):
+        self.budgets = budgets
+        self.eta = eta
+        self.rungs = [[] for _ in budgets]        # (fitness, indivíduo) por degrau
+        self.promoted = [set() for _ in budgets]  # Já promovidos a partir de cada degrau
+
+    def promotion(self):
+        """Retorna (degrau, indivíduo) a avaliar no orçamento seguinte, ou None."""
+        for rung in range(len(self.budgets) - 2, -1, -1):
+            results = self.rungs[rung]
+            top = heapq.nlargest(len(results) // self.eta, results, key=lambda r: r[0])
+            for fitness, individual in top:
+                key = tuple(individual)
+                if fitness > -float('inf') and key not in self.promoted[rung]:
+                    self.promoted[rung].add(key)
+                    return rung + 1, individual
+        return None
+
+    def report(self, rung, individual, fitness):
+        """Registra o resultado de 'individual' no degrau 'rung'."""
+        self.rungs[rung].append((fitness, individual))
+
+def run_hyperband(pool, param_definitions, budget_def, end_time, objective_multiplier,
+                  improvement_channel, batch_size, eta=HYPERBAND_ETA, stop_event=None,
+                  checkpoint_name=None, resume_state=None):
+    """
+    Hyperband assíncrono conduzido pelo processo principal.
+
+    Cada bracket é um successive halving que começa em um degrau diferente (o
+    bracket 0 começa no menor orçamento e é o mais agressivo; o último avalia
+    direto em fidelidade total). Promoções pendentes têm prioridade; senão um
+    indivíduo aleatório novo entra em um bracket sorteado com os pesos do Hyperband.
+    Apenas resultados em fidelidade total são publicados como melhorias. O checkpoint
+    guarda os degraus de todos os brackets; promoções em andamento voltam a ser pendentes.
+    """
+    budgets = hyperband_budgets(budget_def, eta) if budget_def is not None else [None]
+    top = len(budgets) - 1
+    brackets = [SuccessiveHalving(budgets[s:], eta) for s in range(len(budgets))]
+    if resume_state is not None:
+        brackets = resume_state['brackets']
+        random.setstate(resume_state['random'])
+    # Número de configurações iniciais de cada bracket no Hyperband original
+    weights = [math.ceil(len(budgets) / (len(budgets) - s) * eta ** (top - s))
+               for s in range(len(budgets))]
+    completed = queue.Queue()
+    in_flight = 0
+    running = []  # (bracket, degrau, indivíduo) submetidos e ainda sem resultado
+    last_checkpoint = time.time()
+
+    def submit(bracket_id, rung, individual):
+        budget = brackets[bracket_id].budgets[rung]
+        running.append((bracket_id, rung, individual))
+        pool.apply_async(evaluate, (individual, objective_multiplier, budget),
+                         callback=lambda fitness: completed.put((bracket_id, rung, individual, fitness)),
+                         error_callback=lambda error: completed.put(
+                             (bracket_id, rung, individual, -float('inf'))))
+
+    def write_checkpoint():
+        snapshot = copy.deepcopy(brackets)
+        for bracket_id, rung, individual in running:
+            if rung > 0:
+                snapshot[bracket_id].promoted[rung - 1].discard(tuple(individual))
+        save_checkpoint(checkpoint_name, {'brackets': snapshot, 'random': random.getstate()})
+
+    def next_job():
+        started = phase_start()
+        for bracket_id, bracket in enumerate(brackets):
+            promotion = bracket.promotion()
+            if promotion is not None:
+                phase_end('selection', started)
+                return (bracket_id,) + promotion
+        phase_end('selection', started)
+        started = phase_start()
+        bracket_id = random.choices(range(len(brackets)), weights=weights)[0]
+        individual = generate_random_individual(param_definitions)
+        phase_end('generation', started)
+        return bracket_id, 0, individual
+
+    while time.time() < end_time and not (stop_event and stop_event.is_set()):
+        while in_flight < batch_size:
+            submit(*next_job())
+            in_flight += 1
+
+        try:
+            result = completed.get(timeout=min(1.0, max(0.0, end_time - time.time())))
+        except queue.Empty:
+            continue
+        results = [result]
+        while True:
+            try:
+                results.append(completed.get_nowait())
+            except queue.Empty:
+                break
+
+        for bracket_id, rung, individual, fitness in results:
+            in_flight -= 1
+            running.remove((bracket_id, rung, individual))
+            bracket = brackets[bracket_id]
+            bracket.report(rung, individual, fitness)
+            if rung == len(bracket.budgets) - 1 and fitness > -float('inf'):
+                publish_result(pool, improvement_channel, fitness, individual, objective_multiplier)
+
+        if checkpoint_name and checkpoint_due(last_checkpoint):
+            write_checkpoint()
+            last_checkpoint = time.time()
+
 # =============================================================================
 # ### FUNÇÃO PRINCIPAL (ORQUESTRADOR) - ATUALIZADA ###
 # =============================================================================
-def main():
+def main(resume=False):
+    if resume:
+        # A configuração (algoritmo, objetivo e parâmetros) vem do próprio checkpoint
+        manifest = load_checkpoint(CHECKPOINT_MANIFEST)
+        if manifest is None:
+            print(f"ERRO: Nenhum checkpoint encontrado em '{CHECKPOINT_DIR}' "
+                  f"(os checkpoints só são gravados com CHECKPOINT_ENABLED = True)")
+            return
+        run_optimization(manifest['algorithm'], manifest['objective_multiplier'],
+                         manifest['param_definitions'],
+                         time_limit_minutes=manifest['time_limit_minutes'], resume=True,
+                         checkpoint_dir=CHECKPOINT_DIR)
+        return
+
     try:
         algorithm, objective_multiplier, param_definitions = setup_parameters()
     except KeyboardInterrupt:
         print("\nConfiguração cancelada. Saindo.")
         return
 
-    if not os.path.exists(EXECUTABLE_PATH):
-        print(f"ERRO: Executável não encontrado em '{EXECUTABLE_PATH}'")
-        return
+    run_optimization(algorithm, objective_multiplier, param_definitions,
+                     checkpoint_dir=CHECKPOINT_DIR if CHECKPOINT_ENABLED else None)
 
+def interrupt_on_sigterm(signum, frame):
+    """SIGTERM (ex.: preempção da máquina) encerra como um Ctrl+C, gravando o checkpoint."""
+    raise KeyboardInterrupt
+
+def run_optimization(algorithm, objective_multiplier, param_definitions, objective=None,
+                     time_limit_minutes=None, executable_path=None, constraints=None, resume=False,
+                     checkpoint_dir=None, max_evaluations=None, on_evaluation=None, seed=None):
+    """
+    Executa a otimização já configurada (usada pelo prompt interativo, pelo --config
+    e por tune()). 'objective' é uma função Python opcional que substitui o executável;
+    'constraints' segue o formato de build_constraints (None usa as constantes do topo).
+    Checkpoints são gravados em 'checkpoint_dir' (None: sem checkpoints). Com 'resume'
+    continua a execução gravada lá, que precisa ter o mesmo algoritmo, objetivo e
+    parâmetros; o tempo já consumido é descontado do limite.
+    'max_evaluations' substitui MAX_EVALUATIONS. 'on_evaluation' recebe, no processo
+    principal, cada execução do modelo (dicionário no formato das linhas do trace);
+    execuções feitas depois do fim do orçamento podem chegar antes de os workers pararem.
+    'seed' torna a execução reprodutível com WORKER_COUNT = 1 (com mais workers a ordem
+    das melhorias ainda depende do escalonamento).
+    Retorna (melhor valor, melhor sequência de parâmetros) ou None se não foi possível iniciar.
+    """
+    global EXECUTABLE_PATH, WORKER_COUNT, CHECKPOINT_DIR
+    if executable_path is not None:
+        EXECUTABLE_PATH = executable_path
+    checkpoints = checkpoint_dir is not None
+    if checkpoints:
+        CHECKPOINT_DIR = checkpoint_dir
+    elif resume:
+        raise ValueError("a retomada precisa de um diretório de checkpoints")
+    if time_limit_minutes is None:
+        time_limit_minutes = TIME_LIMIT_MINUTES
+    if max_evaluations is None:
+        max_evaluations = MAX_EVALUATIONS
+    if seed is not None:
+        random.seed(seed)
+
+    # Com o broker o executável fica nas máquinas dos agentes
+    broker_mode = BROKER_ENABLED and objective is None
+    if objective is None and not broker_mode and not os.path.exists(EXECUTABLE_PATH):
+        print(f"ERRO: Executável não encontrado em '{EXECUTABLE_PATH}'")
+        return None
+
+    # O orçamento não faz parte do espaço de busca; é inserido na hora de executar
+    full_definitions = param_definitions
+    param_definitions, budget_param = split_budget_parameter(param_definitions)
+    constraints = build_constraints(constraints, budget_param)
+
+    # Retomada: o checkpoint precisa ser desta mesma configuração
+    manifest = load_checkpoint(CHECKPOINT_MANIFEST) if resume else None
+    if manifest is not None:
+        if (manifest['algorithm'], manifest['objective_multiplier'], manifest['param_definitions']) != \
+                (algorithm, objective_multiplier, full_definitions):
+            raise ValueError(f"o checkpoint em '{CHECKPOINT_DIR}' é de outra configuração "
+                             f"(algoritmo, objetivo ou parâmetros diferentes)")
+        if manifest['finished']:
+            print(f"O checkpoint em '{CHECKPOINT_DIR}' é de uma execução já concluída.")
+            if manifest['best_individual'] is None:
+                return None
+            return (manifest['best_fitness'] * objective_multiplier,
+                    insert_budget(manifest['best_individual'], budget_param))
+    else:
+        if resume:
+            print(f"AVISO: Nenhum checkpoint em '{CHECKPOINT_DIR}'; iniciando do zero.")
+        if checkpoints:
+            clear_checkpoints()
+
+    def task_state(name):
+        """Estado gravado de uma tarefa (apenas na retomada)."""
+        return load_checkpoint(name) if manifest is not None else None
+
+    # Slots de avaliação: o número de workers passa a vir da topologia detectada. O
+    # processo principal (e o Manager, que herda a afinidade dele) fica nos núcleos reservados
+    cpu_slots = None
+    original_affinity = None
+    if CPU_AFFINITY and not broker_mode:
+        reserved_cpus, cpu_slots = detect_evaluation_slots()
+        if cpu_slots is not None:
+            WORKER_COUNT = len(cpu_slots)
+            print(f"Afinidade de CPU: {len(cpu_slots)} slots de {CORES_PER_EVALUATION} núcleo(s) | "
+                  f"reservadas ao processo principal: {format_cpus(reserved_cpus) or 'nenhuma'}")
+            if reserved_cpus:
+                original_affinity = os.sched_getaffinity(0)
+                pin_to_slot(reserved_cpus)
+
+    elapsed_before = manifest['elapsed'] if manifest is not None else 0.0
     start_time = time.time()
-    end_time = start_time + TIME_LIMIT_MINUTES * 60
+    end_time = start_time + max(0.0, time_limit_minutes * 60 - elapsed_before)
 
     # Define nome do algoritmo para exibição
     if algorithm == 'ps':
         algorithm_name = "Multi-Start Pattern Search"
     elif algorithm == 'ga':
         algorithm_name = "Algoritmo Genético"
+    elif algorithm == 'tpe':
+        algorithm_name = "Otimização Baseada em Modelo (TPE)"
+    elif algorithm == 'hyperband':
+        algorithm_name = "Multi-Fidelidade (Hyperband)"
+    elif algorithm == 'ga-ps':
+        algorithm_name = "Híbrido Sequencial (GA seguido de PS)"
     else:  # hybrid
         algorithm_name = "Algoritmo Memético (Híbrido Verdadeiro)"
 
@@ -732,63 +3497,162 @@ def main():
         print(f"Estratégia: {WORKER_COUNT} buscas locais paralelas")
     elif algorithm == 'ga':
         print(f"Estratégia: {WORKER_COUNT} populações evolutivas paralelas")
+    elif algorithm == 'tpe':
+        print(f"Estratégia: modelo único propondo lotes de {WORKER_COUNT} pontos para o pool")
+    elif algorithm == 'hyperband':
+        print(f"Estratégia: brackets de successive halving assíncronos sobre {WORKER_COUNT} workers")
+    elif algorithm == 'ga-ps':
+        print(f"Estratégia: {WORKER_COUNT} populações paralelas: GA em 60% do orçamento, depois PS")
     else:  # hybrid
         print(f"Estratégia: {WORKER_COUNT} populações meméticas paralelas")
         print(f"  Integração GA + PS: Em CADA geração:")
         print(f"    1. Evolução genética (exploração global)")
         print(f"    2. Refinamento local nos top 5 indivíduos (intensificação)")
         print(f"  População: 50 | Mutação: 15% | Refinamento: A cada geração")
+    if manifest is not None:
+        print(f"Retomando o checkpoint de '{CHECKPOINT_DIR}': {elapsed_before / 60:.2f} minutos "
+              f"já executados, melhor valor {manifest['best_fitness'] * objective_multiplier:.4f}")
     print(f"Início: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
     print(f"Término: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))}")
     print("="*60)
 
-    # Configura o Manager e a Queue para comunicação
-    manager = Manager()
-    results_queue = manager.Queue()
-    eval_counter = manager.Value('i', 0)  # Contador compartilhado de avaliações
+    # Configura o Manager (cache) e o canal de melhorias worker -> monitor
+    manager = TuningManager()
+    manager.start()
+    improvement_channel = ImprovementChannel()
+    # As execuções dos workers chegam ao on_evaluation pela mesma via das melhorias
+    evaluation_feed = multiprocessing.Queue() if on_evaluation is not None else None
+    migration_hub = None
+    if algorithm in ('ga', 'hybrid') and MIGRATION_TOPOLOGY:
+        migration_hub = MigrationHub(WORKER_COUNT, MIGRATION_TOPOLOGY)
+    eval_metrics = EvaluationMetrics(WORKER_COUNT, main_slot=PROFILE_PHASES)  # Memória compartilhada
+    if PROFILE_PHASES:
+        # Os escalonadores e os reinícios rodam aqui; o perfil deles usa a fatia extra
+        eval_metrics.attach_main()
+        init_profiling(eval_metrics)
+    if PROFILE_MODE is not None:
+        clear_profiles()
+    exporter = None
+    if METRICS_HTTP_PORT is not None or METRICS_TEXTFILE_PATH is not None:
+        exporter = MetricsExporter(eval_metrics, algorithm, start_time, end_time,
+                                   METRICS_HTTP_PORT, METRICS_TEXTFILE_PATH)
+        exporter.start()
+    eval_cache = None
+    if CACHE_ENABLED:
+        store_path = None
+        executable_hash = None
+        # O histórico é indexado pelo hash do executável; funções Python não são persistidas
+        if EVAL_STORE_ENABLED and objective is None and os.path.exists(EXECUTABLE_PATH):
+            store_path = EVAL_STORE_PATH
+            executable_hash = compute_executable_hash(EXECUTABLE_PATH)
+        eval_cache = manager.EvaluationCache(CACHE_MAX_SIZE, store_path, executable_hash,
+                                             objective_multiplier)
+        if store_path is not None:
+            print(f"Histórico de avaliações: {eval_cache.stats()['preloaded']} configurações "
+                  f"pré-carregadas de '{store_path}'")
+
+    # Restrições e regiões de falha valem também no processo principal (TPE, Hyperband,
+    # desenho inicial e reinícios do multi-start geram candidatos aqui)
+    failure_regions = None
+    if FAILURE_LEARNING:
+        failure_log = manager.FailureLog(eval_cache.failures() if eval_cache is not None else [])
+        failure_regions = FailureRegions(param_definitions, failure_log, budget_param)
+    init_feasibility(constraints, failure_regions)
+    if constraints is not None:
+        print(f"Restrições: {len(constraints.expressions)} expressões | "
+              f"{len(constraints.forbidden)} configurações proibidas | "
+              f"predicado {'sim' if constraints.predicate else 'não'}")
 
     # Variáveis para acompanhar o melhor global
     global_best_fitness = -float('inf')
     global_best_individual = None
+    improvement_history = []  # Todas as melhorias recebidas (revalidação final)
+    if manifest is not None:
+        # Workers só publicam o que superar o melhor já conhecido
+        improvement_channel.seed(manifest['best_fitness'])
+        if exporter is not None and manifest['best_individual'] is not None:
+            exporter.best_value = manifest['best_fitness'] * objective_multiplier
+
+    def write_manifest(finished=False):
+        """Grava o estado do processo principal (melhor global e tempo consumido)."""
+        save_checkpoint(CHECKPOINT_MANIFEST, {
+            'algorithm': algorithm,
+            'objective_multiplier': objective_multiplier,
+            'param_definitions': full_definitions,
+            'time_limit_minutes': time_limit_minutes,
+            'elapsed': elapsed_before + time.time() - start_time,
+            'best_fitness': global_best_fitness,
+            'best_individual': global_best_individual,
+            'improvement_history': improvement_history,
+            'restarts': scheduler.restarts if scheduler is not None else 0,
+            'finished': finished,
+        })
+    validation = []
 
     print("\nOtimizando... (Monitorando resultados em tempo real)")
     print(f"Diretório de trabalho: {os.getcwd()}")
-    print(f"Verificando executável em: {EXECUTABLE_PATH}")
-
-    # Verifica se o executável existe antes de começar
-    if not os.path.exists(EXECUTABLE_PATH):
-        print(f"\n⚠️  AVISO: Executável não encontrado em '{EXECUTABLE_PATH}'")
-        print("O algoritmo será executado, mas todas as avaliações falharão.")
-        input("Pressione Enter para continuar mesmo assim, ou Ctrl+C para cancelar...")
+    if objective is not None:
+        print(f"Função objetivo em processo: {getattr(objective, '__qualname__', objective)}")
+    elif broker_mode:
+        print(f"Avaliações enviadas aos agentes remotos pelo broker em {BROKER_BIND}:{BROKER_PORT}")
+    else:
+        print(f"Verificando executável em: {EXECUTABLE_PATH}")
+        print(f"Modo de execução do modelo: {EXECUTION_MODE}")
+
+    # Broker da avaliação distribuída: os workers se conectam a ele pela interface local
+    broker = None
+    if broker_mode:
+        broker = EvaluationBroker(BROKER_BIND, BROKER_PORT, BROKER_AGENT_TIMEOUT,
+                                  compute_executable_hash(EXECUTABLE_PATH)
+                                  if os.path.exists(EXECUTABLE_PATH) else None,
+                                  heartbeat_interval=AGENT_HEARTBEAT_SECONDS,
+                                  max_dispatches=BROKER_MAX_DISPATCHES)
+        try:
+            broker.start()
+        except OSError as e:
+            print(f"ERRO: Não foi possível abrir a porta do broker {BROKER_PORT}: {e}")
+            manager.shutdown()
+            return None
+        print(f"Broker aguardando agentes: python teste.py --agent <este host>:{BROKER_PORT}")
 
     # Inicia o Pool de Processos
-    with Pool(processes=WORKER_COUNT) as pool:
+    worker_args = (eval_cache, eval_metrics, improvement_channel, migration_hub,
+                   param_definitions if SURROGATE_ENABLED else None, budget_param, objective,
+                   EXECUTABLE_PATH, constraints, failure_regions, algorithm,
+                   ('127.0.0.1', BROKER_PORT) if broker is not None else None, cpu_slots,
+                   CHECKPOINT_DIR, evaluation_feed, seed)
+    with Pool(processes=WORKER_COUNT, initializer=init_worker, initargs=worker_args) as pool:
 
         # Lança todos os workers de forma assíncrona
         async_results = []
+        driver = None                 # Thread do escalonador (TPE / Hyperband)
+        scheduler = None              # Reinícios do multi-start (PS)
+        stop_event = threading.Event()
 
         if algorithm == 'ps':
-            # Pattern Search: cria pontos de partida aleatórios
-            starting_points = []
-            for _ in range(WORKER_COUNT):
-                starting_points.append(generate_random_individual(param_definitions))
+            # Pattern Search: pontos de partida espalhados pelo desenho inicial
+            starting_points = generate_initial_design(param_definitions, WORKER_COUNT)
 
-            print(f"\nIniciando {WORKER_COUNT} buscas paralelas com os seguintes pontos aleatórios:")
+            print(f"\nIniciando {WORKER_COUNT} buscas paralelas com os seguintes pontos "
+                  f"(desenho '{INITIAL_DESIGN}'):")
             for i, point in enumerate(starting_points):
                 print(f"  Worker {i+1}: {point}")
 
             global_best_individual = starting_points[0]
             print(f"\nWorkers iniciados. Aguardando primeiros resultados...")
 
-            for point in starting_points:
-                res = pool.apply_async(run_pattern_search,
-                                       args=(point,
-                                             param_definitions,
-                                             end_time,
-                                             objective_multiplier,
-                                             results_queue,
-                                             eval_counter))
-                async_results.append(res)
+            # Buscas que convergem são reiniciadas imediatamente pelo escalonador
+            scheduler = MultiStartScheduler(pool, param_definitions, end_time, objective_multiplier,
+                                            checkpoints=checkpoints)
+            resume_states = {}
+            if manifest is not None:
+                scheduler.restarts = manifest['restarts']
+                for slot in range(WORKER_COUNT):
+                    state = task_state(f"busca_{slot}")
+                    if state is not None:
+                        resume_states[slot] = state
+                print(f"  {len(resume_states)} buscas retomadas do checkpoint")
+            scheduler.start(starting_points, resume_states)
 
         elif algorithm == 'ga':
             # Algoritmo Genético: lança múltiplas populações
@@ -796,101 +3660,250 @@ def main():
             print(f"  Tamanho da população: 50 indivíduos cada")
             print(f"  Taxa de mutação: 10%")
             print(f"  Elitismo: 2 melhores preservados por geração")
+            if MIGRATION_TOPOLOGY:
+                print(f"  Modelo de ilhas: topologia '{MIGRATION_TOPOLOGY}' | {MIGRATION_COUNT} migrantes "
+                      f"a cada {MIGRATION_INTERVAL} gerações | substituição '{MIGRATION_REPLACEMENT}'")
 
             global_best_individual = generate_random_individual(param_definitions)
             print(f"\nWorkers iniciados. Aguardando primeiros resultados...")
 
-            for _ in range(WORKER_COUNT):
+            # Um único desenho para todas as ilhas: cada uma recebe uma fatia disjunta
+            design = generate_initial_design(param_definitions, WORKER_COUNT * 50)
+            for island_id in range(WORKER_COUNT):
                 res = pool.apply_async(run_genetic_algorithm,
                                        args=(param_definitions,
                                              end_time,
                                              objective_multiplier,
-                                             results_queue,
                                              50,  # population_size
                                              0.1,  # mutation_rate
-                                             2,  # elitism_count
-                                             eval_counter))
+                                             2),  # elitism_count
+                                       kwds={'island_id': island_id if MIGRATION_TOPOLOGY else None,
+                                             'initial_population': design[island_id * 50:(island_id + 1) * 50],
+                                             'checkpoint_name': f"ilha_{island_id}" if checkpoints else None,
+                                             'resume_state': task_state(f"ilha_{island_id}")})
                 async_results.append(res)
 
+        elif algorithm == 'tpe':
+            # TPE: o modelo roda em uma thread do processo principal e usa o pool
+            # apenas para avaliar as propostas
+            print(f"\nIniciando TPE: {TPE_STARTUP} pontos aleatórios iniciais, depois propostas do modelo")
+            print(f"  Candidatos por proposta: {TPE_CANDIDATES} | Fração 'boa': {TPE_GAMMA:.0%}")
+
+            global_best_individual = generate_random_individual(param_definitions)
+            print(f"\nWorkers iniciados. Aguardando primeiros resultados...")
+
+            driver = threading.Thread(target=run_model_based_search,
+                                      args=(pool, param_definitions, end_time, objective_multiplier,
+                                            improvement_channel, WORKER_COUNT),
+                                      kwargs={'stop_event': stop_event,
+                                              'checkpoint_name': 'tpe' if checkpoints else None,
+                                              'resume_state': task_state('tpe')}, daemon=True)
+            driver.start()
+
+        elif algorithm == 'hyperband':
+            # Hyperband: o escalonador roda em uma thread do processo principal e
+            # distribui avaliações de diferentes orçamentos pelo pool
+            budget_def = budget_param[1] if budget_param is not None else None
+            if budget_def is not None:
+                print(f"\nIniciando Hyperband (eta={HYPERBAND_ETA}) com orçamentos "
+                      f"{hyperband_budgets(budget_def, HYPERBAND_ETA)} no parâmetro {budget_param[0] + 1}")
+
+            global_best_individual = generate_random_individual(param_definitions)
+            print(f"\nWorkers iniciados. Aguardando primeiros resultados em fidelidade total...")
+
+            driver = threading.Thread(target=run_hyperband,
+                                      args=(pool, param_definitions, budget_def, end_time,
+                                            objective_multiplier, improvement_channel, WORKER_COUNT),
+                                      kwargs={'stop_event': stop_event,
+                                              'checkpoint_name': 'hyperband' if checkpoints else None,
+                                              'resume_state': task_state('hyperband')}, daemon=True)
+            driver.start()
+
+        elif algorithm == 'ga-ps':
+            # Híbrido sequencial: cada worker roda o GA e refina os melhores com PS
+            print(f"\nIniciando {WORKER_COUNT} populações (GA seguido de PS)")
+            print(f"  População: 50 indivíduos | Mutação: 10% | Refinamento: top 3 ao fim do GA")
+
+            global_best_individual = generate_random_individual(param_definitions)
+            print(f"\nWorkers iniciados. Aguardando primeiros resultados...")
+
+            # Com orçamento de execuções a fase GA é medida em avaliações, não em tempo
+            ga_evaluations = None
+            if max_evaluations is not None:
+                ga_evaluations = int(0.6 * max_evaluations / WORKER_COUNT)
+            for _ in range(WORKER_COUNT):
+                async_results.append(pool.apply_async(run_hybrid_algorithm,
+                                                      args=(param_definitions, end_time, objective_multiplier),
+                                                      kwds={'ga_evaluations': ga_evaluations}))
+
         else:  # algorithm == 'hybrid'
             # Algoritmo Memético: Integração verdadeira de GA + PS
             print(f"\nIniciando {WORKER_COUNT} populações meméticas paralelas")
             print(f"  População: 50 indivíduos | Mutação: 15% | Elitismo: 2")
             print(f"  Refinamento local: Top 5 indivíduos a cada geração")
             print(f"  Estratégia: Evolução + Intensificação em CADA geração")
+            if MIGRATION_TOPOLOGY:
+                print(f"  Modelo de ilhas: topologia '{MIGRATION_TOPOLOGY}' | {MIGRATION_COUNT} migrantes "
+                      f"a cada {MIGRATION_INTERVAL} gerações | substituição '{MIGRATION_REPLACEMENT}'")
 
             global_best_individual = generate_random_individual(param_definitions)
             print(f"\nWorkers iniciados. Aguardando primeiros resultados...")
 
-            for _ in range(WORKER_COUNT):
+            # Um único desenho para todas as ilhas: cada uma recebe uma fatia disjunta
+            design = generate_initial_design(param_definitions, WORKER_COUNT * 50)
+            for island_id in range(WORKER_COUNT):
                 res = pool.apply_async(run_memetic_algorithm,
                                        args=(param_definitions,
                                              end_time,
                                              objective_multiplier,
-                                             results_queue,
                                              50,   # population_size
                                              0.15, # mutation_rate (15%)
                                              2,    # elitism_count
                                              1,    # local_search_frequency (toda geração)
-                                             5,    # local_search_top_n (top 5)
-                                             eval_counter))
+                                             5),   # local_search_top_n (top 5)
+                                       kwds={'island_id': island_id if MIGRATION_TOPOLOGY else None,
+                                             'initial_population': design[island_id * 50:(island_id + 1) * 50],
+                                             'checkpoint_name': f"ilha_{island_id}" if checkpoints else None,
+                                             'resume_state': task_state(f"ilha_{island_id}")})
                 async_results.append(res)
 
+        if manifest is not None:
+            # O melhor do checkpoint substitui o ponto provisório escolhido acima
+            global_best_fitness = manifest['best_fitness']
+            global_best_individual = manifest['best_individual'] or global_best_individual
+            improvement_history = manifest['improvement_history']
+
         # Loop de monitoramento (executa no processo principal)
         last_status_time = time.time()
+        last_checkpoint_time = time.time()
+        last_export_time = time.time()
         status_interval = 30  # Mostra status a cada 30 segundos
+        last_improvement_time = time.time()
+        stop_reason = "Tempo esgotado."
+        interrupted = False
+
+        def drain_evaluations():
+            """Entrega ao on_evaluation as execuções já recebidas dos workers."""
+            while evaluation_feed is not None:
+                try:
+                    entry = evaluation_feed.get_nowait()
+                except queue.Empty:
+                    return
+                on_evaluation(entry)
 
         try:
             while time.time() < end_time:
-                # Verifica se há novos resultados na fila
-                while not results_queue.empty():
-                    try:
-                        worker_fitness, worker_individual = results_queue.get_nowait()
-
-                        # Compara com o melhor global
-                        if worker_fitness > global_best_fitness:
-                            global_best_fitness = worker_fitness
-                            global_best_individual = worker_individual
-
-                            # Imprime o valor real (desfazendo o multiplicador)
-                            real_value = global_best_fitness * objective_multiplier
-                            elapsed = time.time() - start_time
-
-                            print("\n" + "="*60)
-                            print("*** NOVO MELHOR ENCONTRADO ***")
-                            print(f"Tempo decorrido: {elapsed/60:.2f} minutos")
-                            print(f"Execuções realizadas: {eval_counter.value}")
-                            print(f"Valor encontrado: {real_value:.4f}")
-                            print(f"Parâmetros: {global_best_individual}")
-                            print("="*60 + "\n")
-
-                    except Exception:
-                        # Ignora se a fila estiver vazia (condição de corrida)
-                        pass
+                # Bloqueia até chegar uma melhoria ou até o próximo status/fim do tempo
+                wait = min(end_time, last_status_time + status_interval) - time.time()
+                if max_evaluations is not None or NO_IMPROVEMENT_MINUTES is not None:
+                    wait = min(wait, 1.0)  # Confere os critérios de parada a cada segundo
+                if evaluation_feed is not None:
+                    wait = min(wait, 0.1)
+                if checkpoints:
+                    wait = min(wait, last_checkpoint_time + CHECKPOINT_INTERVAL_SECONDS - time.time())
+                if exporter is not None and METRICS_TEXTFILE_PATH is not None:
+                    wait = min(wait, last_export_time + METRICS_EXPORT_INTERVAL - time.time())
+                try:
+                    worker_fitness, worker_individual = improvement_channel.get(timeout=max(0.0, wait))
+                except queue.Empty:
+                    pass
+                else:
+                    improvement_history.append((worker_fitness, worker_individual))
+                    # Compara com o melhor global
+                    if worker_fitness > global_best_fitness:
+                        global_best_fitness = worker_fitness
+                        global_best_individual = worker_individual
+                        last_improvement_time = time.time()
+                        if scheduler is not None:
+                            scheduler.best_individual = global_best_individual
+
+                        # Imprime o valor real (desfazendo o multiplicador)
+                        real_value = global_best_fitness * objective_multiplier
+                        if exporter is not None:
+                            exporter.best_value = real_value
+                        elapsed = time.time() - start_time
+
+                        print("\n" + "="*60)
+                        print("*** NOVO MELHOR ENCONTRADO ***")
+                        print(f"Tempo decorrido: {elapsed/60:.2f} minutos")
+                        print(f"Execuções realizadas: {eval_metrics.snapshot()['evaluations']}")
+                        print(f"Valor encontrado: {real_value:.4f}")
+                        print(f"Parâmetros: {global_best_individual}")
+                        print("="*60 + "\n")
 
                 # Mostra status periódico
                 current_time = time.time()
                 if current_time - last_status_time >= status_interval:
                     elapsed = current_time - start_time
                     remaining = end_time - current_time
-                    print(f"\n[Status] Tempo: {elapsed/60:.1f}m | Execuções: {eval_counter.value} | "
+                    metrics = eval_metrics.snapshot()
+                    throughput = metrics['evaluations'] / elapsed if elapsed > 0 else 0.0
+                    print(f"\n[Status] Tempo: {elapsed/60:.1f}m | Execuções: {metrics['evaluations']} "
+                          f"({throughput:.2f}/s) | Latência p50/p95: "
+                          f"{format_latency(latency_percentile(metrics['histogram'], 0.50))}/"
+                          f"{format_latency(latency_percentile(metrics['histogram'], 0.95))} | "
                           f"Restante: {remaining/60:.1f}m | Melhor: {global_best_fitness * objective_multiplier:.4f}")
+                    if broker is not None:
+                        print(f"[Status] {broker.status_line()}")
                     last_status_time = current_time
 
-                # Pausa para não consumir 100% da CPU do processo principal
-                time.sleep(0.2)
+                if checkpoints and checkpoint_due(last_checkpoint_time):
+                    write_manifest()
+                    last_checkpoint_time = time.time()
+
+                if exporter is not None and time.time() - last_export_time >= METRICS_EXPORT_INTERVAL:
+                    exporter.write_textfile()
+                    last_export_time = time.time()
 
-            print("Tempo esgotado. Encerrando workers...")
+                drain_evaluations()
+
+                # Encerramento antecipado
+                if (max_evaluations is not None and
+                        eval_metrics.snapshot()['evaluations'] >= max_evaluations):
+                    stop_reason = f"Orçamento de {max_evaluations} execuções esgotado."
+                    break
+                if (NO_IMPROVEMENT_MINUTES is not None and
+                        time.time() - last_improvement_time >= NO_IMPROVEMENT_MINUTES * 60):
+                    stop_reason = f"Sem melhora há {NO_IMPROVEMENT_MINUTES} minutos."
+                    break
+
+            print(f"{stop_reason} Encerrando workers...")
 
         except KeyboardInterrupt:
+            interrupted = True
             print("\n\n*** INTERROMPIDO PELO USUÁRIO (Ctrl+C) ***")
             print("Encerrando workers e gerando relatório final...")
 
         finally:
+            # Os escalonadores precisam parar de submeter antes de o pool ser encerrado
+            stop_event.set()
+            if driver is not None:
+                driver.join()
+            if scheduler is not None:
+                scheduler.stop()
             pool.terminate() # Força o encerramento dos workers
             pool.join()
-        
+            drain_evaluations()
+
+    # Estado final: uma execução interrompida pode ser retomada com --resume
+    if checkpoints:
+        write_manifest(finished=not interrupted)
+        if interrupted:
+            print(f"Checkpoint gravado em '{CHECKPOINT_DIR}'. Para continuar: --resume "
+                  f"(ou tune(..., resume=True) com o mesmo checkpoint_dir)")
+
     # ### FIM DAS ALTERAÇÕES ###
+
+    # A revalidação usa um pool novo: com encerramento antecipado os workers do pool
+    # principal ainda estariam ocupados com buscas que só olham o prazo original
+    if NOISE_HANDLING and improvement_history and not interrupted:
+        print(f"Revalidando os {FINAL_VALIDATION_TOP_K} melhores "
+              f"({FINAL_VALIDATION_SAMPLES} medições cada)...")
+        with Pool(processes=WORKER_COUNT, initializer=init_worker, initargs=worker_args) as pool:
+            validation = validate_candidates(pool, improvement_history, objective_multiplier)
+        drain_evaluations()
+    if broker is not None:
+        broker.stop()
         
     run_duration = time.time() - start_time
     
@@ -908,18 +3921,281 @@ def main():
     print(f"Estratégia Utilizada: {algorithm_name}")
     print(f"Número de Workers Paralelos: {WORKER_COUNT}")
     print(f"Tempo Total de Execução: {run_duration / 60:.2f} minutos ({run_duration:.2f} segundos)")
-    print(f"Total de Execuções do Modelo: {eval_counter.value}")
+    metrics = eval_metrics.snapshot()
+    print(f"Total de Execuções do Modelo: {metrics['evaluations']}")
     if run_duration > 0:
-        print(f"Taxa de Execução: {eval_counter.value / run_duration:.2f} avaliações/segundo")
+        print(f"Taxa de Execução: {metrics['evaluations'] / run_duration:.2f} avaliações/segundo")
+        busy, capacity = worker_occupancy(eval_metrics, run_duration,
+                                          PS_POLL_WORKERS if algorithm == 'ps' else 1)
+        if capacity > 0:
+            # Sem PROFILE_PHASES só o tempo no modelo é medido: o tempo do otimizador nos
+            # workers (geração, seleção, cache, modelo substituto) conta como ocioso
+            label = "" if PROFILE_PHASES else " (aprox.: só o tempo no modelo conta como ocupado)"
+            print(f"Ocupação dos Workers: {100.0 * busy / capacity:.1f}% | "
+                  f"Tempo ocioso de núcleos: {capacity - busy:.1f}s{label}")
+    if scheduler is not None:
+        print(f"Reinícios do Multi-Start: {scheduler.restarts}"
+              f"{f' | {scheduler.failures} buscas com erro' if scheduler.failures else ''}")
+    if metrics['evaluations']:
+        histogram = metrics['histogram']
+        print(f"Latência por Avaliação: média {format_latency(metrics['eval_time'] / metrics['evaluations'])} | "
+              f"p50 {format_latency(latency_percentile(histogram, 0.50))} | "
+              f"p95 {format_latency(latency_percentile(histogram, 0.95))} | "
+              f"p99 {format_latency(latency_percentile(histogram, 0.99))}")
+    print(f"Falhas: {metrics['timeouts']} timeouts | {metrics['parse_failures']} saídas inválidas | "
+          f"{metrics['crashes']} erros de execução")
+    if CAPPING_ENABLED:
+        print(f"Capping: {metrics['capped']} avaliações abortadas pelo tempo do melhor global")
+    if constraints is not None or failure_regions is not None:
+        learned = failure_regions.failure_log.count() if failure_regions is not None else 0
+        print(f"Viabilidade: {metrics['rejected']} candidatos descartados nos workers sem executar | "
+              f"{learned} falhas conhecidas")
+    if SURROGATE_ENABLED:
+        candidates = metrics['surrogate_candidates']
+        accepted = metrics['surrogate_accepted']
+        surrogate_cost = metrics['surrogate_fit_time'] + metrics['surrogate_predict_time']
+        print(f"Modelo Substituto: {accepted}/{candidates} candidatos aceitos "
+              f"({100.0 * accepted / candidates if candidates else 0.0:.1f}%) | "
+              f"ajuste {metrics['surrogate_fit_time']:.2f}s | previsão {metrics['surrogate_predict_time']:.2f}s")
+        if metrics['evaluations']:
+            # Estimativa: candidatos descartados x latência média de uma execução real
+            saved = (candidates - accepted) * metrics['eval_time'] / metrics['evaluations']
+            print(f"  Tempo de executável economizado (estimado): {saved:.2f}s | "
+                  f"custo do modelo: {surrogate_cost:.2f}s")
+    if eval_cache is not None:
+        cache_stats = eval_cache.stats()
+        lookups = cache_stats['hits'] + cache_stats['misses']
+        hit_rate = 100.0 * cache_stats['hits'] / lookups if lookups else 0.0
+        print(f"Cache de Avaliações: {cache_stats['hits']} acertos | {cache_stats['misses']} faltas "
+              f"({hit_rate:.1f}% de acerto) | {cache_stats['evictions']} descartes | "
+              f"{cache_stats['size']} entradas")
+        if cache_stats['stored']:
+            print(f"Histórico de Avaliações: {cache_stats['stored']} novas configurações gravadas "
+                  f"em '{EVAL_STORE_PATH}'")
+    else:
+        print("Cache de Avaliações: desativado")
+    if TRACE_ENABLED:
+        print(f"Trace de Avaliações: '{TRACE_PATH}'")
+    if broker is not None:
+        broker.print_stats()
+    if cpu_slots is not None:
+        print_slot_report(eval_metrics, cpu_slots)
+    if PROFILE_PHASES:
+        print_phase_profile(eval_metrics)
+    if PROFILE_MODE is not None:
+        print_profile_files()
+    if exporter is not None:
+        exporter.write_textfile()
+        exporter.stop()
+    if validation:
+        print(f"\n--- REVALIDAÇÃO FINAL ({FINAL_VALIDATION_SAMPLES} medições, "
+              f"IC {NOISE_CONFIDENCE:.0%}) ---")
+        for mean, half_width, individual in validation:
+            print(f"  {mean * objective_multiplier:.4f} ± {half_width:.4f} | "
+                  f"{insert_budget(individual, budget_param)}")
+        # O melhor passa a ser o de melhor média revalidada, não a medição isolada
+        best_mean, best_half_width, best_overall_individual = validation[0]
+        best_overall_fitness = best_mean * objective_multiplier
     print("\n--- MELHOR RESULTADO ENCONTRADO ---")
     print(f"Melhor Valor Alcançado: {best_overall_fitness:.4f}")
-    print(f"Sequência de Parâmetros: {best_overall_individual}")
+    print(f"Sequência de Parâmetros: {insert_budget(best_overall_individual, budget_param)}")
     print("="*60)
 
+    init_feasibility(None, None)
+    init_profiling(None)
+    manager.shutdown()
+    if original_affinity is not None:
+        os.sched_setaffinity(0, original_affinity)
+    if best_overall_individual is None:
+        return None
+    return best_overall_fitness, insert_budget(best_overall_individual, budget_param)
+
+# =============================================================================
+# ### API DE BIBLIOTECA E CONFIGURAÇÃO NÃO INTERATIVA ###
+# =============================================================================
+ALGORITHMS = ('ps', 'ga', 'hybrid', 'tpe', 'hyperband', 'ga-ps')
+
+def validate_space(space):
+    """
+    Valida e normaliza um espaço de parâmetros no mesmo formato de setup_parameters():
+    uma lista de dicionários como {'type': 'int', 'min': a, 'max': b} (também 'float',
+    'log-int', 'log-float' e 'budget'), {'type': 'cat', 'options': [...]} ou 'ord'.
+    Qualquer parâmetro pode ter 'condition': {'parent': j, 'values': [...]}, com j o
+    índice (base 0) de um parâmetro anterior.
+    Lança ValueError descrevendo o primeiro problema encontrado.
+    """
+    if not space:
+        raise ValueError("o espaço de parâmetros está vazio")
+    param_definitions = []
+    for i, p_def in enumerate(space, 1):
+        p_type = str(p_def.get('type', '')).lower()
+        if p_type in ('cat', 'ord'):
+            options = [str(opt) for opt in p_def.get('options', [])]
+            if not options:
+                raise ValueError(f"parâmetro {i}: '{p_type}' precisa de uma lista 'options' não vazia")
+            definition = {'type': p_type, 'options': options}
+        elif p_type in ('int', 'float', 'log-int', 'log-float', 'budget'):
+            caster = float if p_type in ('float', 'log-float') else int
+            try:
+                p_min, p_max = caster(p_def['min']), caster(p_def['max'])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"parâmetro {i}: '{p_type}' precisa de 'min' e 'max' numéricos")
+            if p_max < p_min or (p_type in ('budget', 'log-int', 'log-float') and p_min <= 0):
+                raise ValueError(f"parâmetro {i}: intervalo inválido [{p_min}, {p_max}]")
+            definition = {'type': p_type, 'min': p_min, 'max': p_max}
+        else:
+            raise ValueError(f"parâmetro {i}: tipo desconhecido {p_def.get('type')!r}")
+
+        condition = p_def.get('condition')
+        if condition is not None:
+            parent = condition.get('parent') if isinstance(condition, dict) else None
+            if not isinstance(parent, int) or not 0 <= parent < i - 1:
+                raise ValueError(f"parâmetro {i}: 'condition.parent' deve ser o índice de um parâmetro anterior")
+            if param_definitions[parent]['type'] == 'budget':
+                raise ValueError(f"parâmetro {i}: a condição não pode depender do parâmetro 'budget'")
+            try:
+                values = condition_values(param_definitions[parent], condition.get('values', []))
+            except ValueError as e:
+                raise ValueError(f"parâmetro {i}: valor de 'condition.values' inválido: {e}")
+            definition['condition'] = {'parent': parent, 'values': values}
+        param_definitions.append(definition)
+    if sum(1 for p in param_definitions if p['type'] == 'budget') > 1:
+        raise ValueError("no máximo um parâmetro pode ser do tipo 'budget'")
+    return param_definitions
+
+def checkpoint_key(algorithm, goal, param_definitions, objective, executable_path):
+    """Identificador curto de uma configuração (subdiretório dos checkpoints de tune())."""
+    if objective is not None:
+        target = f"{getattr(objective, '__module__', '')}:{getattr(objective, '__qualname__', repr(objective))}"
+    else:
+        target = os.path.abspath(executable_path or EXECUTABLE_PATH)
+    description = json.dumps([algorithm, goal, param_definitions, target], sort_keys=True)
+    return hashlib.sha256(description.encode('utf-8')).hexdigest()[:16]
+
+def tune(space, objective=None, time_limit_minutes=TIME_LIMIT_MINUTES, algorithm='ps', goal='max',
+         executable_path=None, constraints=None, resume=False, checkpoint_dir=None,
+         max_evaluations=None, on_evaluation=None, seed=None):
+    """
+    API de biblioteca: otimiza sem perguntas interativas.
+
+    - space: lista de definições de parâmetros (ver validate_space)
+    - objective: função Python que recebe a lista de parâmetros e retorna um número;
+      roda dentro dos workers do pool. Com spawn (Windows) precisa ser uma função de
+      módulo (picklable). None usa o executável (EXECUTABLE_PATH ou executable_path).
+    - time_limit_minutes: orçamento de tempo da otimização
+    - algorithm: 'ps', 'ga', 'hybrid', 'tpe', 'hyperband' ou 'ga-ps' (GA seguido de PS,
+      run_hybrid_algorithm)
+    - goal: 'max' ou 'min'
+    - constraints: {'expressions': [...], 'forbidden': [...], 'predicate': função ou
+      'modulo:funcao'} (ver CONSTRAINTS); None usa as constantes do topo do arquivo
+    - checkpoint_dir: diretório para os checkpoints; cada configuração (algoritmo,
+      objetivo, espaço e função/executável) usa um subdiretório próprio dentro dele.
+      None (padrão) não grava checkpoints
+    - resume: continua a execução interrompida gravada em checkpoint_dir
+    - max_evaluations: orçamento de execuções do modelo (None usa MAX_EVALUATIONS)
+    - on_evaluation: função chamada no processo principal com cada execução do modelo
+      (dicionário com 'params', 'value', 'status', 'wall_time', 'time', ... como no trace)
+    - seed: semente do processo principal e dos workers (reprodutível com um único worker)
+
+    Retorna (melhor valor, melhor sequência de parâmetros) ou None.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"algoritmo desconhecido {algorithm!r}; use um de {', '.join(ALGORITHMS)}")
+    if goal not in ('max', 'min'):
+        raise ValueError(f"objetivo desconhecido {goal!r}; use 'max' ou 'min'")
+    if resume and checkpoint_dir is None:
+        raise ValueError("resume=True precisa de checkpoint_dir")
+    param_definitions = validate_space(space)
+    if checkpoint_dir is not None:
+        checkpoint_dir = os.path.join(checkpoint_dir, checkpoint_key(algorithm, goal, param_definitions,
+                                                                     objective, executable_path))
+    return run_optimization(algorithm, 1.0 if goal == 'max' else -1.0, param_definitions,
+                            objective=objective, time_limit_minutes=time_limit_minutes,
+                            executable_path=executable_path, constraints=constraints, resume=resume,
+                            checkpoint_dir=checkpoint_dir, max_evaluations=max_evaluations,
+                            on_evaluation=on_evaluation, seed=seed)
+
+def load_objective(reference):
+    """Importa uma função objetivo a partir de 'pacote.modulo:funcao'."""
+    module_name, _, function_name = reference.partition(':')
+    if not function_name:
+        raise ValueError(f"função objetivo deve ter o formato 'modulo:funcao', recebido {reference!r}")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def load_config(path):
+    """
+    Lê a configuração de uma execução não interativa (JSON, ou YAML se o PyYAML
+    estiver instalado). Chaves: 'algorithm', 'goal', 'parameters' e, opcionais,
+    'time_limit_minutes', 'executable', 'objective' ('modulo:funcao') e 'constraints'.
+    Exemplo:
+        {"algorithm": "ps", "goal": "min", "time_limit_minutes": 5,
+         "parameters": [{"type": "int", "min": 1, "max": 64},
+                        {"type": "cat", "options": ["a", "b"]}],
+         "constraints": {"expressions": ["p1 % 2 == 0"], "forbidden": [{"1": 64, "2": "b"}]}}
+    """
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    if path.lower().endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("arquivos YAML requerem o pacote PyYAML (pip install pyyaml); use JSON")
+        config = yaml.safe_load(text)
+    else:
+        config = json.loads(text)
+    if not isinstance(config, dict):
+        raise ValueError("a configuração deve ser um objeto com as chaves 'algorithm', 'goal' e 'parameters'")
+    return config
+
+def run_from_config(path, resume=False):
+    """Executa a otimização descrita em um arquivo de configuração (opção --config)."""
+    config = load_config(path)
+    objective = config.get('objective')
+    executable = config.get('executable')
+    if executable is not None and not os.path.isabs(executable):
+        executable = os.path.join(os.path.dirname(os.path.abspath(path)), executable)
+    return tune(config.get('parameters', []),
+                objective=load_objective(objective) if objective else None,
+                time_limit_minutes=config.get('time_limit_minutes', TIME_LIMIT_MINUTES),
+                algorithm=str(config.get('algorithm', 'ps')).lower(),
+                goal=str(config.get('goal', 'max')).lower(),
+                executable_path=executable,
+                constraints=config.get('constraints'),
+                resume=resume,
+                checkpoint_dir=CHECKPOINT_DIR if CHECKPOINT_ENABLED or resume else None)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Auto-tuning dos parâmetros de um executável.")
+    parser.add_argument('--config', help="arquivo JSON/YAML com algoritmo, objetivo e espaço de "
+                                         "parâmetros (execução não interativa)")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"continua a execução interrompida a partir do checkpoint em '{CHECKPOINT_DIR}'")
+    parser.add_argument('--agent', metavar='HOST:PORTA',
+                        help="roda como agente de avaliação do broker indicado (avaliação distribuída)")
+    parser.add_argument('--slots', type=int, help="avaliações simultâneas do agente (padrão: nº de CPUs)")
+    parser.add_argument('--executable', help="caminho do executável no agente (padrão: EXECUTABLE_PATH)")
+    args = parser.parse_args()
+    signal.signal(signal.SIGTERM, interrupt_on_sigterm)
+
+    if args.agent:
+        if args.executable:
+            EXECUTABLE_PATH = os.path.abspath(args.executable)
+        try:
+            run_agent(args.agent, args.slots)
+        except KeyboardInterrupt:
+            print("\nAgente encerrado.")
+        sys.exit(0)
+
     detected_cpus = cpu_count()
     print(f"(Detectado {detected_cpus} processadores lógicos. Usando {WORKER_COUNT}.)")
     if WORKER_COUNT > detected_cpus:
         print(f"AVISO: Você pediu {WORKER_COUNT} processos, mas só {detected_cpus} foram detectados.")
-    
-    main()
+
+    if args.config:
+        try:
+            run_from_config(args.config, resume=args.resume)
+        except (OSError, ValueError, ImportError, AttributeError) as e:
+            print(f"ERRO: configuração inválida em '{args.config}': {e}")
+            sys.exit(1)
+    else:
+        main(resume=args.resume)
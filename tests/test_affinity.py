@@ -0,0 +1,64 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+# Dois sockets com 3 núcleos cada; cada núcleo com duas CPUs lógicas (SMT)
+CORES = [(0, [0, 6]), (0, [1, 7]), (0, [2, 8]), (1, [3, 9]), (1, [4, 10]), (1, [5, 11])]
+
+
+class EvaluationSlotsTest(unittest.TestCase):
+
+    def test_reserved_cores_and_slots_within_a_socket(self):
+        reserved, slots = teste.evaluation_slots(CORES, cores_per_slot=2, reserved=1)
+        self.assertEqual(reserved, [0, 6])
+        # O núcleo 2 sobra no socket 0: um slot não junta núcleos de sockets diferentes
+        self.assertEqual(slots, [[1, 2, 7, 8], [3, 4, 9, 10]])
+
+    def test_reserve_is_dropped_when_it_leaves_no_slot(self):
+        reserved, slots = teste.evaluation_slots(CORES[:2], cores_per_slot=2, reserved=1)
+        self.assertEqual(reserved, [])
+        self.assertEqual(slots, [[0, 1, 6, 7]])
+
+    def test_not_enough_cores_disables_affinity(self):
+        with mock.patch.object(teste, 'physical_cores', return_value=[]), redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(teste.detect_evaluation_slots(), (None, None))
+        self.assertIn("Núcleos insuficientes", out.getvalue())
+
+    def test_format_cpus(self):
+        self.assertEqual(teste.format_cpus([0, 1, 2, 5, 7, 8]), "0-2,5,7-8")
+        self.assertEqual(teste.format_cpus([]), "")
+
+    def test_pin_failure_only_warns(self):
+        with mock.patch('os.sched_setaffinity', side_effect=OSError("inválido")), \
+                redirect_stderr(io.StringIO()) as err:
+            teste.pin_to_slot([999])
+        self.assertIn("Não foi possível fixar a afinidade em [999]", err.getvalue())
+
+    def test_physical_cores_cover_available_cpus(self):
+        cpus = sorted(cpu for _, core in teste.physical_cores() for cpu in core)
+        self.assertEqual(cpus, sorted(os.sched_getaffinity(0)))
+
+
+class SlotReportTest(unittest.TestCase):
+
+    def test_per_slot_latency_and_spread(self):
+        metrics = teste.EvaluationMetrics(2)
+        with mock.patch('multiprocessing.util.Finalize'):
+            metrics.attach()
+        for wall_time in (0.1, 0.3):
+            metrics.record(wall_time)
+        with redirect_stdout(io.StringIO()) as out:
+            teste.print_slot_report(metrics, [[0, 6], [1, 7]])
+        report = out.getvalue()
+        self.assertIn("Slot 1 [CPUs 0,6]: 2 execuções | média 200.0ms | desvio 100.0ms", report)
+        self.assertIn("Slot 2 [CPUs 1,7]: sem execuções", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import benchmark
+import teste
+
+
+def entry(value, started, wall_time=0.01, status='ok'):
+    return {'params': [value], 'value': value, 'status': status, 'wall_time': wall_time,
+            'time': started + wall_time}
+
+
+class RunRecorderTest(unittest.TestCase):
+
+    def test_curve_target_and_overhead(self):
+        recorder = benchmark.RunRecorder('min', 2, budget=3)
+        recorder.record(entry(10, 100.0))
+        recorder.record(entry(None, 100.02, status='crash'))
+        recorder.record(entry(1, 100.04))
+        self.assertEqual(recorder.best_value, 1)
+        self.assertEqual(recorder.failures, 1)
+        self.assertEqual(recorder.evaluations_to_target, 3)
+        self.assertEqual([point[0] for point in recorder.curve], [1, 3])
+        # 50 ms entre o início da primeira e o fim da terceira, 30 ms no modelo
+        self.assertAlmostEqual(recorder.overhead(), 0.02)
+
+    def test_executions_after_budget_are_ignored(self):
+        recorder = benchmark.RunRecorder('max', 100, budget=1)
+        recorder.record(entry(1, 0.0))
+        recorder.record(entry(500, 1.0))
+        self.assertEqual(recorder.evaluations, 1)
+        self.assertEqual(recorder.best_value, 1)
+        self.assertIsNone(recorder.evaluations_to_target)
+
+
+class RunBenchmarkTest(unittest.TestCase):
+
+    def setUp(self):
+        for name, value in (('WORKER_COUNT', 1), ('EVAL_STORE_ENABLED', False), ('TRACE_ENABLED', False)):
+            patch = mock.patch.object(teste, name, value)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_runs_are_reproducible_and_engines_differ(self):
+        first = benchmark.run_benchmark('esfera', 'ga', 0, evaluations=80, seconds=30)
+        again = benchmark.run_benchmark('esfera', 'ga', 0, evaluations=80, seconds=30)
+        hybrid = benchmark.run_benchmark('esfera', 'hybrid', 0, evaluations=80, seconds=30)
+        self.assertEqual(first['evaluations'], 80)
+        self.assertEqual(first['curve'][-1][::2], again['curve'][-1][::2])
+        self.assertNotEqual([point[::2] for point in first['curve']],
+                            [point[::2] for point in hybrid['curve']])
+        self.assertGreater(first['overhead_per_evaluation'], 0)
+
+    def test_executable_backend(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            run = benchmark.run_benchmark('interacao', 'ps', 0, 'executable', evaluations=5, seconds=30,
+                                          workdir=workdir)
+        self.assertEqual(run['evaluations'], 5)
+        self.assertEqual(run['failures'], 0)
+
+    def test_unknown_engine_is_rejected(self):
+        with mock.patch('sys.stderr'), self.assertRaises(SystemExit):
+            benchmark.main(['--engines', 'sa'])
+
+
+if __name__ == '__main__':
+    unittest.main()
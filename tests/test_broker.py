@@ -0,0 +1,205 @@
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import broker
+import teste
+
+
+class FakeAgent:
+    """
+    Agente controlado pelo teste: recebe os jobs e responde (ou some) quando mandado.
+    Com 'heartbeat' avisa o broker a cada 0,2 s de que continua vivo.
+    """
+
+    def __init__(self, address, name, slots=1, heartbeat=True):
+        self.connection = broker.MessageConnection(socket.create_connection(address))
+        self.connection.sock.settimeout(5)
+        self._messages = self.connection.messages()
+        self.connection.send({'type': 'hello', 'name': name, 'slots': slots})
+        self._stop = threading.Event()
+        if heartbeat:
+            threading.Thread(target=self._heartbeat, daemon=True).start()
+
+    def _heartbeat(self):
+        while not self._stop.wait(0.2):
+            try:
+                self.connection.send({'type': 'heartbeat'})
+            except OSError:
+                return
+
+    def next_job(self):
+        for message in self._messages:
+            if message.get('type') == 'job':
+                return message
+        raise AssertionError("conexão encerrada sem job")
+
+    def reply(self, job, fitness, status='ok'):
+        self.connection.send({'type': 'result', 'id': job['id'], 'fitness': fitness, 'status': status,
+                              'value': fitness, 'wall_time': 0.01})
+
+    def close(self):
+        self._stop.set()
+        self.connection.close()
+
+
+class BrokerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.broker = broker.EvaluationBroker('127.0.0.1', 0, agent_timeout=1.0, executable_hash='abc')
+        self.broker.start()
+        self.address = ('127.0.0.1', self.broker.port)
+        self.agents = []
+
+    def tearDown(self):
+        for agent in self.agents:
+            agent.close()
+        self.broker.stop()
+
+    def connect_agent(self, name, heartbeat=True):
+        agent = FakeAgent(self.address, name, heartbeat=heartbeat)
+        self.agents.append(agent)
+        count = len(self.agents)
+        deadline = time.time() + 5
+        while len(self.broker.agents) < count and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.broker.agents), count)
+        return agent
+
+    def submit(self, params, limit=5.0):
+        """Avalia em outra thread como um worker; retorna a thread e a lista do resultado."""
+        outcome = []
+
+        def run():
+            client = broker.BrokerClient(self.address)
+            try:
+                outcome.extend(client.evaluate([{'params': params, 'objective_multiplier': 1,
+                                                 'limit': limit, 'capped': False}]))
+            except ConnectionError as e:
+                outcome.append(e)
+            finally:
+                client.close()
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread, outcome
+
+    def test_submit_returns_agent_result(self):
+        agent = self.connect_agent('a')
+        thread, outcome = self.submit([1, 'x'])
+        job = agent.next_job()
+        self.assertEqual(job['params'], [1, 'x'])
+        self.assertEqual(job['limit'], 5.0)
+        agent.reply(job, 42.0)
+        thread.join(5)
+        self.assertEqual(outcome[0]['fitness'], 42.0)
+        self.assertEqual(outcome[0]['agent'], 'a')
+
+    def test_lost_agent_job_is_redispatched(self):
+        first = self.connect_agent('a')
+        thread, outcome = self.submit([2])
+        job = first.next_job()
+        second = self.connect_agent('b')
+        first.close()
+        redispatched = second.next_job()
+        self.assertEqual(redispatched['params'], [2])
+        self.assertEqual(redispatched['id'], job['id'])
+        second.reply(redispatched, 7.0)
+        thread.join(5)
+        self.assertEqual(outcome[0]['fitness'], 7.0)
+        self.assertEqual(outcome[0]['agent'], 'b')
+        self.assertEqual(self.broker.redispatched, 1)
+
+    def test_silent_agent_is_lost_after_timeout(self):
+        first = self.connect_agent('a', heartbeat=False)
+        thread, outcome = self.submit([3])
+        first.next_job()  # Não responde nem manda heartbeat
+        second = self.connect_agent('b')
+        second.reply(second.next_job(), 1.0)
+        thread.join(5)
+        self.assertEqual(outcome[0]['agent'], 'b')
+        self.assertFalse(self.broker.agents[0].connected)
+
+    def test_max_dispatches_returns_no_fitness(self):
+        self.broker.max_dispatches = 1
+        with mock.patch.object(teste, '_broker_address', self.address), \
+                mock.patch.object(teste, '_eval_metrics', None), \
+                mock.patch.object(teste, '_trace_writer', None):
+            agent = self.connect_agent('a')
+            outcome = []
+
+            def run():
+                outcome.append(teste.run_remote_batch([[4]], 1))
+                teste.get_broker_client().close()
+
+            thread = threading.Thread(target=run, daemon=True)
+            thread.start()
+            agent.next_job()
+            agent.close()
+            thread.join(5)
+        # Sem fitness: evaluate() não memoiza a configuração
+        self.assertEqual(outcome, [[None]])
+
+
+    def test_closed_worker_jobs_leave_queue(self):
+        client = broker.BrokerClient(self.address)
+        client.connection.send({'type': 'submit', 'id': 1, 'params': [5], 'objective_multiplier': 1,
+                                'limit': 1.0, 'capped': False})
+        deadline = time.time() + 5
+        while not self.broker.pending and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.broker.pending), 1)
+        self.assertIn("1 na fila", self.broker.status_line())
+        client.close()
+        while self.broker.pending and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.broker.pending), 0)
+
+    def test_executable_mismatch_warns(self):
+        connection = broker.MessageConnection(socket.create_connection(self.address))
+        self.addCleanup(connection.close)
+        with mock.patch('builtins.print') as printed:
+            connection.send({'type': 'hello', 'name': 'outro', 'slots': 2, 'executable_hash': 'xyz'})
+            deadline = time.time() + 5
+            while not self.broker.agents and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(self.broker.agents[0].slots, 2)
+        self.assertTrue(any("diferente do local" in str(call) for call in printed.call_args_list))
+
+class BrokerClientTimeoutTest(unittest.TestCase):
+
+    def test_unresponsive_broker_raises(self):
+        server = socket.create_server(('127.0.0.1', 0))
+        self.addCleanup(server.close)
+        client = broker.BrokerClient(server.getsockname(), agent_timeout=0.1)
+        self.addCleanup(client.close)
+        started = time.time()
+        with self.assertRaises(ConnectionError):
+            client.evaluate([{'params': [1], 'objective_multiplier': 1, 'limit': 0.1, 'capped': False}])
+        self.assertLess(time.time() - started, 5)
+
+    def test_queued_jobs_wait_for_agent(self):
+        evaluation_broker = broker.EvaluationBroker('127.0.0.1', 0, heartbeat_interval=0.05)
+        evaluation_broker.start()
+        self.addCleanup(evaluation_broker.stop)
+        client = broker.BrokerClient(('127.0.0.1', evaluation_broker.port), agent_timeout=0.1)
+        self.addCleanup(client.close)
+        outcome = []
+        thread = threading.Thread(target=lambda: outcome.extend(client.evaluate(
+            [{'params': [1], 'objective_multiplier': 1, 'limit': 0.1, 'capped': False}])), daemon=True)
+        thread.start()
+        time.sleep(1.0)  # Bem além do prazo do cliente: só os heartbeats da fila o mantêm
+        agent = FakeAgent(('127.0.0.1', evaluation_broker.port), 'a')
+        self.addCleanup(agent.close)
+        agent.reply(agent.next_job(), 3.0)
+        thread.join(5)
+        self.assertEqual(outcome[0]['fitness'], 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
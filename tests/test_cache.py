@@ -0,0 +1,61 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+class EvaluationCacheTest(unittest.TestCase):
+
+    def test_least_recently_used_is_evicted(self):
+        cache = teste.EvaluationCache(2)
+        cache.put((1,), 1.0)
+        cache.put((2,), 2.0)
+        self.assertEqual(cache.get((1,)), 1.0)  # (2,) passa a ser o menos usado
+        cache.put((3,), 3.0)
+        self.assertIsNone(cache.get((2,)))
+        self.assertEqual(cache.get((1,)), 1.0)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'evictions': 1, 'size': 2,
+                                         'preloaded': 0, 'stored': 0})
+
+    def test_failures_lists_failed_keys(self):
+        cache = teste.EvaluationCache(10)
+        cache.put((1,), -float('inf'))
+        cache.put((2,), 0.5)
+        self.assertEqual(cache.failures(), [(1,)])
+
+
+class SharedCacheTest(unittest.TestCase):
+
+    def test_workers_do_not_repeat_a_configuration(self):
+        manager = teste.TuningManager()
+        manager.start()
+        self.addCleanup(manager.shutdown)
+        cache = manager.EvaluationCache(10)
+        with mock.patch.object(teste, 'run_objective', return_value=4.0) as run, \
+                mock.patch.object(teste, '_objective', object()), \
+                mock.patch.object(teste, '_eval_cache', cache), \
+                mock.patch.object(teste, '_constraints', None), \
+                mock.patch.object(teste, '_failure_regions', None), \
+                mock.patch.object(teste, '_budget_param', None), \
+                mock.patch.object(teste, '_surrogate', None):
+            self.assertEqual(teste.evaluate([1, 'a'], 1.0), 4.0)
+            self.assertEqual(teste.evaluate_population([[1, 'a'], [2, 'a'], [2, 'a']], 1.0), [4.0] * 3)
+        # Uma execução para [1, 'a'] e uma para [2, 'a'], repetido na mesma população
+        self.assertEqual(run.call_count, 2)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_cache_can_be_disabled(self):
+        with mock.patch.object(teste, 'CACHE_ENABLED', False), \
+                mock.patch.object(teste, 'WORKER_COUNT', 1), redirect_stdout(io.StringIO()) as out:
+            teste.tune([{'type': 'int', 'min': 0, 'max': 1}], lambda params: params[0],
+                       time_limit_minutes=0.005, algorithm='ps')
+        self.assertIn("Cache de Avaliações: desativado", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+def publish(channel, values):
+    for value in values:
+        channel.put(value, [value])
+
+
+class ImprovementChannelTest(unittest.TestCase):
+
+    def test_only_global_improvements_are_queued(self):
+        channel = teste.ImprovementChannel()
+        self.assertTrue(channel.put(2.0, [1]))
+        self.assertFalse(channel.put(1.0, [2]))
+        self.assertFalse(channel.put(2.0, [3]))
+        self.assertTrue(channel.put(5.0, [4]))
+        self.assertEqual(channel.best_fitness(), 5.0)
+        self.assertEqual(channel.get(timeout=1), (2.0, [1]))
+        self.assertEqual(channel.get(timeout=1), (5.0, [4]))
+        with self.assertRaises(queue.Empty):
+            channel.get(timeout=0.05)
+
+    def test_seed_filters_without_publishing(self):
+        channel = teste.ImprovementChannel()
+        channel.seed(3.0)
+        self.assertFalse(channel.put(2.0, [1]))
+        with self.assertRaises(queue.Empty):
+            channel.get(timeout=0.05)
+
+    def test_monitor_wakes_on_worker_improvement(self):
+        channel = teste.ImprovementChannel()
+        worker = multiprocessing.Process(target=publish, args=(channel, [1.0, 0.5, 4.0]))
+        worker.start()
+        self.addCleanup(worker.join)
+        started = time.time()
+        received = [channel.get(timeout=5), channel.get(timeout=5)]
+        self.assertEqual(received, [(1.0, [1.0]), (4.0, [4.0])])
+        self.assertLess(time.time() - started, 5)
+
+    def test_report_without_channel_is_ignored(self):
+        with mock.patch.object(teste, '_improvement_channel', None):
+            teste.report_improvement(1.0, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
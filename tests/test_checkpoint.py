@@ -0,0 +1,84 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+SPACE = [{'type': 'int', 'min': 0, 'max': 20}, {'type': 'cat', 'options': ['a', 'b']}]
+
+
+def quadratic(params):
+    return -(params[0] - 7) ** 2 + (1 if params[1] == 'b' else 0)
+
+
+class CheckpointFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        patcher = mock.patch.object(teste, 'CHECKPOINT_DIR', os.path.join(self.directory.name, 'ck'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_round_trip(self):
+        state = {'base_individual': [3, 'b'], 'base_fitness': -float('inf'), 'steps': {0: 2},
+                 'random': teste.random.getstate()}
+        teste.save_checkpoint('busca_0', state)
+        self.assertEqual(teste.load_checkpoint('busca_0'), state)
+        self.assertEqual(os.listdir(teste.CHECKPOINT_DIR), ['busca_0.pkl'])
+
+    def test_missing_and_unreadable(self):
+        self.assertIsNone(teste.load_checkpoint('nada'))
+        os.makedirs(teste.CHECKPOINT_DIR)
+        with open(teste.checkpoint_path('corrompido'), 'wb') as f:
+            f.write(b'nao e pickle')
+        with redirect_stderr(io.StringIO()):
+            self.assertIsNone(teste.load_checkpoint('corrompido'))
+
+    def test_clear_removes_only_checkpoints(self):
+        teste.save_checkpoint('tpe', {'x': 1})
+        other = os.path.join(teste.CHECKPOINT_DIR, 'notas.txt')
+        open(other, 'w').close()
+        teste.clear_checkpoints()
+        self.assertEqual(os.listdir(teste.CHECKPOINT_DIR), ['notas.txt'])
+
+
+class TuneCheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        for name, value in (('WORKER_COUNT', 2), ('CHECKPOINT_DIR', os.path.join(self.directory.name, 'padrao'))):
+            patcher = mock.patch.object(teste, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tune(self, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return teste.tune(SPACE, quadratic, time_limit_minutes=0.02, **kwargs)
+
+    def test_tune_without_directory_writes_no_checkpoint(self):
+        self.assertIsNotNone(self.tune())
+        self.assertFalse(os.path.exists(teste.CHECKPOINT_DIR))
+
+    def test_tune_checkpoints_are_keyed_by_configuration(self):
+        self.tune(checkpoint_dir=self.directory.name)
+        self.tune(checkpoint_dir=self.directory.name, algorithm='ga')
+        runs = [entry for entry in os.listdir(self.directory.name) if entry != 'padrao']
+        self.assertEqual(len(runs), 2)
+        for run in runs:
+            manifest = os.path.join(self.directory.name, run, f"{teste.CHECKPOINT_MANIFEST}.pkl")
+            self.assertTrue(os.path.exists(manifest))
+
+    def test_resume_requires_directory(self):
+        with self.assertRaises(ValueError):
+            teste.tune(SPACE, quadratic, resume=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
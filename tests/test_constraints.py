@@ -0,0 +1,99 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+def small_product(params):
+    return params[0] * params[1] <= 20
+
+
+class ConstraintSetTest(unittest.TestCase):
+
+    def test_expressions(self):
+        constraints = teste.ConstraintSet(['p1 <= p2', 'math.sqrt(p2) < 3'])
+        self.assertTrue(constraints.allows([2, 4]))
+        self.assertFalse(constraints.allows([5, 4]))
+        self.assertFalse(constraints.allows([2, 9]))
+        # Erro ao avaliar a expressão conta como violação
+        self.assertFalse(teste.ConstraintSet(['p3 > 0']).allows([1, 2]))
+
+    def test_invalid_expression_raises(self):
+        with self.assertRaises(ValueError):
+            teste.ConstraintSet(['p1 <'])
+
+    def test_forbidden_configurations_compare_as_text(self):
+        constraints = teste.ConstraintSet(forbidden=[{1: 'a', 2: 3}])
+        self.assertFalse(constraints.allows(['a', 3]))
+        self.assertTrue(constraints.allows(['a', 4]))
+        self.assertTrue(constraints.allows(['b', 3]))
+
+    def test_predicate_function_and_reference(self):
+        self.assertFalse(teste.ConstraintSet(predicate=small_product).allows([5, 5]))
+        by_name = teste.ConstraintSet(predicate=f"{__name__}:small_product")
+        self.assertTrue(by_name.allows([4, 5]))
+        self.assertFalse(by_name.allows([5, 5]))
+
+    def test_budget_is_inserted_at_its_position(self):
+        budget_param = (1, {'type': 'budget', 'min': 1, 'max': 100})
+        constraints = teste.ConstraintSet(['p2 <= 50 or p1 == 0'], budget_param=budget_param)
+        self.assertFalse(constraints.allows([1]))            # Fidelidade total: p2 = 100
+        self.assertTrue(constraints.allows([1], budget=10))
+        self.assertTrue(constraints.allows([0]))
+
+    def test_empty_set_is_falsy(self):
+        self.assertFalse(teste.ConstraintSet())
+        self.assertIsNone(teste.build_constraints({}, None))
+
+
+class FailureRegionsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.definitions = [{'type': 'int', 'min': 0, 'max': 100}, {'type': 'cat', 'options': ['a', 'b']}]
+        self.log = teste.FailureLog()
+        self.regions = teste.FailureRegions(self.definitions, self.log)
+        patches = [mock.patch.object(teste, '_failure_regions', self.regions),
+                   mock.patch.object(teste, '_eval_cache', None),
+                   mock.patch.object(teste, '_constraints', None),
+                   mock.patch.object(teste, '_budget_param', None),
+                   mock.patch.object(teste, '_surrogate', None)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def evaluate_with(self, params, result):
+        with mock.patch.object(teste, 'run_executable', return_value=result):
+            teste.evaluate(params, 1.0)
+
+    def test_only_genuine_failures_are_learned(self):
+        self.evaluate_with([10, 'a'], teste.AdaptiveTimeoutFitness(-float('inf')))
+        self.evaluate_with([11, 'a'], None)                       # Executável ausente
+        self.evaluate_with([12, 'a'], teste.CappedFitness(-2.0))
+        self.evaluate_with([13, 'a'], 4.0)
+        self.assertEqual(self.log.count(), 0)
+        self.evaluate_with([14, 'a'], -float('inf'))
+        self.assertEqual(self.log.since(0), [(14, 'a')])
+
+    def test_rejected_candidates_are_not_learned(self):
+        with mock.patch.object(teste, '_constraints', teste.ConstraintSet(['p1 < 50'])), \
+                mock.patch.object(teste, 'run_executable') as run:
+            self.assertEqual(teste.evaluate([60, 'a'], 1.0), -float('inf'))
+        run.assert_not_called()
+        self.assertEqual(self.log.count(), 0)
+
+    def test_region_needs_enough_nearby_failures(self):
+        self.log.add((50, 'a'))
+        self.log.add((52, 'a'))
+        self.assertTrue(self.regions.is_failure_prone([51, 'a']))
+        self.assertFalse(self.regions.is_failure_prone([51, 'b']))   # Outra categoria
+        self.assertFalse(self.regions.is_failure_prone([80, 'a']))
+
+    def test_learning_is_opt_in(self):
+        self.assertFalse(teste.FAILURE_LEARNING)
+
+
+if __name__ == '__main__':
+    unittest.main()
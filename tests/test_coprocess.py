@@ -0,0 +1,111 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+# Modelo de mentira: o valor é o dobro do parâmetro; 7 imprime lixo, 13 derruba o
+# processo e 99 trava. '--short' (só no lote) devolve uma linha a menos.
+MODEL = '''#!{python}
+import sys, time
+
+def answer(line):
+    x = int(line.split()[0])
+    if x == 13:
+        sys.exit(1)
+    if x == 99:
+        time.sleep(30)
+    return "lixo" if x == 7 else f"Resultado: {{2 * x}}"
+
+if '--serve' in sys.argv:
+    for line in sys.stdin:
+        print(answer(line), flush=True)
+elif '--batch' in sys.argv:
+    lines = sys.stdin.read().splitlines()
+    if '--short' in sys.argv:
+        lines = lines[:-1]
+    print("\\n".join(answer(line) for line in lines))
+else:
+    print(answer(" ".join(sys.argv[1:])))
+'''
+
+
+class ExecutableProtocolTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "modelo.py")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(MODEL.format(python=sys.executable))
+        os.chmod(path, 0o755)
+        self.thread_state = threading.local()
+        patches = [mock.patch.object(teste, 'EXECUTABLE_PATH', path),
+                   mock.patch.object(teste, 'EVAL_TIMEOUT_SECONDS', 2),
+                   mock.patch.object(teste, '_thread_state', self.thread_state),
+                   mock.patch.object(teste, '_objective', None),
+                   mock.patch.object(teste, '_broker_address', None),
+                   mock.patch.object(teste, '_eval_metrics', None),
+                   mock.patch.object(teste, '_trace_writer', None)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.stop_coprocess)
+
+    def stop_coprocess(self):
+        coprocess = getattr(self.thread_state, 'coprocess', None)
+        if coprocess is not None:
+            coprocess.stop()
+
+    def run_batch(self, mode, population, multiplier=1.0):
+        with mock.patch.object(teste, 'EXECUTION_MODE', mode), redirect_stderr(io.StringIO()) as err:
+            fitnesses = teste.run_executable_batch(population, multiplier)
+        return fitnesses, err.getvalue()
+
+    def test_coprocess_stays_alive_between_requests(self):
+        self.assertEqual(self.run_batch('coprocess', [[1], [2]])[0], [2.0, 4.0])
+        pid = self.thread_state.coprocess.process.pid
+        self.assertEqual(self.run_batch('coprocess', [[3]], -1.0)[0], [-6.0])
+        self.assertEqual(self.thread_state.coprocess.process.pid, pid)
+
+    def test_coprocess_crash_fails_only_that_item(self):
+        fitnesses, err = self.run_batch('coprocess', [[1], [13], [3]])
+        self.assertEqual(fitnesses, [2.0, -float('inf'), 6.0])
+        self.assertIn("terminou inesperadamente", err)
+        self.assertEqual(self.thread_state.coprocess.restarts, 1)
+
+    def test_coprocess_timeout(self):
+        with mock.patch.object(teste, 'EVAL_TIMEOUT_SECONDS', 0.3):
+            fitnesses, err = self.run_batch('coprocess', [[99], [4]])
+        self.assertEqual(fitnesses, [-float('inf'), 8.0])
+        self.assertIn("Timeout ao avaliar [99]", err)
+
+    def test_batch_invalid_output(self):
+        fitnesses, err = self.run_batch('batch', [[1], [7]])
+        self.assertEqual(fitnesses, [2.0, -float('inf')])
+        self.assertIn("Saída inválida: 'lixo'", err)
+
+    def test_batch_with_missing_lines_falls_back_to_oneshot(self):
+        with mock.patch.object(teste, 'BATCH_ARGS', ['--batch', '--short']):
+            fitnesses, err = self.run_batch('batch', [[1], [2], [5]])
+        self.assertEqual(fitnesses, [2.0, 4.0, 10.0])
+        self.assertIn("esperadas 3 linhas, recebidas 2", err)
+
+
+class ParseOutputTest(unittest.TestCase):
+
+    def test_labelled_and_bare_values(self):
+        self.assertEqual(teste.parse_output("Resultado: 1.5\n"), 1.5)
+        self.assertEqual(teste.parse_output(" -2 "), -2.0)
+        with self.assertRaises(ValueError):
+            teste.parse_output("erro")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import random
+import sys
+import unittest
+from collections import Counter
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+class InitialDesignTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(7)
+        for name in ('_constraints', '_failure_regions'):
+            patch = mock.patch.object(teste, name, None)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_latin_hypercube_has_one_point_per_stratum(self):
+        points = teste.latin_hypercube(10, 3)
+        for d in range(3):
+            self.assertEqual(sorted(int(point[d] * 10) for point in points), list(range(10)))
+
+    def test_lhs_design_covers_every_integer_once(self):
+        definitions = [{'type': 'int', 'min': 0, 'max': 9}, {'type': 'int', 'min': 100, 'max': 109}]
+        design = teste.generate_initial_design(definitions, 10, 'lhs')
+        self.assertEqual(sorted(individual[0] for individual in design), list(range(10)))
+        self.assertEqual(sorted(individual[1] for individual in design), list(range(100, 110)))
+
+    def test_halton_is_low_discrepancy(self):
+        points = teste.scrambled_halton(8, 2)
+        self.assertTrue(all(0 <= value < 1 for point in points for value in point))
+        # Base 2: os 7 primeiros pontos caem em oitavos distintos; base 3, os 8 em nonos distintos
+        self.assertEqual(sorted(int(point[0] * 8) for point in points[:7]), list(range(1, 8)))
+        self.assertEqual(sorted(round(point[1] * 9) for point in points), list(range(1, 9)))
+
+    def test_categories_are_balanced(self):
+        definitions = [{'type': 'cat', 'options': ['a', 'b', 'c']}, {'type': 'int', 'min': 0, 'max': 99}]
+        for method in ('lhs', 'halton'):
+            design = teste.generate_initial_design(definitions, 9, method)
+            self.assertEqual(Counter(individual[0] for individual in design), {'a': 3, 'b': 3, 'c': 3})
+
+    def test_worker_slices_do_not_overlap(self):
+        definitions = [{'type': 'cat', 'options': ['a', 'b', 'c']},
+                       {'type': 'cat', 'options': ['x', 'y', 'z']}]
+        design = teste.generate_initial_design(definitions, 6, 'lhs')
+        slices = [design[i * 2:(i + 1) * 2] for i in range(3)]
+        seen = set()
+        for worker_points in slices:
+            keys = {tuple(individual) for individual in worker_points}
+            self.assertFalse(keys & seen)
+            seen |= keys
+        self.assertEqual(len(seen), 6)
+
+    def test_random_is_the_default(self):
+        definitions = [{'type': 'int', 'min': 0, 'max': 9}]
+        with mock.patch.object(teste, 'latin_hypercube') as lhs, \
+                mock.patch.object(teste, 'scrambled_halton') as halton:
+            design = teste.generate_initial_design(definitions, 5)
+        self.assertEqual(len(design), 5)
+        lhs.assert_not_called()
+        halton.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
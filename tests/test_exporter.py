@@ -0,0 +1,114 @@
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+import unittest
+import urllib.error
+import urllib.request
+from contextlib import redirect_stderr, redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import exporter
+import teste
+
+
+class LatencyHistogramTest(unittest.TestCase):
+
+    def test_percentile_interpolates_inside_bucket(self):
+        histogram = [0.0] * (len(exporter.LATENCY_BUCKET_BOUNDS) + 1)
+        histogram[10] = 4
+        lower, upper = exporter.LATENCY_BUCKET_BOUNDS[9], exporter.LATENCY_BUCKET_BOUNDS[10]
+        self.assertAlmostEqual(exporter.latency_percentile(histogram, 0.5), (lower + upper) / 2)
+        self.assertEqual(exporter.latency_percentile([0.0] * len(histogram), 0.5), 0.0)
+
+    def test_format_latency(self):
+        self.assertEqual(exporter.format_latency(0.0123), "12.3ms")
+        self.assertEqual(exporter.format_latency(2.5), "2.50s")
+        self.assertEqual(exporter.format_latency(0.000042), "42µs")
+
+
+class TraceWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_flush_appends_one_line_per_entry(self):
+        path = os.path.join(self.directory.name, 'trace.jsonl')
+        writer = exporter.TraceWriter(path, flush_interval=60)
+        writer.record({'params': [1, 'a'], 'value': 2.0})
+        writer.record({'params': [2, 'b'], 'value': None})
+        writer.flush()
+        writer.flush()  # Nada pendente: não grava de novo
+        with open(path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual([entry['params'] for entry in entries], [[1, 'a'], [2, 'b']])
+
+    def test_background_flush_reports_write_errors(self):
+        path = os.path.join(self.directory.name, 'nao', 'existe', 'trace.jsonl')
+        writer = exporter.TraceWriter(path, flush_interval=0.05)
+        errors = io.StringIO()
+        with redirect_stderr(errors):
+            writer.record({'value': 1})
+            deadline = time.time() + 5
+            while "Falha ao gravar o trace" not in errors.getvalue() and time.time() < deadline:
+                time.sleep(0.02)
+        self.assertIn("Falha ao gravar o trace", errors.getvalue())
+
+
+class MetricsExporterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = teste.EvaluationMetrics(1)
+        self.metrics.attach()
+        self.metrics.record(0.2)
+        self.metrics.record(0.4, 'timeout')
+        now = time.time()
+        self.exporter = exporter.MetricsExporter(self.metrics, 'ps', now - 10, now + 50, port=0)
+        self.addCleanup(self.exporter.stop)
+
+    def test_render(self):
+        self.exporter.best_value = 3.5
+        text = self.exporter.render()
+        self.assertIn('autotune_evaluations_total{algorithm="ps"} 2', text)
+        self.assertIn('autotune_failures_total{algorithm="ps",status="timeout"} 1', text)
+        self.assertIn('autotune_best_value{algorithm="ps"} 3.5', text)
+        self.assertIn('# TYPE autotune_latency_seconds gauge', text)
+
+    def test_http_endpoint(self):
+        with redirect_stdout(io.StringIO()):
+            self.exporter.start()
+        base = f"http://127.0.0.1:{self.exporter.port}"
+        with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+            self.assertEqual(response.status, 200)
+            self.assertIn(b'autotune_evaluations_total', response.read())
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{base}/outra", timeout=5)
+        self.assertEqual(error.exception.code, 404)
+
+    def test_port_in_use_is_reported(self):
+        busy = socket.create_server(('127.0.0.1', 0))
+        self.addCleanup(busy.close)
+        self.exporter.port = busy.getsockname()[1]
+        with redirect_stdout(io.StringIO()) as out:
+            self.exporter.start()
+        self.assertIn("Não foi possível abrir a porta", out.getvalue())
+
+    def test_textfile_is_replaced_and_errors_reported(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.exporter.textfile_path = os.path.join(directory, 'autotune.prom')
+            self.exporter.write_textfile()
+            with open(self.exporter.textfile_path, encoding='utf-8') as f:
+                self.assertIn('autotune_evaluations_total', f.read())
+            self.assertEqual(os.listdir(directory), ['autotune.prom'])
+        self.exporter.textfile_path = os.path.join(directory, 'apagado', 'autotune.prom')
+        with redirect_stderr(io.StringIO()) as errors:
+            self.exporter.write_textfile()
+        self.assertIn("Falha ao gravar as métricas", errors.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+DEFINITIONS = [{'type': 'int', 'min': 0, 'max': 100}, {'type': 'cat', 'options': ['a', 'b', 'c']},
+               {'type': 'float', 'min': -1.0, 'max': 1.0}]
+
+
+class GenomeOperatorsTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(11)
+        self.bounds = teste.gene_bounds(DEFINITIONS)
+        for name in ('_constraints', '_failure_regions', '_surrogate', '_profile_metrics'):
+            patch = mock.patch.object(teste, name, None)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def assert_within_bounds(self, genomes):
+        for genome in genomes:
+            self.assertEqual(len(genome), len(self.bounds))
+            for value, (low, high, _, _) in zip(genome, self.bounds):
+                self.assertTrue(low <= value <= high, (genome, low, high))
+
+    def test_mutation_stays_within_bounds(self):
+        population = teste.random_genomes(200, self.bounds)
+        mutated = teste.mutate_population(population, self.bounds, 1.0)
+        self.assert_within_bounds(mutated)
+        self.assertNotEqual(mutated, population)
+
+    def test_mutation_rate_is_respected(self):
+        population = [(50, 1, 0.0)] * 1000
+        mutated = teste.mutate_population(population, self.bounds, 0.1)
+        self.assertIs(teste.mutate_population(population, self.bounds, 0), population)
+        # Genes sorteados em média 10% das vezes; um sorteio pode manter o valor
+        changed = sum(a != b for old, new in zip(population, mutated) for a, b in zip(old, new))
+        self.assertTrue(150 < changed < 350, changed)
+
+    def test_crossover_combines_parent_prefix_and_suffix(self):
+        population = [(1, 1, 1.0), (2, 2, 0.5)]
+        children = teste.crossover_population(population, [0, 1] * 20, 20)
+        for child in children:
+            point = next((i for i, gene in enumerate(child) if gene != population[0][i]), 3)
+            self.assertEqual(child, population[0][:point] + population[1][point:])
+            self.assertIn(point, (1, 2))
+        self.assertEqual(teste.crossover_population([(1,), (2,)], [1, 0], 1), [(2,)])
+
+    def test_evolve_keeps_elite_and_size(self):
+        population = teste.random_genomes(20, self.bounds)
+        fitnesses = [float(i) for i in range(20)]
+        evolved = teste.evolve_population(population, fitnesses, self.bounds, 20, 0.2, 2, DEFINITIONS)
+        self.assertEqual(len(evolved), 20)
+        self.assertEqual(evolved[:2], [population[19], population[18]])
+        self.assert_within_bounds(evolved)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+SPACE = [{'type': 'int', 'min': 0, 'max': 10}, {'type': 'budget', 'min': 1, 'max': 9}]
+
+
+def low_fidelity_is_pessimistic(params):
+    x, budget = params
+    return -(x - 3) ** 2 - 1.0 / budget
+
+
+class BudgetScheduleTest(unittest.TestCase):
+
+    def test_budgets_divide_by_eta(self):
+        self.assertEqual(teste.hyperband_budgets({'min': 1, 'max': 27}, 3), [1, 3, 9, 27])
+        self.assertEqual(teste.hyperband_budgets({'min': 2, 'max': 20}, 3), [2, 7, 20])
+        self.assertEqual(teste.hyperband_budgets({'min': 5, 'max': 5}, 3), [5])
+
+    def test_promotes_top_fraction_once(self):
+        halving = teste.SuccessiveHalving([1, 3, 9], 3)
+        for fitness, individual in ((1.0, [1]), (3.0, [3]), (2.0, [2])):
+            halving.report(0, individual, fitness)
+        self.assertEqual(halving.promotion(), (1, [3]))
+        self.assertIsNone(halving.promotion())
+
+    def test_failed_configurations_are_not_promoted(self):
+        halving = teste.SuccessiveHalving([1, 3], 3)
+        for individual in ([1], [2], [3]):
+            halving.report(0, individual, -float('inf'))
+        self.assertIsNone(halving.promotion())
+
+    def test_budget_is_split_from_the_space(self):
+        space = [{'type': 'cat', 'options': ['a']}, {'type': 'budget', 'min': 1, 'max': 9},
+                 {'type': 'int', 'min': 0, 'max': 1, 'condition': {'parent': 2, 'values': ['a']}}]
+        definitions, budget_param = teste.split_budget_parameter(space)
+        self.assertEqual(budget_param, (1, space[1]))
+        self.assertEqual(definitions[1]['condition']['parent'], 1)
+        self.assertEqual(teste.insert_budget(['a', 0], budget_param), ['a', 9, 0])
+        self.assertEqual(teste.insert_budget(['a', 0], budget_param, 3), ['a', 3, 0])
+
+    def test_invalid_budget_is_rejected(self):
+        with self.assertRaises(ValueError):
+            teste.validate_space([{'type': 'budget', 'min': 0, 'max': 9}])
+
+
+class HyperbandRunTest(unittest.TestCase):
+
+    def test_only_full_fidelity_results_are_reported(self):
+        with mock.patch.object(teste, 'WORKER_COUNT', 2), redirect_stdout(io.StringIO()) as out:
+            best_value, best_params = teste.tune(SPACE, low_fidelity_is_pessimistic, time_limit_minutes=0.02,
+                                                 algorithm='hyperband')
+        self.assertIn("orçamentos [1, 3, 9]", out.getvalue())
+        self.assertEqual(best_params, [3, 9])
+        self.assertAlmostEqual(best_value, -1.0 / 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
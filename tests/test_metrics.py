@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+class EvaluationMetricsSlotTest(unittest.TestCase):
+
+    def test_attach_skips_live_owner_and_reclaims_dead_one(self):
+        metrics = teste.EvaluationMetrics(2)
+        metrics._owners[0] = os.getppid()
+        metrics._owners[1] = dead_pid()
+        self.assertEqual(metrics.attach(), 1)
+        self.assertEqual(metrics._owners[1], os.getpid())
+
+    def test_attach_fails_when_all_slots_are_live(self):
+        metrics = teste.EvaluationMetrics(1)
+        metrics._owners[0] = os.getppid()
+        with self.assertRaises(RuntimeError):
+            metrics.attach()
+
+    def test_release_frees_slot_for_next_worker(self):
+        metrics = teste.EvaluationMetrics(1)
+        slot = metrics.attach()
+        metrics.record(0.5)
+        metrics.release(slot, os.getpid())
+        self.assertEqual(metrics._owners[slot], 0)
+        # Os contadores continuam somando com o próximo dono
+        metrics._owners[slot] = os.getppid()
+        self.assertEqual(metrics.snapshot()['evaluations'], 1)
+
+
+class WorkerOccupancyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = teste.EvaluationMetrics(2)
+        self.metrics.attach()
+        self.metrics.record(3.0)
+        self.metrics.add('phase_launch', 1.0)
+
+    def test_model_time_only_without_phase_profile(self):
+        with mock.patch.object(teste, 'PROFILE_PHASES', False):
+            self.assertEqual(teste.worker_occupancy(self.metrics, 10.0), (3.0, 20.0))
+
+    def test_optimizer_phases_count_as_busy_with_profile(self):
+        with mock.patch.object(teste, 'PROFILE_PHASES', True):
+            self.assertEqual(teste.worker_occupancy(self.metrics, 10.0), (4.0, 20.0))
+
+    def test_concurrent_polls_scale_capacity_and_clamp(self):
+        self.metrics.record(30.0)
+        with mock.patch.object(teste, 'PROFILE_PHASES', False):
+            self.assertEqual(teste.worker_occupancy(self.metrics, 10.0), (10.0, 20.0))
+            self.assertEqual(teste.worker_occupancy(self.metrics, 10.0, concurrency=4), (33.0, 80.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
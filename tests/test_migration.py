@@ -0,0 +1,81 @@
+import os
+import random
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+class FakeHub:
+    """Hub em memória: guarda o que a ilha enviou e entrega os imigrantes dados."""
+
+    def __init__(self, immigrants):
+        self.sent = []
+        self.immigrants = immigrants
+
+    def send(self, island_id, migrants):
+        self.sent.append((island_id, migrants))
+
+    def receive(self, island_id):
+        return list(self.immigrants)
+
+
+class MigrateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.population = [['a'], ['b'], ['c'], ['d'], ['e']]
+        self.fitnesses = [5.0, 1.0, 4.0, 2.0, 3.0]
+
+    def run_migrate(self, hub, replacement):
+        with mock.patch.object(teste, '_migration_hub', hub), \
+                mock.patch.object(teste, 'MIGRATION_COUNT', 2), \
+                mock.patch.object(teste, 'MIGRATION_REPLACEMENT', replacement):
+            teste.migrate(self.population, self.fitnesses, 0, elitism_count=2)
+
+    def test_sends_best_and_replaces_worst(self):
+        hub = FakeHub([(1.5, ['x']), (9.0, ['y']), (0.5, ['z'])])
+        self.run_migrate(hub, 'worst')
+        self.assertEqual(hub.sent, [(0, [(5.0, ['a']), (4.0, ['c'])])])
+        # O melhor imigrante substitui o pior residente; 1.5 não supera o 2.0 do segundo pior
+        self.assertEqual(self.population, [['a'], ['y'], ['c'], ['d'], ['e']])
+        self.assertEqual(self.fitnesses, [5.0, 9.0, 4.0, 2.0, 3.0])
+
+    def test_random_replacement_spares_elite(self):
+        hub = FakeHub([(0.0, ['x']), (0.0, ['y'])])
+        random.seed(1)
+        self.run_migrate(hub, 'random')
+        self.assertEqual(self.population[0], ['a'])
+        self.assertEqual(self.population[2], ['c'])
+        self.assertEqual(sorted(self.fitnesses).count(0.0), 2)
+
+    def test_without_hub_nothing_changes(self):
+        self.run_migrate(None, 'worst')
+        self.assertEqual(self.fitnesses, [5.0, 1.0, 4.0, 2.0, 3.0])
+
+
+class MigrationHubTest(unittest.TestCase):
+
+    def test_topologies(self):
+        self.assertEqual(teste.MigrationHub(4, 'ring').targets(3), [0])
+        self.assertEqual(teste.MigrationHub(3, 'all').targets(1), [0, 2])
+        self.assertEqual(teste.MigrationHub(1, 'ring').targets(0), [])
+
+    def test_migrants_reach_neighbour_inbox(self):
+        hub = teste.MigrationHub(3, 'ring')
+        hub.send(0, [(1.0, [7])])
+        received = []
+        deadline = time.time() + 5
+        while not received and time.time() < deadline:
+            received = hub.receive(1)
+        self.assertEqual(received, [(1.0, [7])])
+        self.assertEqual(hub.receive(2), [])
+
+    def test_islands_are_isolated_by_default(self):
+        self.assertIsNone(teste.MIGRATION_TOPOLOGY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import random
+import sys
+import time
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+class WelchTest(unittest.TestCase):
+
+    def test_t_quantile_matches_table(self):
+        for df, expected in ((10, 2.228), (30, 2.042), (1000, 1.962)):
+            self.assertAlmostEqual(teste.t_quantile(0.95, df), expected, delta=0.01)
+        self.assertEqual(teste.t_quantile(0.95, 0), float('inf'))
+
+    def test_sample_statistics(self):
+        mean, half_width = teste.sample_statistics([1.0, 2.0, 3.0, 4.0], confidence=0.95)
+        self.assertAlmostEqual(mean, 2.5)
+        stdev = 1.2909944487358056
+        self.assertAlmostEqual(half_width, teste.t_quantile(0.95, 3) * stdev / 2)
+        # Com 3 graus de liberdade a expansão fica a menos de 5% da tabela (3.182)
+        self.assertAlmostEqual(half_width, 3.182 * stdev / 2, delta=0.05 * half_width)
+        self.assertEqual(teste.sample_statistics([5.0]), (5.0, float('inf')))
+        self.assertEqual(teste.sample_statistics([1.0, -float('inf')]), (-float('inf'), 0.0))
+
+    def test_compare_samples(self):
+        with mock.patch.object(teste, 'NOISE_MIN_SAMPLES', 3), mock.patch.object(teste, 'NOISE_CONFIDENCE', 0.95):
+            low = [1.0, 1.1, 0.9, 1.05, 0.95]
+            high = [2.0, 2.1, 1.9, 2.05, 1.95]
+            self.assertEqual(teste.compare_samples(high, low), 1)
+            self.assertEqual(teste.compare_samples(low, high), -1)
+            # Diferença pequena diante do ruído: ainda indeciso
+            self.assertEqual(teste.compare_samples([1.0, 3.0, 2.0], [1.5, 2.5, 2.2]), 0)
+            # Poucas medições: indeciso mesmo com médias distantes
+            self.assertEqual(teste.compare_samples([10.0, 10.0], [1.0, 1.0]), 0)
+            # Falha de um lado decide na hora
+            self.assertEqual(teste.compare_samples([1.0], [-float('inf')]), 1)
+            self.assertEqual(teste.compare_samples([5.0, 5.0, 5.0], [4.0, 4.0, 4.0]), 1)
+
+
+class NoiseSamplesTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(teste, '_noise_samples', OrderedDict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_samples_start_with_known_fitness_and_are_shared(self):
+        samples = teste.noise_samples([1, 'a'], 2.0)
+        samples.append(3.0)
+        self.assertEqual(teste.noise_samples([1, 'a'], 99.0), [2.0, 3.0])
+
+    def test_least_recently_used_is_evicted(self):
+        with mock.patch.object(teste, 'CACHE_MAX_SIZE', 2):
+            teste.noise_samples([1], 1.0)
+            teste.noise_samples([2], 2.0)
+            teste.noise_samples([1], 1.0)  # [2] passa a ser o mais antigo
+            teste.noise_samples([3], 3.0)
+        self.assertEqual(list(teste._noise_samples), [(1,), (3,)])
+
+
+class SpikyObjective:
+    """Parábola com ruído pequeno e uma única medição muito otimista (chamada 'spike_at')."""
+
+    def __init__(self, spike_at):
+        self.spike_at = spike_at
+        self.calls = 0
+        self.rng = random.Random(0)
+
+    def __call__(self, params):
+        self.calls += 1
+        value = -(params[0] - 7) ** 2 + self.rng.gauss(0, 0.01)
+        return value + 100 if self.calls == self.spike_at else value
+
+
+class IncumbentRacingTest(unittest.TestCase):
+
+    def run_engine(self, engine, noise_handling):
+        objective = SpikyObjective(spike_at=12)  # Na primeira geração depois da inicial
+        patches = {'_objective': objective, '_eval_cache': None, '_eval_metrics': None,
+                   '_improvement_channel': None, '_trace_writer': None, '_constraints': None,
+                   '_failure_regions': None, '_surrogate': None, '_budget_param': None,
+                   '_noise_samples': OrderedDict(), 'NOISE_HANDLING': noise_handling}
+        for name, value in patches.items():
+            patcher = mock.patch.object(teste, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        random.seed(3)
+        definitions = [{'type': 'int', 'min': 0, 'max': 20}]
+        return engine(definitions, time.time() + 0.3, 1.0, population_size=10)
+
+    def test_single_noisy_sample_cannot_replace_ga_incumbent(self):
+        best_fitness, _ = self.run_engine(teste.run_genetic_algorithm, True)
+        self.assertLess(best_fitness, 1)
+
+    def test_without_noise_handling_the_spike_wins(self):
+        best_fitness, _ = self.run_engine(teste.run_genetic_algorithm, False)
+        self.assertGreater(best_fitness, 50)
+
+    def test_hybrid_and_memetic_race_too(self):
+        for engine in (teste.run_hybrid_algorithm, teste.run_memetic_algorithm):
+            with self.subTest(engine=engine.__name__):
+                best_fitness, _ = self.run_engine(engine, True)
+                self.assertLess(best_fitness, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
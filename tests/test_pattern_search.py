@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+def peak(params):
+    return -sum((value - 3) ** 2 for value in params if isinstance(value, (int, float)))
+
+
+class PatternSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        for name, value in (('_objective', peak), ('_eval_cache', None), ('_eval_metrics', None),
+                            ('_improvement_channel', None), ('_trace_writer', None), ('_surrogate', None),
+                            ('_budget_param', None), ('NOISE_HANDLING', False), ('PS_POLL_WORKERS', 1)):
+            patcher = mock.patch.object(teste, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        teste.init_feasibility(None, None)
+
+    def search(self, space, start):
+        space = teste.validate_space(space)
+        started = time.time()
+        fitness, individual = teste.run_pattern_search(start, space, time.time() + 10, 1)
+        return fitness, individual, time.time() - started
+
+    def test_converges_to_optimum(self):
+        fitness, individual, _ = self.search([{'type': 'int', 'min': 0, 'max': 10},
+                                              {'type': 'int', 'min': -5, 'max': 5}], [9, -4])
+        self.assertEqual(individual, [3, 3])
+        self.assertEqual(fitness, 0)
+
+    def test_terminates_when_axes_have_no_distinct_neighbour(self):
+        # Regressão: eixos sem vizinho distinto (intervalo de um valor, escala log no
+        # limite) faziam a busca girar até o fim do prazo
+        spaces = [
+            ([{'type': 'int', 'min': 5, 'max': 5}, {'type': 'int', 'min': 0, 'max': 10}], [5, 0]),
+            ([{'type': 'log-int', 'min': 1, 'max': 1000}], [1]),
+            ([{'type': 'float', 'min': 2, 'max': 2}], [2.0]),
+            ([{'type': 'cat', 'options': ['a']}, {'type': 'int', 'min': 3, 'max': 3}], ['a', 3]),
+        ]
+        for space, start in spaces:
+            with self.subTest(space=space):
+                _, _, elapsed = self.search(space, start)
+                self.assertLess(elapsed, 5)
+
+    def test_inactive_axes_do_not_block_termination(self):
+        space = [{'type': 'cat', 'options': ['off', 'on']},
+                 {'type': 'int', 'min': 0, 'max': 10, 'condition': {'parent': 0, 'values': ['on']}}]
+        _, _, elapsed = self.search(space, ['off', 0])
+        self.assertLess(elapsed, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+class SlowObjective:
+    """evaluate() de mentira: cada vizinho leva 'delay' segundos e vale o próprio número."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, neighbor, objective_multiplier):
+        with self._lock:
+            self.calls.append(neighbor)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return float(neighbor[0])
+
+
+class PollNeighborsTest(unittest.TestCase):
+
+    def poll(self, objective, workers, mode='complete', neighbors=([1], [4], [2], [3]), incumbent=0.0,
+             deadline=5.0):
+        with mock.patch.object(teste, 'PS_POLL_WORKERS', workers), \
+                mock.patch.object(teste, 'PS_POLL_MODE', mode), \
+                mock.patch.object(teste, '_poll_executor', None), \
+                mock.patch.object(teste, 'evaluate', objective):
+            try:
+                return teste.poll_neighbors(list(neighbors), incumbent, 1.0, time.time() + deadline)
+            finally:
+                if teste._poll_executor is not None:
+                    teste._poll_executor.shutdown(wait=False, cancel_futures=True)
+
+    def test_neighbours_are_evaluated_simultaneously(self):
+        objective = SlowObjective(0.2)
+        started = time.time()
+        self.assertEqual(self.poll(objective, 4), ([4], 4.0))
+        self.assertLess(time.time() - started, 0.6)
+        self.assertEqual(objective.peak, 4)
+
+    def test_opportunistic_stops_at_first_improvement(self):
+        objective = SlowObjective(0.0)
+        best = self.poll(objective, 1, 'opportunistic', incumbent=1.5)
+        self.assertEqual(best, ([4], 4.0))
+        self.assertEqual(objective.calls, [[1], [4]])
+
+    def test_deadline_returns_best_so_far(self):
+        objective = SlowObjective(1.0)
+        started = time.time()
+        self.assertEqual(self.poll(objective, 2, deadline=0.1), (None, -float('inf')))
+        self.assertLess(time.time() - started, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class PhaseTimingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = teste.EvaluationMetrics(1, main_slot=True)
+        self.metrics.attach_main()
+        patch = mock.patch.object(teste, '_profile_metrics', None)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_phases_are_summed_when_enabled(self):
+        with mock.patch.object(teste, 'PROFILE_PHASES', True):
+            teste.init_profiling(self.metrics)
+        started = teste.phase_start()
+        time.sleep(0.02)
+        teste.phase_end('selection', started)
+        main = self.metrics.slot_snapshot()[-1]
+        self.assertGreaterEqual(main['phase_selection'], 0.02)
+        self.assertEqual(main['phase_generation'], 0.0)
+        with redirect_stdout(io.StringIO()) as out:
+            teste.print_phase_profile(self.metrics)
+        self.assertIn("seleção", out.getvalue())
+        self.assertIn("Principal", out.getvalue())
+
+    def test_disabled_profile_costs_nothing(self):
+        with mock.patch.object(teste, 'PROFILE_PHASES', False):
+            teste.init_profiling(self.metrics)
+        self.assertIsNone(teste.phase_start())
+        teste.phase_end('selection', None)
+        self.assertEqual(self.metrics.snapshot()['phase_selection'], 0.0)
+
+
+class WorkerProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        patch = mock.patch.object(teste, 'PROFILE_DIR', self.directory)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_sampling_profile_is_written_and_summarized(self):
+        with mock.patch.object(teste, 'PROFILE_MODE', 'sampling'), mock.patch('multiprocessing.util.Finalize'):
+            profiler = teste.SamplingProfiler(interval=0.001)
+            with mock.patch.object(teste, 'SamplingProfiler', return_value=profiler):
+                teste.start_worker_profiler()
+            busy_loop(0.2)
+            teste.stop_worker_profiler()
+            with redirect_stdout(io.StringIO()) as out:
+                teste.print_profile_files()
+        self.assertEqual(os.listdir(self.directory), [f"worker_{os.getpid()}.folded"])
+        self.assertIn("busy_loop", out.getvalue())
+
+    def test_cprofile_mode_and_cleanup(self):
+        with mock.patch.object(teste, 'PROFILE_MODE', 'cprofile'), mock.patch('multiprocessing.util.Finalize'):
+            teste.start_worker_profiler()
+            busy_loop(0.01)
+            teste.stop_worker_profiler()
+            self.assertEqual(os.listdir(self.directory), [f"worker_{os.getpid()}.prof"])
+            teste.clear_profiles()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_no_files_is_reported(self):
+        with mock.patch.object(teste, 'PROFILE_MODE', 'sampling'), redirect_stdout(io.StringIO()) as out:
+            teste.print_profile_files()
+        self.assertIn("nenhum arquivo gravado", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
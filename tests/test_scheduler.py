@@ -0,0 +1,43 @@
+import io
+import os
+import sys
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+class FailingPool:
+    """Pool falso: toda busca lançada termina com exceção (callback em outra thread)."""
+
+    def __init__(self):
+        self.launches = 0
+
+    def apply_async(self, func, args=(), kwds=None, callback=None, error_callback=None):
+        self.launches += 1
+        threading.Thread(target=error_callback, args=(RuntimeError("falha no worker"),)).start()
+
+
+class MultiStartSchedulerTest(unittest.TestCase):
+
+    def test_failing_search_backs_off_and_gives_up(self):
+        pool = FailingPool()
+        definitions = [{'type': 'int', 'min': 0, 'max': 10}]
+        scheduler = teste.MultiStartScheduler(pool, definitions, time.time() + 60, 1)
+        errors = io.StringIO()
+        with mock.patch.object(teste, 'RESTART_FAILURE_BACKOFF', 0.01), \
+                mock.patch.object(teste, 'RESTART_MAX_FAILURES', 3), redirect_stderr(errors):
+            scheduler.start([[5]])
+            time.sleep(0.5)
+        self.assertEqual(pool.launches, 3)
+        self.assertEqual(scheduler.failures, 3)
+        self.assertIn("falha no worker", errors.getvalue())
+        self.assertIn("abandonado", errors.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
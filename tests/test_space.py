@@ -0,0 +1,82 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+class CoordinateTest(unittest.TestCase):
+
+    def test_values_round_trip_through_coordinates(self):
+        cases = [
+            ({'type': 'cat', 'options': ['x', 'y', 'z']}, ['x', 'y', 'z']),
+            ({'type': 'ord', 'options': ['1', '2', '4']}, ['1', '2', '4']),
+            ({'type': 'int', 'min': -3, 'max': 3}, range(-3, 4)),
+            ({'type': 'float', 'min': 0.0, 'max': 2.0}, [0.0, 0.25, 1.5, 2.0]),
+            ({'type': 'log-int', 'min': 1, 'max': 1000}, [1, 2, 3, 10, 99, 100, 999, 1000]),
+            ({'type': 'log-float', 'min': 1e-4, 'max': 1.0}, [1e-4, 3e-3, 0.5, 1.0]),
+        ]
+        for p_def, values in cases:
+            for value in values:
+                with self.subTest(p_type=p_def['type'], value=value):
+                    result = teste.from_coordinate(p_def, teste.to_coordinate(p_def, value))
+                    if isinstance(value, float):
+                        self.assertAlmostEqual(result, value)
+                    else:
+                        self.assertEqual(result, value)
+
+    def test_coordinates_are_clamped_to_bounds(self):
+        p_def = {'type': 'log-int', 'min': 1, 'max': 1000}
+        low, high, kind = teste.coordinate_bounds(p_def)
+        self.assertEqual(kind, 'float')
+        self.assertEqual(teste.from_coordinate(p_def, low - 5), 1)
+        self.assertEqual(teste.from_coordinate(p_def, high + 5), 1000)
+        self.assertEqual(teste.from_coordinate({'type': 'int', 'min': 0, 'max': 4}, 9.7), 4)
+
+    def test_genome_round_trip(self):
+        space = [{'type': 'cat', 'options': ['a', 'b']}, {'type': 'int', 'min': 0, 'max': 9},
+                 {'type': 'log-float', 'min': 0.01, 'max': 10.0}]
+        individual = ['b', 7, 0.5]
+        decoded = teste.decode_individual(teste.encode_individual(individual, space), space)
+        self.assertEqual(decoded[:2], ['b', 7])
+        self.assertAlmostEqual(decoded[2], 0.5)
+
+
+class ConditionTest(unittest.TestCase):
+
+    def test_values_follow_parent_type(self):
+        space = teste.validate_space([
+            {'type': 'int', 'min': 0, 'max': 5},
+            {'type': 'float', 'min': 0, 'max': 1, 'condition': {'parent': 0, 'values': ["3.0", 4]}},
+            {'type': 'ord', 'options': [1, 2, 4]},
+            {'type': 'int', 'min': 0, 'max': 3, 'condition': {'parent': 2, 'values': [2]}},
+        ])
+        self.assertEqual(space[1]['condition']['values'], [3, 4])
+        self.assertEqual(space[3]['condition']['values'], ['2'])
+        self.assertTrue(teste.is_active([3, 0.5, '2', 0], 1, space))
+        self.assertFalse(teste.is_active([2, 0.5, '2', 0], 1, space))
+        self.assertTrue(teste.is_active([2, 0.5, '2', 0], 3, space))
+
+    def test_impossible_values_are_rejected(self):
+        for values in (["x"], [2.5], [9]):
+            with self.assertRaises(ValueError):
+                teste.validate_space([{'type': 'int', 'min': 0, 'max': 5},
+                                      {'type': 'int', 'min': 0, 'max': 1,
+                                       'condition': {'parent': 0, 'values': values}}])
+        with self.assertRaises(ValueError):
+            teste.validate_space([{'type': 'cat', 'options': ['a', 'b']},
+                                  {'type': 'int', 'min': 0, 'max': 1,
+                                   'condition': {'parent': 0, 'values': ['c']}}])
+
+    def test_inactive_child_is_fixed_at_default(self):
+        space = teste.validate_space([
+            {'type': 'cat', 'options': ['on', 'off']},
+            {'type': 'int', 'min': 1, 'max': 9, 'condition': {'parent': 0, 'values': ['on']}},
+        ])
+        self.assertEqual(teste.apply_conditions(['off', 7], space), ['off', 1])
+        self.assertEqual(teste.apply_conditions(['on', 7], space), ['on', 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
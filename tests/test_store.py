@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+class EvaluationStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "historico.jsonl")
+
+    def test_history_is_reloaded_for_either_goal(self):
+        cache = teste.EvaluationCache(10, self.path, 'abc', objective_multiplier=-1.0)
+        cache.put((1, 'a'), -3.0)
+        cache.put((2, 'b'), -float('inf'))
+        cache.put((3, 'a'), -9.0, persist=False)
+        cache._store._file.close()
+
+        # O arquivo guarda o valor bruto: uma execução 'max' reaproveita o histórico
+        reloaded = teste.EvaluationCache(10, self.path, 'abc', objective_multiplier=1.0)
+        self.assertEqual(reloaded.stats()['preloaded'], 2)
+        self.assertEqual(reloaded.get((1, 'a')), 3.0)
+        self.assertEqual(reloaded.get((2, 'b')), -float('inf'))
+        self.assertIsNone(reloaded.get((3, 'a')))
+
+    def test_other_executable_and_truncated_lines_are_skipped(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'exe': 'abc', 'params': [1], 'value': 2.0}) + "\n")
+            f.write(json.dumps({'exe': 'outro', 'params': [2], 'value': 5.0}) + "\n")
+            f.write('{"exe": "abc", "params": [3')
+        store = teste.EvaluationStore(self.path, 'abc', 1.0)
+        self.assertEqual(store.load(), [((1,), 2.0)])
+
+    def test_missing_file_is_empty_history(self):
+        self.assertEqual(teste.EvaluationStore(self.path, 'abc', 1.0).load(), [])
+
+    def test_executable_hash_identifies_content(self):
+        with open(self.path, 'wb') as f:
+            f.write(b"modelo v1")
+        first = teste.compute_executable_hash(self.path)
+        with open(self.path, 'ab') as f:
+            f.write(b"!")
+        self.assertNotEqual(teste.compute_executable_hash(self.path), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import space
+import surrogates
+import teste
+
+SPACE = [{'type': 'int', 'min': 0, 'max': 100}, {'type': 'cat', 'options': ['a', 'b', 'c']},
+         {'type': 'log-float', 'min': 0.01, 'max': 100.0}]
+
+
+def objective(individual):
+    return -abs(individual[0] - 70) - (0 if individual[1] == 'b' else 20)
+
+
+def uniform_individual(param_definitions):
+    return [space.from_coordinate(p_def, space.random_coordinate(*space.coordinate_bounds(p_def)))
+            if p_def['type'] != 'cat' else random.choice(p_def['options']) for p_def in param_definitions]
+
+
+class KNNSurrogateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = surrogates.KNNSurrogate(SPACE, k=3)
+        for x in (0, 50, 100):
+            self.model.observe([x, 'a', 1.0], float(x))
+
+    def genome(self, individual):
+        return space.encode_individual(individual, SPACE)
+
+    def test_exact_match_returns_observed_value(self):
+        self.assertEqual(self.model.predict(self.genome([50, 'a', 1.0])), 50.0)
+
+    def test_prediction_is_inverse_distance_weighted(self):
+        prediction = self.model.predict(self.genome([60, 'a', 1.0]))
+        # Distâncias 0.6, 0.1 e 0.4 (normalizadas pelo intervalo)
+        expected = (0 / 0.6 + 50 / 0.1 + 100 / 0.4) / (1 / 0.6 + 1 / 0.1 + 1 / 0.4)
+        self.assertAlmostEqual(prediction, expected)
+
+    def test_categorical_mismatch_counts_as_one(self):
+        genome_a = self.genome([50, 'a', 1.0])
+        genome_b = self.genome([50, 'b', 1.0])
+        self.assertEqual(self.model.distance(genome_a, genome_b), 1.0)
+
+    def test_failures_are_predicted_below_worst(self):
+        self.model.observe([20, 'c', 1.0], -float('inf'))
+        self.assertEqual(self.model.predict(self.genome([20, 'c', 1.0])), -1.0)
+
+    def test_training_set_is_bounded(self):
+        model = surrogates.KNNSurrogate(SPACE, max_points=5)
+        for x in range(10):
+            model.observe([x, 'a', 1.0], float(x))
+        self.assertEqual(len(model), 5)
+
+
+class ScreenCandidatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.model = surrogates.KNNSurrogate(SPACE, k=1)
+        for x in (10, 90):
+            self.model.observe([x, 'a', 1.0], float(x))
+        patches = [mock.patch.object(teste, '_surrogate', self.model),
+                   mock.patch.object(teste, '_eval_metrics', None)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_keeps_most_promising(self):
+        candidates = [[15, 'a', 1.0], [85, 'a', 1.0], [5, 'a', 1.0]]
+        with mock.patch.object(teste, 'SURROGATE_MIN_POINTS', 2):
+            self.assertEqual(teste.screen_candidates(candidates, 1, encoded=False), [[85, 'a', 1.0]])
+
+    def test_untrained_model_keeps_order(self):
+        candidates = [[15, 'a', 1.0], [85, 'a', 1.0]]
+        with mock.patch.object(teste, 'SURROGATE_MIN_POINTS', 3):
+            self.assertEqual(teste.screen_candidates(candidates, 1, encoded=False), [[15, 'a', 1.0]])
+
+
+class TPESamplerTest(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(1234)
+
+    def sampler(self, startup, **kwargs):
+        return surrogates.TPESampler(SPACE, uniform_individual, startup=startup, **kwargs)
+
+    def test_startup_uses_design_then_random_points(self):
+        design = [[10, 'a', 1.0], [20, 'b', 2.0]]
+        sampler = self.sampler(4, startup_points=design)
+        proposals = sampler.ask(4)
+        self.assertEqual(proposals[:2], design[::-1])
+        self.assertEqual(len({tuple(p) for p in proposals}), 4)
+        for individual in proposals:
+            self.assertTrue(0 <= individual[0] <= 100)
+            self.assertIn(individual[1], ['a', 'b', 'c'])
+            self.assertTrue(0.01 <= individual[2] <= 100.0)
+        self.assertEqual(len(sampler.pending), 4)
+
+    def test_tell_clears_pending(self):
+        sampler = self.sampler(4)
+        proposal = sampler.ask(1)[0]
+        sampler.tell(proposal, objective(proposal))
+        self.assertEqual(sampler.pending, [])
+        self.assertEqual(len(sampler.observations), 1)
+
+    def test_model_concentrates_on_good_region(self):
+        sampler = self.sampler(10)
+        for _ in range(60):
+            proposal = sampler.ask(1)[0]
+            sampler.tell(proposal, objective(proposal))
+        later = [individual for individual, _ in sampler.observations[-20:]]
+        self.assertGreater(sum(individual[1] == 'b' for individual in later), 12)
+        self.assertLess(sum(abs(individual[0] - 70) for individual in later) / len(later), 20)
+        best = max(fitness for _, fitness in sampler.observations)
+        self.assertGreater(best, -5)
+
+    def test_infeasible_candidates_are_never_proposed(self):
+        sampler = self.sampler(5, is_feasible=lambda individual: individual[1] != 'b')
+        for _ in range(30):
+            proposal = sampler.ask(1)[0]
+            sampler.tell(proposal, objective(proposal))
+        model_proposals = [individual for individual, _ in sampler.observations[5:]]
+        self.assertTrue(all(individual[1] != 'b' for individual in model_proposals))
+
+    def test_teste_factory_uses_configuration(self):
+        with mock.patch.object(teste, 'TPE_STARTUP', 3), mock.patch.object(teste, 'TPE_GAMMA', 0.5), \
+                mock.patch.object(teste, '_constraints', None), mock.patch.object(teste, '_failure_regions', None):
+            sampler = teste.tpe_sampler(SPACE)
+        self.assertEqual((sampler.startup, sampler.gamma, len(sampler.startup_points)), (3, 0.5, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+
+class MemoizationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = teste.EvaluationCache(10)
+        patches = [mock.patch.object(teste, '_eval_cache', self.cache),
+                   mock.patch.object(teste, '_constraints', None),
+                   mock.patch.object(teste, '_failure_regions', None),
+                   mock.patch.object(teste, '_budget_param', None),
+                   mock.patch.object(teste, '_surrogate', None)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_point_runs_again_after_adaptive_kill(self):
+        results = [teste.AdaptiveTimeoutFitness(-float('inf')), 5.0]
+        with mock.patch.object(teste, 'run_executable', side_effect=results) as run:
+            self.assertEqual(teste.evaluate([1, 2], 1.0), -float('inf'))
+            self.assertEqual(teste.evaluate([1, 2], 1.0), 5.0)
+            self.assertEqual(teste.evaluate([1, 2], 1.0), 5.0)
+        self.assertEqual(run.call_count, 2)
+
+    def test_population_does_not_memoize_adaptive_kill(self):
+        killed = teste.AdaptiveTimeoutFitness(-float('inf'))
+        with mock.patch.object(teste, 'run_executable_batch', side_effect=[[killed, 1.0], [2.0]]) as run:
+            self.assertEqual(teste.evaluate_population([[1], [2]], 1.0), [-float('inf'), 1.0])
+            self.assertEqual(teste.evaluate_population([[1], [2]], 1.0), [2.0, 1.0])
+        self.assertEqual(run.call_args_list[1].args[0], [[1]])
+
+    def test_capped_hit_keeps_its_marker(self):
+        with mock.patch.object(teste, 'run_executable', return_value=teste.CappedFitness(-3.0)) as run:
+            teste.evaluate([4], -1.0)
+            cached = teste.evaluate([4], -1.0)
+        self.assertEqual(run.call_count, 1)
+        self.assertIsInstance(cached, teste.CappedFitness)
+        self.assertEqual(cached, -3.0)
+
+    def test_genuine_timeout_is_memoized(self):
+        with mock.patch.object(teste, 'run_executable', return_value=teste.timeout_fitness(
+                teste.EVAL_TIMEOUT_SECONDS)) as run:
+            teste.evaluate([5], 1.0)
+            self.assertEqual(teste.evaluate([5], 1.0), -float('inf'))
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(self.cache.failures(), [(5,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import teste
+
+SPACE = [{'type': 'int', 'min': 0, 'max': 20}, {'type': 'cat', 'options': ['a', 'b']}]
+
+
+def quadratic(params):
+    return -(params[0] - 7) ** 2 + (1 if params[1] == 'b' else 0)
+
+
+def broken(params):
+    raise RuntimeError("modelo quebrado")
+
+
+class TuneTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(teste, 'WORKER_COUNT', 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_in_process_objective_finds_optimum(self):
+        with redirect_stdout(io.StringIO()):
+            best_value, best_params = teste.tune(SPACE, quadratic, time_limit_minutes=0.02, goal='max')
+        self.assertEqual(best_value, 1)
+        self.assertEqual(best_params, [7, 'b'])
+
+    def test_evaluation_budget_and_callback(self):
+        entries = []
+        with mock.patch.object(teste, 'WORKER_COUNT', 1), redirect_stdout(io.StringIO()) as out:
+            teste.tune(SPACE, quadratic, time_limit_minutes=1, algorithm='ga', max_evaluations=20,
+                       on_evaluation=entries.append)
+        self.assertIn("Orçamento de 20 execuções esgotado", out.getvalue())
+        self.assertGreaterEqual(len(entries), 20)
+        self.assertEqual(entries[0]['algorithm'], 'ga')
+        self.assertEqual(entries[0]['status'], 'ok')
+        self.assertEqual(entries[0]['value'], quadratic(entries[0]['params']))
+
+    def test_seed_reproduces_run(self):
+        runs = []
+        for _ in range(2):
+            entries = []
+            with mock.patch.object(teste, 'WORKER_COUNT', 1), redirect_stdout(io.StringIO()):
+                teste.tune(SPACE, quadratic, time_limit_minutes=1, algorithm='ga-ps', max_evaluations=20,
+                           on_evaluation=entries.append, seed=3)
+            runs.append([entry['params'] for entry in entries[:20]])
+        self.assertEqual(runs[0], runs[1])
+
+    def test_invalid_arguments_raise(self):
+        with self.assertRaises(ValueError):
+            teste.tune(SPACE, quadratic, algorithm='sa')
+        with self.assertRaises(ValueError):
+            teste.tune(SPACE, quadratic, goal='maximize')
+        with self.assertRaises(ValueError):
+            teste.tune([], quadratic)
+
+
+class RunObjectiveTest(unittest.TestCase):
+
+    def test_exception_counts_as_crash(self):
+        with mock.patch.object(teste, '_objective', broken), \
+                mock.patch.object(teste, '_eval_metrics', None), \
+                mock.patch.object(teste, '_trace_writer', None), redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(teste.run_objective([1, 'a'], 1.0), -float('inf'))
+        self.assertIn("modelo quebrado", err.getvalue())
+
+    def test_value_is_multiplied_by_objective(self):
+        with mock.patch.object(teste, '_objective', quadratic), \
+                mock.patch.object(teste, '_eval_metrics', None), \
+                mock.patch.object(teste, '_trace_writer', None):
+            self.assertEqual(teste.run_objective([5, 'a'], -1.0), 4.0)
+
+
+class ValidateSpaceTest(unittest.TestCase):
+
+    def test_normalizes_types(self):
+        space = teste.validate_space([{'type': 'INT', 'min': '1', 'max': 4.0},
+                                      {'type': 'cat', 'options': [1, 2], 'condition': {'parent': 0, 'values': ['2']}}])
+        self.assertEqual(space[0], {'type': 'int', 'min': 1, 'max': 4})
+        self.assertEqual(space[1]['options'], ['1', '2'])
+        self.assertEqual(space[1]['condition'], {'parent': 0, 'values': [2]})
+
+    def test_errors(self):
+        invalid = [
+            [{'type': 'cat', 'options': []}],
+            [{'type': 'int', 'min': 5}],
+            [{'type': 'int', 'min': 5, 'max': 1}],
+            [{'type': 'log-float', 'min': 0, 'max': 1}],
+            [{'type': 'vector'}],
+            [{'type': 'int', 'min': 0, 'max': 1, 'condition': {'parent': 0, 'values': [1]}}],
+            [{'type': 'budget', 'min': 1, 'max': 9}, {'type': 'budget', 'min': 1, 'max': 9}],
+        ]
+        for space in invalid:
+            with self.subTest(space=space), self.assertRaises(ValueError):
+                teste.validate_space(space)
+
+
+class ConfigTest(unittest.TestCase):
+
+    def write(self, name, content):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_load_config(self):
+        config = {'algorithm': 'ps', 'goal': 'min', 'parameters': SPACE}
+        self.assertEqual(teste.load_config(self.write('c.json', json.dumps(config))), config)
+
+    def test_load_config_errors(self):
+        with self.assertRaises(ValueError):
+            teste.load_config(self.write('lista.json', '[1, 2]'))
+        with self.assertRaises(ValueError):
+            teste.load_config(self.write('quebrado.json', '{"algorithm": '))
+
+    def test_load_objective(self):
+        self.assertIs(teste.load_objective(f'{__name__}:quadratic'), quadratic)
+        with self.assertRaises(ValueError):
+            teste.load_objective('quadratic')
+
+    def test_run_from_config_resolves_relative_executable(self):
+        path = self.write('c.json', json.dumps({'parameters': SPACE, 'executable': 'modelo.exe'}))
+        with mock.patch.object(teste, 'tune') as tune:
+            teste.run_from_config(path)
+        self.assertEqual(tune.call_args.kwargs['executable_path'],
+                         os.path.join(os.path.dirname(path), 'modelo.exe'))
+
+    def test_missing_executable_does_not_block(self):
+        with mock.patch.object(teste, 'EXECUTABLE_PATH', '/nao/existe'), \
+                mock.patch.object(teste, 'BROKER_ENABLED', False), \
+                mock.patch('builtins.input', side_effect=AssertionError("prompt")), \
+                redirect_stdout(io.StringIO()) as out:
+            self.assertIsNone(teste.tune(SPACE, time_limit_minutes=0.01))
+        self.assertIn("não encontrado", out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()